@@ -1,34 +1,169 @@
 
+import os
+from typing import TYPE_CHECKING
+
 import pandas as pd
 import plotly.express as px
 import streamlit as st
 
+from src.trader_sentiment import profiling
 from src.trader_sentiment.analysis import (
-    analyze_correlations,
-    build_daily_join,
-    calculate_max_drawdown,
-    calculate_sharpe_ratio,
-    calculate_sortino_ratio,
+    build_trader_profile,
+    calculate_risk_metrics,
     cluster_traders,
     predict_win_probability,
+    rolling_risk_metrics,
+    select_n_clusters,
 )
-from src.trader_sentiment.live_data import fetch_recent_trades
+from src.trader_sentiment.cache import cached_daily_join, source_fingerprint
+from src.trader_sentiment.cube import SentimentCube
+from src.trader_sentiment.data_loader import Paths, ensure_data_exists
+from src.trader_sentiment.downsample import DEFAULT_MAX_POINTS, downsample_series, sample_scatter
+from src.trader_sentiment.features import FeatureStore
+from src.trader_sentiment.memory import compact_frame
+from src.trader_sentiment.model_registry import ModelRegistry
+from src.trader_sentiment.report import read_artifact, read_manifest
+from src.trader_sentiment.trade_store import META_FILE as TRADE_STORE_META
+from src.trader_sentiment.trade_store import TradeStore, account_ranges
+
+if TYPE_CHECKING:
+    from src.trader_sentiment.live_data import LiveTradeFeed
 
 st.set_page_config(page_title="Trader Behavior Insights", layout="wide")
 
+PATHS = Paths.from_repo(".")
+MODELS = ModelRegistry(os.path.join(PATHS.processed_dir, "models"))
+# Written by `python -m src.trader_sentiment.report`
+REPORT_DIR = os.path.join(PATHS.processed_dir, "report")
+TRADES_PATH = "data/raw/hyperliquid_trades.csv"
+FEAR_GREED_PATH = "data/raw/fear_greed.csv"
+# Written by `python -m src.trader_sentiment.trade_store`
+TRADE_STORE_DIR = os.path.join(PATHS.processed_dir, "trade_store")
+
+
+def data_source() -> str:
+    # Fingerprint of the raw files: the cache key of everything derived from them, so a
+    # data refresh is picked up without restarting the app
+    if not (os.path.exists(TRADES_PATH) and os.path.exists(FEAR_GREED_PATH)):
+        ensure_data_exists(os.path.dirname(TRADES_PATH))
+    return source_fingerprint([TRADES_PATH, FEAR_GREED_PATH])
+
+
 @st.cache_data
-def load_data():
-    return build_daily_join(
-        trades_path="data/raw/hyperliquid_trades.csv",
-        fear_greed_path="data/raw/fear_greed.csv",
+def load_data(source: str):
+    # Parquet cache in data/processed survives restarts; rebuilt when the raw files change
+    daily = cached_daily_join(
+        trades_path=TRADES_PATH,
+        fear_greed_path=FEAR_GREED_PATH,
+        processed_dir=PATHS.processed_dir,
     )
+    return compact_frame(daily)
+
+
+@st.cache_resource
+def sentiment_cube(source: str) -> SentimentCube:
+    # Built once per data version; each filter change just adds up the selected cells
+    return SentimentCube.from_daily(load_data(source))
+
+
+@st.cache_resource
+def feature_store(source: str) -> FeatureStore:
+    # One per data version, also saved to disk, so retraining after a restart skips feature construction
+    return FeatureStore.cached(load_data(source), os.path.join(PATHS.processed_dir, "features"))
+
+
+def trade_store_built() -> int:
+    meta = os.path.join(TRADE_STORE_DIR, TRADE_STORE_META)
+    return os.stat(meta).st_mtime_ns if os.path.exists(meta) else 0
+
+
+@st.cache_resource
+def trade_store(source: str, built: int) -> TradeStore | None:
+    # Per-trader fills come from the account index instead of a scan of the raw trades.
+    # Keyed on the raw data and the store's build time, so a refresh or rebuild is picked
+    # up; a store built from other trades than TRADES_PATH is not used.
+    if not built:
+        return None
+    store = TradeStore(TRADE_STORE_DIR)
+    return store if store.is_current(TRADES_PATH) else None
+
+
+@st.cache_data
+def pnl_scatter_points(source: str, selected: tuple, max_points: int) -> tuple[pd.DataFrame, int]:
+    # Only the sampled rows reach Plotly, so the payload is bounded by max_points, not the data
+    df = load_data(source)
+    filtered = df[df["classification"].isin(list(selected))]
+    return sample_scatter(filtered, y="total_pnl", max_points=max_points), len(filtered)
+
+
+LIVE_COINS = ["BTC", "ETH", "SOL", "HYPE", "ARB", "DOGE", "AVAX", "SUI"]
+
+
+@st.cache_resource
+def live_feed(coins: tuple) -> "LiveTradeFeed":
+    # One feed (session, thread pool, ring buffers) per coin selection, kept across reruns.
+    # Imported here so requests/urllib3 load only once the live tab is opened.
+    from src.trader_sentiment.live_data import LiveTradeFeed
+
+    return LiveTradeFeed(list(coins), buffer_size=2_000)
+
+
+@st.cache_data
+def precomputed(name: str, source: str):
+    # Batch-report artifact built from the same raw files as load_data, else None
+    return read_artifact(REPORT_DIR, name, source=source)
+
+
+@st.cache_data
+def risk_metrics(source: str) -> pd.DataFrame:
+    # All accounts at once; the tab only slices the ranked table
+    report = precomputed("risk_metrics", source)
+    return report if report is not None else calculate_risk_metrics(load_data(source))
+
+
+@st.cache_data
+def rolling_metrics(source: str) -> pd.DataFrame:
+    report = precomputed("rolling_risk_metrics", source)
+    return report if report is not None else rolling_risk_metrics(load_data(source))
+
+
+@st.cache_data
+def rolling_ranges(source: str) -> dict:
+    # Rolling metrics are sorted by account, so each trader is one contiguous slice
+    return account_ranges(rolling_metrics(source)["account"])
+
+
+def show_performance(recorder: profiling.Recorder | None) -> None:
+    """Sidebar expander with the instrumented pipeline stages of the run that just finished."""
+    with st.sidebar.expander("⏱️ Performance"):
+        st.checkbox("Record stage timings", key="perf_record", help="Time the pipeline stages from the next run on")
+        st.checkbox("Capture cProfile", key="perf_cprofile", help="Profile each top-level stage on the next run")
+        if recorder is None:
+            st.caption(f"Recording is off. Tick the box above or set {profiling.ENV_VAR}=1.")
+            return
+        records = recorder.records()
+        if records.empty:
+            st.caption("No pipeline stages ran; everything came from Streamlit's cache.")
+            return
+        table = records.assign(stage=records["depth"].map(lambda d: "· " * d) + records["name"])
+        st.dataframe(
+            table[["stage", "wall_s", "cpu_s", "peak_rss_delta_mb", "rows_in", "rows_out"]].style.format({
+                "wall_s": "{:.3f}", "cpu_s": "{:.3f}", "peak_rss_delta_mb": "{:.1f}",
+                "rows_in": "{:,.0f}", "rows_out": "{:,.0f}",
+            }, na_rep="")
+        )
+        report = recorder.last_profile()
+        if report:
+            st.code(report, language=None)
+
 
 def main():
     st.title("Trader Behavior Insights 🚀")
     st.markdown("Analyzing the relationship between **Bitcoin Market Sentiment** and **Trader Performance**.")
 
     try:
-        df = load_data()
+        source = data_source()
+        df = load_data(source)
     except Exception as e:
         st.error(f"Error loading data: {e}")
         return
@@ -40,15 +175,19 @@ def main():
         options=df["classification"].unique(),
         default=df["classification"].unique()
     )
-    
-    filtered_df = df[df["classification"].isin(selected_sentiment)]
+    max_points = st.sidebar.slider(
+        "Chart point budget", min_value=1_000, max_value=50_000, value=DEFAULT_MAX_POINTS, step=1_000,
+        help="Upper bound on points per chart; larger data is downsampled, keeping outliers",
+    )
 
     # KPI Row
+    cube = sentiment_cube(source)
+    kpis = cube.kpis(selected_sentiment)
     col1, col2, col3, col4 = st.columns(4)
-    col1.metric("Total Trades", f"{filtered_df['trades'].sum():,}")
-    col2.metric("Total Volume", f"${filtered_df['volume_usd'].sum():,.0f}")
-    col3.metric("Total PnL", f"${filtered_df['total_pnl'].sum():,.0f}")
-    col4.metric("Avg Leverage", f"{filtered_df['avg_leverage'].mean():.2f}x" if "avg_leverage" in filtered_df.columns else "N/A")
+    col1.metric("Total Trades", f"{kpis['total_trades']:,}")
+    col2.metric("Total Volume", f"${kpis['total_volume']:,.0f}")
+    col3.metric("Total PnL", f"${kpis['total_pnl']:,.0f}")
+    col4.metric("Avg Leverage", f"{kpis['avg_leverage']:.2f}x" if kpis["avg_leverage"] is not None else "N/A")
 
     # Tabs
     tab1, tab2, tab3, tab4, tab5 = st.tabs(["📊 Market Analysis", "👥 Trader Clustering", "🧠 Quant Analysis", "🔮 Win Prob Model", "⚡ Live Market"])
@@ -57,8 +196,9 @@ def main():
         st.subheader("Market Sentiment vs Performance")
         
         # PnL over time colored by sentiment
+        points, n_rows = pnl_scatter_points(source, tuple(selected_sentiment), max_points)
         fig_pnl = px.scatter(
-            filtered_df, x="date", y="total_pnl", color="classification",
+            points, x="date", y="total_pnl", color="classification",
             title="Daily PnL by Sentiment", hover_data=["account"],
             color_discrete_map={
                 "extreme fear": "red", "fear": "orange", 
@@ -66,106 +206,157 @@ def main():
             }
         )
         st.plotly_chart(fig_pnl, use_container_width=True)
+        if len(points) < n_rows:
+            st.caption(f"Showing {len(points):,} of {n_rows:,} account-days: each class's extremes plus a sample.")
         
         # Correlation Matrix
         st.subheader("Correlation Analysis")
-        corrs = analyze_correlations(filtered_df)
+        corrs = cube.corr(selected_sentiment)
         fig_corr = px.imshow(corrs, text_auto=True, title="Feature Correlations")
         st.plotly_chart(fig_corr, use_container_width=True)
 
     with tab2:
         st.subheader("Trader Segmentation")
+        auto_k = st.checkbox("Pick number of clusters automatically", value=False)
+        n_clusters = st.slider("Number of clusters", min_value=2, max_value=10, value=3, disabled=auto_k)
         if st.button("Run Clustering Analysis"):
             with st.spinner("Clustering traders..."):
-                clusters = cluster_traders(df)
+                if auto_k:
+                    n_clusters, k_scores = select_n_clusters(build_trader_profile(df), k_values=range(2, 11))
+                    st.caption(f"Selected k = {n_clusters} by silhouette score on a sample of accounts.")
+                    st.line_chart(k_scores["silhouette"])
+                clusters = cluster_traders(df, n_clusters=n_clusters)
                 
+                shown = sample_scatter(clusters, y="total_pnl", by="cluster", max_points=max_points)
                 fig_cluster = px.scatter(
-                    clusters, x="volume_usd", y="total_pnl", color="cluster",
-                    size="trades", hover_name=clusters.index,
+                    shown, x="volume_usd", y="total_pnl", color="cluster",
+                    size="trades", hover_name=shown.index,
                     title="Trader Clusters (Volume vs PnL)",
                     log_x=True
                 )
                 st.plotly_chart(fig_cluster, use_container_width=True)
                 
                 st.write("### Top Traders in Each Cluster")
-                for i in range(3):
+                for i in sorted(clusters["cluster"].unique()):
                     st.write(f"**Cluster {i}**")
                     st.dataframe(clusters[clusters["cluster"] == i].sort_values("total_pnl", ascending=False).head(5))
 
     with tab3:
         st.subheader("Advanced Quant Metrics")
-        st.markdown("Risk-adjusted performance metrics for the top 5 profitable traders.")
-        
-        top_traders = df.groupby("account")["total_pnl"].sum().sort_values(ascending=False).head(5).index.tolist()
-        
-        metrics_data = []
-        for account in top_traders:
-            trader_df = df[df["account"] == account].sort_values("date")
-            returns = trader_df["total_pnl"]
-            
-            sharpe = calculate_sharpe_ratio(returns)
-            sortino = calculate_sortino_ratio(returns)
-            max_dd = calculate_max_drawdown(returns.cumsum())
-            
-            metrics_data.append({
-                "Account": account,
-                "Total PnL": trader_df["total_pnl"].sum(),
-                "Sharpe Ratio": sharpe,
-                "Sortino Ratio": sortino,
-                "Max Drawdown": max_dd
-            })
-            
-        st.dataframe(pd.DataFrame(metrics_data).style.format({
+        top_n = st.slider("Traders to show", min_value=5, max_value=500, value=25, step=5)
+        st.markdown(f"Risk-adjusted performance metrics for the top {top_n} profitable traders.")
+
+        metrics = risk_metrics(source).sort_values("total_pnl", ascending=False).head(top_n)
+        metrics_data = metrics.reset_index().rename(columns={
+            "account": "Account",
+            "total_pnl": "Total PnL",
+            "sharpe_ratio": "Sharpe Ratio",
+            "sortino_ratio": "Sortino Ratio",
+            "max_drawdown": "Max Drawdown",
+        })[["Account", "Total PnL", "Sharpe Ratio", "Sortino Ratio", "Max Drawdown"]]
+
+        st.dataframe(metrics_data.style.format({
             "Total PnL": "${:,.2f}",
             "Sharpe Ratio": "{:.2f}",
             "Sortino Ratio": "{:.2f}",
             "Max Drawdown": "{:.2%}"
         }))
 
+        st.write("### Rolling Risk Profile")
+        trader = st.selectbox("Trader", options=metrics_data["Account"])
+        window = st.radio("Window", options=[7, 30, 90], format_func=lambda w: f"{w}d", horizontal=True)
+        rolling = rolling_metrics(source)
+        start, stop = rolling_ranges(source).get(trader, (0, 0))
+        trader_rolling = rolling.iloc[start:stop]
+        fig_roll = px.line(
+            trader_rolling, x="date", y=[f"sharpe_{window}d", f"sortino_{window}d", f"drawdown_{window}d"],
+            title=f"{window}-Day Rolling Risk Metrics"
+        )
+        st.plotly_chart(fig_roll, use_container_width=True)
+
+        store = trade_store(source, trade_store_built())
+        if store is not None and not trader_rolling.empty:
+            with st.expander(f"Fills of {trader}"):
+                first, last = trader_rolling["date"].min(), trader_rolling["date"].max()
+                span = st.date_input("Dates", value=(first, last), min_value=first, max_value=last)
+                fills = store.trader(trader, *span) if len(span) == 2 else store.trader(trader)
+                st.caption(f"{len(fills):,} fills from {fills['date'].nunique()} day partitions")
+                st.dataframe(fills, use_container_width=True)
+
     with tab4:
         st.subheader("Win Probability Model (Next Trade Prediction)")
         st.markdown("Predicting the probability that the **NEXT** day will be profitable based on sentiment and leverage.")
         
+        res = precomputed("win_probability", source)
         if st.button("Train Win Prob Model"):
             with st.spinner("Training Random Forest Classifier..."):
-                res = predict_win_probability(df)
-                
-                if "error" in res:
-                    st.error(res["error"])
-                else:
-                    c1, c2 = st.columns(2)
-                    c1.metric("Model Accuracy", f"{res['accuracy']:.2%}")
-                    c2.metric("ROC AUC Score", f"{res['auc']:.4f}")
-                    
-                    st.write("### Feature Importance")
-                    imp_df = pd.DataFrame(list(res["feature_importance"].items()), columns=["Feature", "Importance"])
-                    fig_imp = px.bar(imp_df, x="Feature", y="Importance", title="Predictive Factors")
-                    st.plotly_chart(fig_imp, use_container_width=True)
+                res = predict_win_probability(df, registry=MODELS, store=feature_store(source))
+        elif res is not None:
+            st.caption(f"From the batch report generated at {read_manifest(REPORT_DIR)['generated_at']}.")
+
+        if res is not None:
+            if "error" in res:
+                st.error(res["error"])
+            else:
+                c1, c2 = st.columns(2)
+                c1.metric("Model Accuracy", f"{res['accuracy']:.2%}")
+                c2.metric("ROC AUC Score", f"{res['auc']:.4f}")
+
+                st.write("### Feature Importance")
+                imp_df = pd.DataFrame(list(res["feature_importance"].items()), columns=["Feature", "Importance"])
+                fig_imp = px.bar(imp_df, x="Feature", y="Importance", title="Predictive Factors")
+                st.plotly_chart(fig_imp, use_container_width=True)
 
     with tab5:
         st.subheader("⚡ Live Market Data (Hyperliquid)")
         
-        if st.button("Fetch Live Trades"):
-            with st.spinner("Fetching recent trades from Hyperliquid..."):
-                live_df = fetch_recent_trades("BTC")
-                
+        coins = st.multiselect("Coins", options=LIVE_COINS, default=["BTC", "ETH", "SOL"])
+        if coins:
+            # The feed (and its buffers) outlives reruns, so earlier fetches stay on screen
+            feed = live_feed(tuple(coins))
+            if st.button("Fetch Live Trades"):
+                with st.spinner("Fetching recent trades from Hyperliquid..."):
+                    new_counts = feed.poll()
+                st.success(f"Fetched {sum(new_counts.values())} new trades across {len(coins)} coins!")
+                if feed.errors:
+                    st.warning(f"Could not fetch: {', '.join(feed.errors)}. Check API connection.")
+
+            summary = feed.summary()
+            if summary["buffered"].sum() > 0:
+                st.dataframe(summary.style.format({
+                    "volume_usd": "${:,.0f}", "vwap": "${:,.2f}", "imbalance": "{:+.2f}", "last_price": "${:,.2f}"
+                }))
+
+                coin = st.selectbox("Coin", options=coins)
+                live_df = feed.frame(coin)
                 if not live_df.empty:
-                    st.success(f"Fetched {len(live_df)} recent trades!")
-                    
                     # Live Metrics
                     l1, l2, l3 = st.columns(3)
-                    l1.metric("Current Price", f"${live_df['price'].iloc[0]:,.2f}")
-                    l2.metric("24h Volume (Sample)", f"${live_df['volume_usd'].sum():,.0f}")
-                    l3.metric("Latest Trade Side", live_df['side'].iloc[0])
-                    
-                    st.dataframe(live_df[["time", "side", "price", "size", "volume_usd"]])
-                    
+                    l1.metric("Current Price", f"${summary.loc[coin, 'last_price']:,.2f}")
+                    l2.metric("VWAP (Session)", f"${summary.loc[coin, 'vwap']:,.2f}")
+                    l3.metric("Buy/Sell Imbalance", f"{summary.loc[coin, 'imbalance']:+.2f}")
+
+                    st.dataframe(live_df[["time", "side", "price", "size", "volume_usd"]].iloc[::-1])
+
                     # Live Chart
-                    fig_live = px.line(live_df, x="time", y="price", title="Live BTC Price Action")
+                    fig_live = px.line(
+                        downsample_series(live_df, x="time", y="price", max_points=max_points),
+                        x="time", y="price", title=f"Live {coin} Price Action",
+                    )
                     st.plotly_chart(fig_live, use_container_width=True)
-                else:
-                    st.warning("No live data fetched. Check API connection.")
 
 if __name__ == "__main__":
-    main()
+    # Stages are recorded only on request (env var or the Performance panel), into a fresh
+    # recorder for this session's run, so normal use pays nothing and concurrent sessions
+    # never mix their timings; cached calls do not re-run and so don't appear
+    recorder = profiling.Recorder.from_env()
+    if st.session_state.get("perf_cprofile"):
+        recorder = profiling.Recorder("cprofile")
+    elif st.session_state.get("perf_record"):
+        recorder = recorder or profiling.Recorder()
+    try:
+        with profiling.recording(recorder):
+            main()
+    finally:
+        show_performance(recorder)
 
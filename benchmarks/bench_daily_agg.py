@@ -0,0 +1,52 @@
+"""Compare the vectorized daily_trader_agg against the original groupby/apply version.
+
+    python -m benchmarks.bench_daily_agg --rows 1000000 10000000
+"""
+from __future__ import annotations
+
+import argparse
+
+import pandas as pd
+
+from benchmarks.common import make_trades, timed
+from src.trader_sentiment.data_loader import daily_trader_agg
+
+
+def legacy_daily_trader_agg(df: pd.DataFrame) -> pd.DataFrame:
+    """The pre-vectorization implementation (Python apply per account-day)."""
+    g = df.groupby(["account", "date"], dropna=False)
+    out = pd.DataFrame()
+    out["trades"] = g.size()
+    out["total_pnl"] = g["closed pnl"].sum(min_count=1)
+    out["avg_pnl_per_trade"] = g["closed pnl"].mean()
+    out["winning_trades"] = g["closed pnl"].apply(lambda x: (x > 0).sum())
+    out["losing_trades"] = g["closed pnl"].apply(lambda x: (x < 0).sum())
+    out["volume_usd"] = g["size usd"].apply(lambda x: x.abs().sum())
+    out["long_bias"] = g["side"].apply(lambda s: float(((s.str.lower() == "buy") | (s.str.lower() == "long")).mean()))
+    out["total_fees"] = g["fee"].sum(min_count=1)
+    return out.reset_index()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    parser.add_argument("--accounts", type=int, default=1_000)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--skip-legacy", action="store_true", help="only time the vectorized version")
+    args = parser.parse_args()
+
+    for n in args.rows:
+        trades = make_trades(n, n_accounts=args.accounts, n_days=args.days)
+        results: dict = {}
+        print(f"--- {n:,} rows, {args.accounts:,} accounts x {args.days} days")
+        with timed("vectorized", results):
+            fast = daily_trader_agg(trades)
+        if not args.skip_legacy:
+            with timed("legacy apply", results):
+                slow = legacy_daily_trader_agg(trades)
+            pd.testing.assert_frame_equal(fast, slow)
+            print(f"{'speedup':<40} {results['legacy apply'] / results['vectorized']:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Python ``date`` objects vs datetime64 day keys: memory and time for aggregation + sentiment join.
+
+    python -m benchmarks.bench_date_keys                      # synthetic 5M rows
+    python -m benchmarks.bench_date_keys --trades data/raw/hyperliquid_trades.csv --fng data/raw/fear_greed.csv
+"""
+from __future__ import annotations
+
+import argparse
+
+import pandas as pd
+
+from benchmarks.common import make_trades, timed
+from src.trader_sentiment.data_loader import (
+    align_with_sentiment,
+    daily_trader_agg,
+    load_fear_greed,
+    load_trades,
+    to_day,
+)
+
+
+def legacy_align(agg: pd.DataFrame, fng: pd.DataFrame) -> pd.DataFrame:
+    return agg.merge(fng[["date", "classification"]], on="date", how="left")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--trades", help="trades file; synthetic data when omitted")
+    parser.add_argument("--fng", help="fear/greed file (required with --trades)")
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    args = parser.parse_args()
+
+    if args.trades:
+        trades = load_trades(args.trades)
+        fng = load_fear_greed(args.fng)
+    else:
+        trades = make_trades(args.rows)
+        trades["date"] = to_day(trades["date"])
+        days = trades["date"].drop_duplicates().sort_values()
+        labels = ["extreme fear", "fear", "neutral", "greed", "extreme greed"]
+        fng = pd.DataFrame({"date": days.to_numpy(), "classification": [labels[i % 5] for i in range(len(days))]})
+
+    legacy_trades = trades.assign(date=trades["date"].dt.date)
+    legacy_fng = fng.assign(date=fng["date"].dt.date)
+
+    mb = 1024 ** 2
+    print(f"--- {len(trades):,} trades")
+    print(f"{'date column, python date objects':<40} {legacy_trades['date'].memory_usage(deep=True) / mb:8.1f} MB")
+    print(f"{'date column, datetime64 day keys':<40} {trades['date'].memory_usage(deep=True) / mb:8.1f} MB")
+
+    results: dict = {}
+    with timed("daily_trader_agg, date objects", results):
+        legacy_daily = daily_trader_agg(legacy_trades)
+    with timed("daily_trader_agg, day keys", results):
+        daily = daily_trader_agg(trades)
+    with timed("hash merge on date objects", results):
+        legacy_joined = legacy_align(legacy_daily, legacy_fng)
+    with timed("sorted lookup on day keys", results):
+        joined = align_with_sentiment(daily, fng)
+
+    assert (legacy_joined["classification"].fillna("") == joined["classification"].fillna("")).all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Cold-import cost of the package modules and the dashboard's import set, via ``python -X importtime``.
+
+Each target is imported in a fresh interpreter (best of ``--repeat``) and the report lists
+its cumulative import time, the heaviest third-party packages it pulled in, and whether
+scikit-learn / joblib / gdown were loaded eagerly.
+
+    python -m benchmarks.bench_imports --repeat 5
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+TARGETS = {
+    "package": ["src.trader_sentiment"],
+    "data_loader": ["src.trader_sentiment.data_loader"],
+    "analysis": ["src.trader_sentiment.analysis"],
+    "cache": ["src.trader_sentiment.cache"],
+    # What app.py imports from the package before the first page renders
+    "dashboard": [
+        "src.trader_sentiment.analysis",
+        "src.trader_sentiment.cache",
+        "src.trader_sentiment.cube",
+        "src.trader_sentiment.data_loader",
+        "src.trader_sentiment.downsample",
+        "src.trader_sentiment.memory",
+        "src.trader_sentiment.model_registry",
+        "src.trader_sentiment.profiling",
+        "src.trader_sentiment.report",
+    ],
+}
+
+HEAVY = ("sklearn", "scipy", "joblib", "gdown", "requests")
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def importtime(modules: list[str]) -> list[tuple[str, int, int]]:
+    """(module, self_us, cumulative_us) for every top-level import of ``modules`` in a fresh interpreter."""
+    code = "; ".join(f"import {m}" for m in modules)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if match:
+            rows.append((match.group(4), int(match.group(1)), int(match.group(2))))
+    return rows
+
+
+def summarize(rows: list[tuple[str, int, int]]) -> dict:
+    # Self times add up to the whole import's cost; group them by top-level package
+    roots: dict[str, int] = {}
+    for name, self_us, _ in rows:
+        root = name.split(".")[0]
+        roots[root] = roots.get(root, 0) + self_us
+    return {
+        "total_s": sum(self_us for _, self_us, _ in rows) / 1e6,
+        "by_package": dict(sorted(roots.items(), key=lambda kv: -kv[1])),
+        "heavy": [m for m in HEAVY if m in roots],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument("--targets", nargs="+", default=list(TARGETS), choices=list(TARGETS))
+    args = parser.parse_args()
+
+    for target in args.targets:
+        runs = [summarize(importtime(TARGETS[target])) for _ in range(args.repeat)]
+        best = min(runs, key=lambda r: r["total_s"])
+        top = ", ".join(f"{pkg} {us / 1e3:.0f}ms" for pkg, us in list(best["by_package"].items())[: args.top])
+        print(f"{target:<14} {best['total_s']:7.3f}s   eager heavy: {', '.join(best['heavy']) or 'none'}")
+        print(f"{'':<14} {top}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Scaling of parallel_daily_join from 1 to N worker processes.
+
+    python -m benchmarks.bench_parallel_join --rows 20000000 --jobs 1 2 4 8
+"""
+from __future__ import annotations
+
+import argparse
+import os
+
+import pandas as pd
+
+from benchmarks.common import make_trades, timed
+from src.trader_sentiment.parallel import parallel_daily_join
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20_000_000)
+    parser.add_argument("--accounts", type=int, default=50_000)
+    parser.add_argument("--days", type=int, default=365)
+    cpus = os.cpu_count() or 1
+    parser.add_argument("--jobs", type=int, nargs="+", default=sorted({1, 2, 4, 8, cpus} & set(range(1, cpus + 1))))
+    args = parser.parse_args()
+
+    trades = make_trades(args.rows, n_accounts=args.accounts, n_days=args.days)
+    days = pd.Series(sorted(trades["date"].unique()))
+    labels = ["extreme fear", "fear", "neutral", "greed", "extreme greed"]
+    fng = pd.DataFrame({"date": days, "classification": [labels[i % len(labels)] for i in range(len(days))]})
+
+    print(f"--- {args.rows:,} rows, {args.accounts:,} accounts, {cpus} CPUs available")
+    results: dict = {}
+    for n_jobs in args.jobs:
+        with timed(f"n_jobs={n_jobs}", results):
+            parallel_daily_join(trades, fng, n_jobs=n_jobs)
+    base = results[f"n_jobs={args.jobs[0]}"]
+    for label, seconds in results.items():
+        print(f"{label:<40} {base / seconds:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
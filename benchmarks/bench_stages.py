@@ -0,0 +1,147 @@
+"""Time and memory-profile every pipeline stage on synthetic data, save JSON, compare runs.
+
+    python -m benchmarks.bench_stages --rows 100000 1000000 10000000 --output benchmarks/results/base.json
+    python -m benchmarks.bench_stages --rows 100000 --baseline benchmarks/results/base.json
+    python -m benchmarks.bench_stages --compare benchmarks/results/base.json benchmarks/results/new.json
+
+Memory is the tracemalloc peak during the stage, which covers numpy/pandas buffers, taken
+in a second traced pass; ``--no-memory`` skips that pass. Comparison flags a stage
+when it is more than ``--threshold`` slower (or larger) than the baseline, and exits 1.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import sklearn
+
+from benchmarks.common import compare, environment, load_results, print_comparison, save_results
+from src.trader_sentiment.analysis import (
+    calculate_risk_metrics,
+    cluster_traders,
+    join_sentiment,
+    predict_win_probability,
+    rolling_risk_metrics,
+)
+from src.trader_sentiment.data_loader import daily_trader_agg, load_fear_greed, load_trades
+from src.trader_sentiment.synthetic import write_dataset
+
+STAGES = (
+    "load_trades",
+    "daily_trader_agg",
+    "join_sentiment",
+    "cluster_traders",
+    "predict_win_probability",
+    "calculate_risk_metrics",
+    "rolling_risk_metrics",
+)
+
+@contextmanager
+def measure(stage: str, results: dict, trace: bool = False):
+    """Record the stage's wall time, or with ``trace`` its tracemalloc peak instead.
+
+    The two are taken in separate passes: tracing slows allocation-heavy pandas code
+    by up to an order of magnitude, which would swamp the timings.
+    """
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        entry = results.setdefault(stage, {"seconds": None, "peak_mb": None})
+        if trace:
+            entry["peak_mb"] = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+            tracemalloc.stop()
+            print(f"{stage:<40} {entry['peak_mb']:8.1f} MB peak")
+        else:
+            entry["seconds"] = time.perf_counter() - start
+            print(f"{stage:<40} {entry['seconds']:8.2f}s")
+
+
+@contextmanager
+def _untimed():
+    yield
+
+
+def run_pipeline(trades_path, fng_path, stages: set[str], trace: bool = False, results: dict | None = None) -> dict:
+    """Run the stages in pipeline order; each one feeds the next, so inputs are always realistic.
+
+    Loading, aggregation and the join always run (later stages need them) but are only
+    recorded when selected.
+    """
+    results = {} if results is None else results
+
+    def stage(name):
+        return measure(name, results, trace) if name in stages else _untimed()
+
+    with stage("load_trades"):
+        trades = load_trades(str(trades_path))
+    fng = load_fear_greed(str(fng_path))
+    with stage("daily_trader_agg"):
+        daily = daily_trader_agg(trades)
+    del trades
+    with stage("join_sentiment"):
+        joined = join_sentiment(daily, fng)
+    for name, fn in (
+        ("cluster_traders", cluster_traders),
+        ("predict_win_probability", predict_win_probability),
+        ("calculate_risk_metrics", calculate_risk_metrics),
+        ("rolling_risk_metrics", rolling_risk_metrics),
+    ):
+        if name in stages:
+            with measure(name, results, trace):
+                fn(joined)
+    results["_shape"] = {"daily_rows": len(joined), "accounts": int(joined["account"].nunique())}
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--accounts", type=int, default=2_000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--skew", type=float, default=1.0, help="trade-count skew across accounts (0 = even)")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--baseline", help="results JSON to compare this run against")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"), help="only compare two saved runs")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown/growth, as a fraction")
+    args = parser.parse_args()
+
+    if args.compare:
+        rows = compare(*map(load_results, args.compare), threshold=args.threshold)
+        regressed = print_comparison(rows, args.threshold)
+        sys.exit(1 if regressed else 0)
+
+    run = {
+        "environment": {**environment(), "sklearn": sklearn.__version__},
+        "config": {"accounts": args.accounts, "days": args.days, "skew": args.skew},
+        "results": {},
+    }
+    for n in args.rows:
+        print(f"--- {n:,} rows, {args.accounts:,} accounts x {args.days} days, skew {args.skew}")
+        with tempfile.TemporaryDirectory() as tmp:
+            trades_path, fng_path = write_dataset(
+                tmp, n, n_accounts=args.accounts, n_days=args.days, skew=args.skew
+            )
+            results = run_pipeline(trades_path, fng_path, set(args.stages))
+            if not args.no_memory:
+                run_pipeline(trades_path, fng_path, set(args.stages), trace=True, results=results)
+            run["results"][str(n)] = results
+
+    if args.output:
+        save_results(run, args.output)
+    if args.baseline:
+        rows = compare(load_results(args.baseline), run, threshold=args.threshold)
+        regressed = print_comparison(rows, args.threshold)
+        sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
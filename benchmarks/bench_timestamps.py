@@ -0,0 +1,82 @@
+"""Timestamp parsing in load_trades: old try-ms-then-infer vs sampled detection + one parse.
+
+    python -m benchmarks.bench_timestamps --rows 10000000 --output benchmarks/results/timestamps.json
+    python -m benchmarks.bench_timestamps --rows 10000000 --baseline benchmarks/results/timestamps.json
+    python -m benchmarks.bench_timestamps --compare benchmarks/results/timestamps.json new.json
+
+Results use the same JSON layout as ``bench_stages``, and ``--baseline``/``--compare``
+exit 1 when any parse is more than ``--threshold`` slower than in the baseline.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.common import compare, environment, load_results, print_comparison, save_results, timed
+from src.trader_sentiment.data_loader import EXCHANGE_TIME_FORMAT, parse_timestamps
+
+
+def legacy_parse(values: pd.Series) -> pd.Series:
+    try:
+        return pd.to_datetime(values, unit="ms", utc=True)
+    except (ValueError, TypeError):
+        return pd.to_datetime(values, errors="coerce", utc=True)
+
+
+def make_columns(n_rows: int, seed: int = 0):
+    """``(format, column)`` pairs, built one at a time so only one string column is alive."""
+    rng = np.random.default_rng(seed)
+    seconds = rng.integers(1_700_000_000, 1_760_000_000, size=n_rows)
+    yield "epoch s", pd.Series(seconds)
+    yield "epoch ms", pd.Series(seconds * 1_000)
+    yield "epoch us", pd.Series(seconds * 1_000_000)
+    instants = pd.Series(pd.to_datetime(seconds, unit="s"))
+    yield "iso8601", instants.dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+    yield "dd-mm-yyyy HH:MM", instants.dt.strftime(EXCHANGE_TIME_FORMAT)
+
+
+def run(n_rows: int) -> dict:
+    """Seconds per (format, parser), keyed like a ``bench_stages`` result."""
+    results: dict = {}
+    for name, values in make_columns(n_rows):
+        with timed(f"{name}: legacy", results):
+            legacy = legacy_parse(values)
+        with timed(f"{name}: detect + single parse", results):
+            fast = parse_timestamps(values)
+        # Legacy reads every epoch unit as ms, so it is only "correct" for ms
+        same = bool((legacy.dropna() == fast.dropna()).all()) if name == "epoch ms" else "n/a"
+        speedup = results[f"{name}: legacy"] / results[f"{name}: detect + single parse"]
+        print(f"{name + ': speedup':<40} {speedup:8.1f}x   same result as legacy: {same}")
+    return {label: {"seconds": seconds} for label, seconds in results.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000_000])
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--baseline", help="results JSON to compare this run against")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"), help="only compare two saved runs")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown, as a fraction")
+    args = parser.parse_args()
+
+    if args.compare:
+        rows = compare(*map(load_results, args.compare), threshold=args.threshold)
+        sys.exit(1 if print_comparison(rows, args.threshold) else 0)
+
+    current = {"environment": environment(), "results": {}}
+    for n in args.rows:
+        print(f"--- {n:,} timestamps per format")
+        current["results"][str(n)] = run(n)
+
+    if args.output:
+        save_results(current, args.output)
+    if args.baseline:
+        rows = compare(load_results(args.baseline), current, threshold=args.threshold)
+        sys.exit(1 if print_comparison(rows, args.threshold) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Shared helpers for the benchmark scripts in this directory."""
+from __future__ import annotations
+
+import json
+import os
+import platform
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from src.trader_sentiment import synthetic
+from src.trader_sentiment.data_loader import _normalize_trades
+
+
+def make_trades(
+    n_rows: int,
+    n_accounts: int = 5_000,
+    n_days: int = 365,
+    skew: float = 1.0,
+    seed: int = 42,
+) -> pd.DataFrame:
+    """Synthetic fills as ``load_trades`` returns them (lowercase columns, ``date`` day keys)."""
+    raw = synthetic.make_trades(n_rows, n_accounts=n_accounts, n_days=n_days, skew=skew, seed=seed)
+    return _normalize_trades(raw)
+
+
+@contextmanager
+def timed(label: str, results: dict):
+    start = time.perf_counter()
+    yield
+    results[label] = time.perf_counter() - start
+    print(f"{label:<40} {results[label]:8.2f}s")
+
+
+# Differences below these are timer/allocator noise, whatever the ratio
+MIN_SECONDS = 0.05
+MIN_MB = 1.0
+
+
+def environment() -> dict:
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.2) -> list[dict]:
+    """Rows for every (rows, stage, metric) present in both runs, with ``regression`` flagged.
+
+    Runs are ``{"results": {rows: {stage: {"seconds": ..., "peak_mb": ...}}}}``.
+    """
+    out = []
+    for rows, stages in current["results"].items():
+        base_stages = baseline["results"].get(rows, {})
+        for stage, metrics in stages.items():
+            if stage.startswith("_") or stage not in base_stages:
+                continue
+            for metric, floor in (("seconds", MIN_SECONDS), ("peak_mb", MIN_MB)):
+                old, new = base_stages[stage].get(metric), metrics.get(metric)
+                if old is None or new is None:
+                    continue
+                ratio = new / old if old else float("inf")
+                out.append({
+                    "rows": int(rows),
+                    "stage": stage,
+                    "metric": metric,
+                    "baseline": old,
+                    "current": new,
+                    "ratio": ratio,
+                    "regression": ratio > 1 + threshold and new - old > floor,
+                })
+    return out
+
+
+def print_comparison(rows: list[dict], threshold: float) -> bool:
+    """Print the comparison table; returns True when anything regressed."""
+    print(f"--- compared against baseline (threshold +{threshold:.0%})")
+    for r in rows:
+        flag = "  REGRESSION" if r["regression"] else ""
+        print(
+            f"{r['rows']:>11,} {r['stage']:<40} {r['metric']:<8}"
+            f" {r['baseline']:10.2f} -> {r['current']:10.2f} ({r['ratio']:5.2f}x){flag}"
+        )
+    return any(r["regression"] for r in rows)
+
+
+def load_results(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_results(run: dict, path: str) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(run, f, indent=2)
+    print(f"results written to {path}")
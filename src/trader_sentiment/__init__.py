@@ -1 +1,126 @@
-# flake8: noqa
+"""Trader behaviour vs. market sentiment: loading, aggregation, analysis and models.
+
+The public names below are resolved on first access, so ``import trader_sentiment`` costs
+next to nothing and each submodule (with its pandas/scikit-learn/requests imports) loads
+only when something from it is used.
+"""
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "Paths": "data_loader",
+    "ensure_data_exists": "data_loader",
+    "load_trades": "data_loader",
+    "load_fear_greed": "data_loader",
+    "iter_trades": "data_loader",
+    "daily_trader_agg": "data_loader",
+    "daily_trader_agg_chunked": "data_loader",
+    "join_sentiment": "analysis",
+    "build_daily_join": "analysis",
+    "analyze_correlations": "analysis",
+    "build_trader_profile": "analysis",
+    "fit_trader_clusters": "analysis",
+    "select_n_clusters": "analysis",
+    "cluster_traders": "analysis",
+    "predict_pnl": "analysis",
+    "predict_win_probability": "analysis",
+    "calculate_risk_metrics": "analysis",
+    "rolling_risk_metrics": "analysis",
+    "walk_forward_folds": "backtest",
+    "walk_forward_win_probability": "backtest",
+    "cached_trades": "cache",
+    "cached_daily_join": "cache",
+    "CovarianceAccumulator": "covariance",
+    "GroupedCovariance": "covariance",
+    "SentimentCube": "cube",
+    "FeatureStore": "features",
+    "sample_scatter": "downsample",
+    "downsample_series": "downsample",
+    "DailyJoinState": "incremental",
+    "LiveTradeFeed": "live_data",
+    "compact_frame": "memory",
+    "ModelRegistry": "model_registry",
+    "TradeSequenceState": "trade_model",
+    "train_trade_win_model": "trade_model",
+    "TradeStore": "trade_store",
+    "write_trade_store": "trade_store",
+    "parallel_daily_join": "parallel",
+    "parallel_correlations": "parallel",
+    "run_report": "report",
+    "read_artifact": "report",
+}
+
+_SUBMODULES = {
+    "analysis", "backtest", "cache", "covariance", "cube", "data_loader", "downsample", "features",
+    "incremental", "live_data", "memory", "model_registry", "parallel", "profiling", "report", "synthetic",
+    "trade_model", "trade_store",
+}
+
+# Literal so linters and type checkers see the re-exports below as used
+__all__ = [
+    "CovarianceAccumulator", "DailyJoinState", "FeatureStore", "GroupedCovariance", "LiveTradeFeed",
+    "ModelRegistry", "Paths", "SentimentCube", "TradeSequenceState", "TradeStore", "analyze_correlations",
+    "build_daily_join", "build_trader_profile", "cached_daily_join", "cached_trades", "calculate_risk_metrics",
+    "cluster_traders", "compact_frame", "daily_trader_agg", "daily_trader_agg_chunked", "downsample_series",
+    "ensure_data_exists", "fit_trader_clusters", "iter_trades", "join_sentiment", "load_fear_greed", "load_trades",
+    "parallel_correlations", "parallel_daily_join", "predict_pnl", "predict_win_probability", "read_artifact",
+    "rolling_risk_metrics", "run_report", "sample_scatter", "select_n_clusters", "train_trade_win_model",
+    "walk_forward_folds", "walk_forward_win_probability", "write_trade_store",
+]
+
+if TYPE_CHECKING:
+    from .analysis import (
+        analyze_correlations,
+        build_daily_join,
+        build_trader_profile,
+        calculate_risk_metrics,
+        cluster_traders,
+        fit_trader_clusters,
+        join_sentiment,
+        predict_pnl,
+        predict_win_probability,
+        rolling_risk_metrics,
+        select_n_clusters,
+    )
+    from .backtest import walk_forward_folds, walk_forward_win_probability
+    from .cache import cached_daily_join, cached_trades
+    from .covariance import CovarianceAccumulator, GroupedCovariance
+    from .cube import SentimentCube
+    from .data_loader import (
+        Paths,
+        daily_trader_agg,
+        daily_trader_agg_chunked,
+        ensure_data_exists,
+        iter_trades,
+        load_fear_greed,
+        load_trades,
+    )
+    from .downsample import downsample_series, sample_scatter
+    from .features import FeatureStore
+    from .incremental import DailyJoinState
+    from .live_data import LiveTradeFeed
+    from .memory import compact_frame
+    from .model_registry import ModelRegistry
+    from .parallel import parallel_correlations, parallel_daily_join
+    from .report import read_artifact, run_report
+    from .trade_model import TradeSequenceState, train_trade_win_model
+    from .trade_store import TradeStore, write_trade_store
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # Cache on the package so later lookups skip this hook
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_EXPORTS) | _SUBMODULES)
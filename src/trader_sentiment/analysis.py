@@ -1,89 +1,274 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable
+
 import numpy as np
 import pandas as pd
-from sklearn.cluster import KMeans
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.metrics import mean_squared_error, r2_score
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
 
-from .data_loader import align_with_sentiment, daily_trader_agg, load_fear_greed, load_trades
+from .covariance import accumulate
+from .data_loader import (
+    align_with_sentiment,
+    daily_trader_agg,
+    daily_trader_agg_chunked,
+    load_fear_greed,
+    load_trades,
+)
+from .features import PNL_FEATURES, WIN_FEATURES, FeatureStore
+from .memory import compact_frame
+from .model_registry import ModelRegistry
+from .profiling import instrument, stage
 
+if TYPE_CHECKING:
+    from sklearn.preprocessing import StandardScaler
 
-def build_daily_join(trades_path: str, fear_greed_path: str) -> pd.DataFrame:
-    trades = load_trades(trades_path)
-    fng = load_fear_greed(fear_greed_path)
-    daily = daily_trader_agg(trades)
+# scikit-learn (and joblib) are imported inside the functions that fit models, so importing
+# this module -- and the dashboard's cold start -- does not pay for them.
+
+SENTIMENT_MAP = {"extreme fear": 0, "fear": 1, "neutral": 2, "greed": 3, "extreme greed": 4}
+
+
+@instrument()
+def join_sentiment(daily: pd.DataFrame, fng: pd.DataFrame) -> pd.DataFrame:
+    """Attach Fear/Greed classification and its numeric score to daily aggregates."""
     joined = align_with_sentiment(daily, fng)
-    
-    # Feature Engineering: Encode sentiment
-    sentiment_map = {"extreme fear": 0, "fear": 1, "neutral": 2, "greed": 3, "extreme greed": 4}
-    joined["sentiment_score"] = joined["classification"].map(sentiment_map)
-    
+
+    # Feature Engineering: Encode sentiment (via object so a categorical column still maps to numbers)
+    joined["sentiment_score"] = joined["classification"].astype(object).map(SENTIMENT_MAP)
+
     return joined
 
 
-def analyze_correlations(df: pd.DataFrame) -> pd.DataFrame:
-    """Compute correlation matrix for numerical columns."""
-    numeric_cols = df.select_dtypes(include=[np.number]).columns
-    return df[numeric_cols].corr()
+@instrument()
+def build_daily_join(
+    trades_path: str,
+    fear_greed_path: str,
+    chunksize: int | None = None,
+    n_jobs: int | None = None,
+    compact: bool = False,
+) -> pd.DataFrame:
+    """Daily per-account aggregates joined with Fear/Greed sentiment.
 
+    Pass ``chunksize`` to stream the trades file instead of loading it whole; memory then
+    stays proportional to the chunk size, which is what full-history exports need.
+    Pass ``n_jobs`` > 1 to aggregate account partitions on a process pool instead
+    (in-memory path only). ``compact`` shrinks the result's dtypes (see ``compact_frame``).
+    """
+    fng = load_fear_greed(fear_greed_path)
+    if chunksize:
+        joined = join_sentiment(daily_trader_agg_chunked(trades_path, chunksize=chunksize), fng)
+    elif n_jobs and n_jobs > 1:
+        from .parallel import parallel_daily_join
 
-def cluster_traders(df: pd.DataFrame, n_clusters: int = 3) -> pd.DataFrame:
-    """Cluster traders based on their daily performance metrics."""
-    # Aggregate by account to get overall trader profile
-    trader_profile = df.groupby("account").agg({
+        joined = parallel_daily_join(load_trades(trades_path), fng, n_jobs=n_jobs)
+    else:
+        joined = join_sentiment(daily_trader_agg(load_trades(trades_path)), fng)
+    return compact_frame(joined) if compact else joined
+
+
+def analyze_correlations(df: pd.DataFrame | Iterable[pd.DataFrame], by: str | None = None) -> pd.DataFrame:
+    """Compute correlation matrix for numerical columns.
+
+    ``df`` may also be an iterable of chunks (e.g. ``iter_frame_batches`` over the cached
+    daily join), which are folded into a streaming covariance accumulator so the whole
+    frame never has to be in memory. With ``by`` (e.g. "classification") one matrix per
+    group is returned, stacked under the group key.
+    """
+    if isinstance(df, pd.DataFrame) and by is None:
+        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        return df[numeric_cols].corr()
+    acc = accumulate([df] if isinstance(df, pd.DataFrame) else df, by=by)
+    return acc.corr_by_group() if by else acc.corr()
+
+
+CLUSTER_FEATURES = ["total_pnl", "volume_usd", "win_rate"]
+
+# Above this many accounts, cluster_traders switches to MiniBatchKMeans by default
+MINIBATCH_THRESHOLD = 20_000
+
+
+def build_trader_profile(df: pd.DataFrame) -> pd.DataFrame:
+    """Aggregate daily rows into one overall profile per account."""
+    trader_profile = df.groupby("account", observed=True).agg({
         "total_pnl": "sum",
         "volume_usd": "sum",
         "trades": "sum",
         "winning_trades": "sum",
         "losing_trades": "sum"
     }).fillna(0)
-    
+
     trader_profile["win_rate"] = trader_profile["winning_trades"] / trader_profile["trades"]
-    
-    features = ["total_pnl", "volume_usd", "win_rate"]
-    X = trader_profile[features]
-    
+    return trader_profile
+
+
+def _cluster_matrix(profile: pd.DataFrame, features: list[str]) -> np.ndarray:
+    X = profile[features]
     # Handle infinite values if any
-    X = X.replace([np.inf, -np.inf], np.nan).fillna(0)
-    
-    scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(X)
-    
-    kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
-    trader_profile["cluster"] = kmeans.fit_predict(X_scaled)
-    
+    return X.replace([np.inf, -np.inf], np.nan).fillna(0).to_numpy(dtype="float64")
+
+
+def _make_kmeans(n_clusters: int, method: str, n_samples: int, random_state: int = 42):
+    from sklearn.cluster import KMeans, MiniBatchKMeans
+
+    if method == "auto":
+        method = "minibatch" if n_samples > MINIBATCH_THRESHOLD else "kmeans"
+    if method == "minibatch":
+        return MiniBatchKMeans(n_clusters=n_clusters, random_state=random_state, batch_size=4096, n_init=3)
+    if method == "kmeans":
+        return KMeans(n_clusters=n_clusters, random_state=random_state, n_init=10)
+    raise ValueError(f"Unknown clustering method: {method!r}")
+
+
+@dataclass
+class TraderClusterModel:
+    """Fitted scaler + centroids, reusable to assign accounts without refitting."""
+
+    scaler: StandardScaler
+    kmeans: object
+    features: list[str]
+
+    @property
+    def n_clusters(self) -> int:
+        return len(self.kmeans.cluster_centers_)
+
+    def assign(self, profile: pd.DataFrame) -> pd.Series:
+        """Nearest-centroid cluster for each account in a ``build_trader_profile`` frame."""
+        X_scaled = self.scaler.transform(_cluster_matrix(profile, self.features))
+        return pd.Series(self.kmeans.predict(X_scaled), index=profile.index, name="cluster")
+
+
+@instrument()
+def fit_trader_clusters(
+    profile: pd.DataFrame,
+    n_clusters: int = 3,
+    method: str = "auto",
+    features: list[str] | None = None,
+) -> TraderClusterModel:
+    """Fit scaler and (MiniBatch)KMeans on a trader profile.
+
+    ``method`` is "kmeans" (full batch), "minibatch", or "auto" (minibatch above
+    ``MINIBATCH_THRESHOLD`` accounts).
+    """
+    from sklearn.preprocessing import StandardScaler
+
+    features = features or CLUSTER_FEATURES
+    X = _cluster_matrix(profile, features)
+    scaler = StandardScaler().fit(X)
+    kmeans = _make_kmeans(n_clusters, method, len(X)).fit(scaler.transform(X))
+    return TraderClusterModel(scaler=scaler, kmeans=kmeans, features=features)
+
+
+def _score_k(X_sample: np.ndarray, k: int, random_state: int) -> dict:
+    from sklearn.cluster import MiniBatchKMeans
+    from sklearn.metrics import silhouette_score
+
+    km = MiniBatchKMeans(n_clusters=k, random_state=random_state, batch_size=4096, n_init=3).fit(X_sample)
+    labels = km.labels_
+    silhouette = silhouette_score(X_sample, labels) if len(set(labels)) > 1 else np.nan
+    return {"k": k, "inertia": km.inertia_, "silhouette": silhouette}
+
+
+@instrument()
+def select_n_clusters(
+    profile: pd.DataFrame,
+    k_values=range(2, 9),
+    metric: str = "silhouette",
+    sample_size: int = 5_000,
+    n_jobs: int = -1,
+    random_state: int = 42,
+) -> tuple[int, pd.DataFrame]:
+    """Pick k by scoring candidate values in parallel on a sample of accounts.
+
+    Returns the chosen k and the per-k scores. With ``metric="silhouette"`` the highest
+    silhouette wins; with ``"inertia"`` the elbow (largest drop in improvement) is used.
+    The elbow is also the fallback when no k has a defined silhouette (every candidate
+    collapsed into a single cluster).
+    """
+    if metric not in ("silhouette", "inertia"):
+        raise ValueError(f"Unknown metric: {metric!r}")
+    from joblib import Parallel, delayed
+    from sklearn.preprocessing import StandardScaler
+
+    X = _cluster_matrix(profile, CLUSTER_FEATURES)
+    X = StandardScaler().fit_transform(X)
+    if len(X) > sample_size:
+        rng = np.random.default_rng(random_state)
+        X = X[rng.choice(len(X), size=sample_size, replace=False)]
+    k_values = [k for k in k_values if 1 < k < len(X)]
+    if not k_values:
+        raise ValueError("Not enough accounts to compare cluster counts")
+
+    rows = Parallel(n_jobs=n_jobs)(delayed(_score_k)(X, k, random_state) for k in k_values)
+    scores = pd.DataFrame(rows).set_index("k")
+
+    if metric == "silhouette" and scores["silhouette"].notna().any():
+        best = int(scores["silhouette"].idxmax())
+    else:
+        # Elbow: the k furthest below the straight line between the first and last inertia
+        k = scores.index.to_numpy(dtype="float64")
+        inertia = scores["inertia"].to_numpy()
+        span = max(inertia[0] - inertia[-1], 1e-12)
+        below_line = (1 - (k - k[0]) / max(k[-1] - k[0], 1)) - (inertia - inertia[-1]) / span
+        best = int(k[np.argmax(below_line)])
+    return best, scores
+
+
+@instrument()
+def cluster_traders(df: pd.DataFrame, n_clusters: int = 3, method: str = "auto") -> pd.DataFrame:
+    """Cluster traders based on their daily performance metrics."""
+    # Aggregate by account to get overall trader profile
+    trader_profile = build_trader_profile(df)
+    model = fit_trader_clusters(trader_profile, n_clusters=n_clusters, method=method)
+    trader_profile["cluster"] = model.kmeans.labels_
     return trader_profile
 
 
-def predict_pnl(df: pd.DataFrame) -> dict:
-    """Train a model to predict daily PnL based on sentiment and volume."""
-    # Prepare data
-    model_df = df.dropna(subset=["sentiment_score", "volume_usd", "total_pnl"]).copy()
-    
-    if len(model_df) < 100:
+@instrument()
+def predict_pnl(
+    df: pd.DataFrame,
+    registry: ModelRegistry | None = None,
+    store: FeatureStore | None = None,
+) -> dict:
+    """Train a model to predict daily PnL based on sentiment and volume.
+
+    With a ``registry``, an identical training set and settings load the saved model
+    instead of retraining. Features come from ``store`` (built from ``df`` if not given).
+    """
+    store = store if store is not None else FeatureStore.from_daily(df)
+    rows = store.complete(["sentiment_score", "volume_usd", "total_pnl"])
+
+    if rows.sum() < 100:
         return {"error": "Not enough data for modeling"}
-        
-    X = model_df[["sentiment_score", "volume_usd", "trades"]]
-    y = model_df["total_pnl"]
-    
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-    
-    model = RandomForestRegressor(n_estimators=100, random_state=42)
-    model.fit(X_train, y_train)
-    
-    y_pred = model.predict(X_test)
-    mse = mean_squared_error(y_test, y_pred)
-    r2 = r2_score(y_test, y_pred)
-    
-    return {
-        "model": model,
-        "mse": mse,
-        "r2": r2,
-        "feature_importance": dict(zip(X.columns, model.feature_importances_))
-    }
+
+    X = store.matrix(PNL_FEATURES, rows)
+    y = pd.Series(store["total_pnl"][rows], name="total_pnl")
+    params = {"model": "RandomForestRegressor", "n_estimators": 100, "random_state": 42, "test_size": 0.2}
+
+    def train() -> dict:
+        from sklearn.ensemble import RandomForestRegressor
+        from sklearn.metrics import mean_squared_error, r2_score
+        from sklearn.model_selection import train_test_split
+
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+        model = RandomForestRegressor(n_estimators=100, random_state=42)
+        with stage("fit_random_forest", rows_in=len(X_train)):
+            model.fit(X_train, y_train)
+
+        y_pred = model.predict(X_test)
+        mse = mean_squared_error(y_test, y_pred)
+        r2 = r2_score(y_test, y_pred)
+
+        return {
+            "model": model,
+            "mse": mse,
+            "r2": r2,
+            "feature_importance": dict(zip(X.columns, model.feature_importances_))
+        }
+
+    if registry is None:
+        return train()
+    return registry.fetch_or_train(X, y, params, train)
 
 
 if __name__ == "__main__":
@@ -122,56 +307,214 @@ def calculate_sortino_ratio(returns: pd.Series, target_return: float = 0.0) -> f
 
 
 def calculate_max_drawdown(cumulative_returns: pd.Series) -> float:
-    """Calculate Maximum Drawdown."""
+    """Calculate Maximum Drawdown.
+
+    Drawdown is relative to the running peak, so it is only defined once that peak is
+    positive; cumulative PnL that never rises above zero has a drawdown of 0.0 here
+    (use the absolute ``max_drawdown_usd`` from ``calculate_risk_metrics`` for those).
+    """
     peak = cumulative_returns.cummax()
-    drawdown = (cumulative_returns - peak) / peak
-    return drawdown.min()
+    drawdown = (cumulative_returns - peak) / peak.where(peak > 0)
+    return float(drawdown.min()) if drawdown.notna().any() else 0.0
 
 
-def predict_win_probability(df: pd.DataFrame) -> dict:
-    """Train a classifier to predict the probability of the NEXT trade being a win."""
-    # We need trade-level data for this, but we are working with daily aggregates in this function context.
-    # Ideally, this should run on the raw trades df. 
-    # For now, let's create a proxy using daily data: "Will tomorrow be a winning day?"
-    
-    model_df = df.sort_values(["account", "date"]).copy()
-    
-    # Target: Next day PnL > 0
-    model_df["next_day_win"] = (model_df.groupby("account")["total_pnl"].shift(-1) > 0).astype(int)
-    
-    # Features: Lagged sentiment, current leverage, volume
-    model_df["prev_sentiment"] = model_df.groupby("account")["sentiment_score"].shift(1)
-    
-    features = ["sentiment_score", "prev_sentiment", "volume_usd"]
-    
-    if "avg_leverage" in df.columns:
-        model_df["prev_leverage"] = model_df.groupby("account")["avg_leverage"].shift(1)
-        features.extend(["avg_leverage", "prev_leverage"])
-    
-    model_df = model_df.dropna()
-    
-    if len(model_df) < 50:
+@instrument()
+def calculate_risk_metrics(
+    df: pd.DataFrame,
+    risk_free_rate: float = 0.0,
+    target_return: float = 0.0,
+    pnl_col: str = "total_pnl",
+) -> pd.DataFrame:
+    """Sharpe, Sortino and Max Drawdown for every account in one vectorized pass.
+
+    Same definitions as the single-series functions above, applied to each account's daily
+    PnL in date order, but computed with grouped reductions and cumulative operations
+    instead of filtering the frame once per account.
+    """
+    daily = df.sort_values(["account", "date"], kind="stable")
+    returns = daily[pnl_col]
+    account = daily["account"]
+    g = returns.groupby(account, observed=True, sort=True)
+
+    mean = g.mean()
+    std = g.std()
+    sharpe = ((mean - risk_free_rate) / std).mask(std == 0, 0.0)
+
+    downside_std = returns.where(returns < target_return).groupby(account, observed=True, sort=True).std()
+    sortino = ((mean - target_return) / downside_std).mask(downside_std == 0, 0.0)
+
+    cumulative = g.cumsum()
+    peak = cumulative.groupby(account, observed=True).cummax()
+    drawdown_usd = cumulative - peak
+    drawdown = drawdown_usd / peak.where(peak > 0)
+
+    return pd.DataFrame({
+        "total_pnl": g.sum(),
+        "days": g.size(),
+        "sharpe_ratio": sharpe,
+        "sortino_ratio": sortino,
+        "max_drawdown": drawdown.groupby(account, observed=True, sort=True).min().fillna(0.0),
+        "max_drawdown_usd": drawdown_usd.groupby(account, observed=True, sort=True).min(),
+    }).rename_axis("account")
+
+
+def _window_sums(cumulative: np.ndarray, start: np.ndarray, first: np.ndarray) -> np.ndarray:
+    """Sums over rows [start, i] from per-account running sums (``first``: account's first row).
+
+    ``cumulative`` is 2-D (rows x quantities) so every quantity shares one gather.
+    """
+    before = cumulative[np.maximum(start - 1, 0)]
+    before[start <= first] = 0.0
+    return cumulative - before
+
+
+def _window_std(s1: np.ndarray, s2: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """Sample std (ddof=1) from window sums; residue of cancellation below ~1e-12 counts as 0."""
+    m2 = s2 - s1 ** 2 / n
+    m2 = np.where(m2 <= 1e-12 * np.abs(s2), 0.0, m2)
+    return np.sqrt(m2 / (n - 1))
+
+
+def _window_max(values: np.ndarray, starts: list[np.ndarray]) -> list[np.ndarray]:
+    """max(values[start[i]:i + 1]) for every i and every ``start`` array, via a doubling sweep.
+
+    Each window length is split into power-of-two blocks and the block maxima are built one
+    table level at a time, shared by all windows; memory stays O(n), time O(n log window).
+    """
+    n = len(values)
+    idx = np.arange(n)
+    lengths = [idx - start + 1 for start in starts]
+    results = [np.full(n, -np.inf) for _ in starts]
+    positions = [start.copy() for start in starts]
+    level = values.astype("float64", copy=True)
+    k = 0
+    while any((length >> k).any() for length in lengths):
+        step = 1 << k
+        for length, result, pos in zip(lengths, results, positions):
+            take = ((length >> k) & 1).astype(bool)
+            np.maximum(result, np.where(take, level[np.minimum(pos, n - 1)], -np.inf), out=result)
+            pos += take * step
+        # level[i] = max(values[i:i + 2 * step]) for the next round
+        np.maximum(level[: n - step], level[step:], out=level[: n - step])
+        k += 1
+    return results
+
+
+@instrument()
+def rolling_risk_metrics(
+    df: pd.DataFrame,
+    windows: tuple[int, ...] = (7, 30, 90),
+    risk_free_rate: float = 0.0,
+    target_return: float = 0.0,
+    pnl_col: str = "total_pnl",
+) -> pd.DataFrame:
+    """Rolling Sharpe, Sortino and drawdown per account over calendar-day windows.
+
+    A ``w``-day window at a given account-day covers that account's trading days in
+    (date - w days, date]; days without trades are simply absent, so a window never
+    reaches into another account or further back than ``w`` calendar days. Drawdown is
+    measured against the peak cumulative PnL inside the window (0.0 while that peak is not
+    positive, as in ``calculate_max_drawdown``).
+
+    Everything is computed for all accounts at once from running sums and a vectorized
+    window max, without a Python loop over accounts or dates. Rows without a date are
+    dropped; with none left the result is empty.
+    """
+    daily = df[pd.to_datetime(df["date"]).notna()]
+    daily = daily.sort_values(["account", "date"], kind="stable").reset_index(drop=True)
+    if daily.empty:
+        metrics = [f"{m}_{w}d" for w in windows for m in ("sharpe", "sortino", "drawdown", "days")]
+        return daily[["account", "date"]].reindex(columns=["account", "date", *metrics])
+    returns = daily[pnl_col].fillna(0.0).to_numpy(dtype="float64")
+    codes, _ = pd.factorize(daily["account"], sort=True)
+    day = pd.to_datetime(daily["date"]).to_numpy().astype("datetime64[D]").astype("int64")
+
+    # One strictly increasing key per account-day: accounts are laid out back to back with a
+    # gap wider than any window, so a single searchsorted finds every window start.
+    gap = int(day.max() - day.min()) + max(windows) + 1
+    key = codes.astype("int64") * gap + (day - day.min())
+    first = np.searchsorted(key, codes.astype("int64") * gap, side="left")
+
+    downside = np.where(returns < target_return, returns, 0.0)
+    quantities = ["n", "s1", "s2", "nd", "d1", "d2"]
+    running = pd.DataFrame({
+        "n": 1.0,
+        "s1": returns,
+        "s2": returns ** 2,
+        "nd": (returns < target_return).astype("float64"),
+        "d1": downside,
+        "d2": downside ** 2,
+    }).groupby(codes).cumsum()[quantities].to_numpy()
+    cumulative_pnl = running[:, 1]
+
+    starts = [np.searchsorted(key, key - (w - 1), side="left") for w in windows]
+    peaks = _window_max(cumulative_pnl, starts)
+
+    out = daily[["account", "date"]].copy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for w, start, peak in zip(windows, starts, peaks):
+            n, s1, s2, nd, d1, d2 = _window_sums(running, start, first).T
+
+            mean = s1 / n
+            std = _window_std(s1, s2, n)
+            sharpe = np.where(n > 1, (mean - risk_free_rate) / std, np.nan)
+            out[f"sharpe_{w}d"] = np.where(std == 0, 0.0, sharpe)
+
+            downside_std = _window_std(d1, d2, nd)
+            sortino = np.where(nd > 1, (mean - target_return) / downside_std, np.nan)
+            out[f"sortino_{w}d"] = np.where(downside_std == 0, 0.0, sortino)
+
+            out[f"drawdown_{w}d"] = np.where(peak > 0, (cumulative_pnl - peak) / peak, 0.0)
+            out[f"days_{w}d"] = n.astype("int64")
+
+    return out
+
+
+@instrument()
+def predict_win_probability(
+    df: pd.DataFrame,
+    registry: ModelRegistry | None = None,
+    store: FeatureStore | None = None,
+) -> dict:
+    """Train a classifier to predict the probability of the NEXT trade being a win.
+
+    With a ``registry``, an identical training set and settings load the saved model
+    instead of retraining. Features come from ``store`` (built from ``df`` if not given).
+    """
+    # A proxy on daily aggregates: "Will tomorrow be a winning day?". The trade-level model
+    # on raw fills is trade_model.train_trade_win_model.
+    store = store if store is not None else FeatureStore.from_daily(df)
+    features = store.available(WIN_FEATURES)
+    rows = store.complete([*features, "next_day_win"])
+
+    if rows.sum() < 50:
         return {"error": "Not enough historical data for win probability model"}
-        
-    X = model_df[features]
-    y = model_df["next_day_win"]
-    
-    from sklearn.ensemble import RandomForestClassifier
-    from sklearn.metrics import accuracy_score, roc_auc_score
-    
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-    
-    clf = RandomForestClassifier(n_estimators=100, random_state=42)
-    clf.fit(X_train, y_train)
-    
-    y_pred = clf.predict(X_test)
-    y_prob = clf.predict_proba(X_test)[:, 1]
-    
-    return {
-        "model": clf,
-        "accuracy": accuracy_score(y_test, y_pred),
-        "auc": roc_auc_score(y_test, y_prob),
-        "feature_importance": dict(zip(X.columns, clf.feature_importances_))
-    }
 
+    X = store.matrix(features, rows)
+    y = pd.Series(store["next_day_win"][rows].astype("int64"), name="next_day_win")
+    params = {"model": "RandomForestClassifier", "n_estimators": 100, "random_state": 42, "test_size": 0.2}
+
+    def train() -> dict:
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.metrics import accuracy_score, roc_auc_score
+        from sklearn.model_selection import train_test_split
+
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+        clf = RandomForestClassifier(n_estimators=100, random_state=42)
+        with stage("fit_random_forest", rows_in=len(X_train)):
+            clf.fit(X_train, y_train)
+
+        y_pred = clf.predict(X_test)
+        y_prob = clf.predict_proba(X_test)[:, 1]
+
+        return {
+            "model": clf,
+            "accuracy": accuracy_score(y_test, y_pred),
+            "auc": roc_auc_score(y_test, y_prob),
+            "feature_importance": dict(zip(X.columns, clf.feature_importances_))
+        }
 
+    if registry is None:
+        return train()
+    return registry.fetch_or_train(X, y, params, train)
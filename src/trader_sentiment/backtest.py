@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from .features import WIN_FEATURES, FeatureStore
+from .profiling import instrument
+
+# Folds with fewer test or training rows than this are skipped rather than scored
+MIN_FOLD_ROWS = 20
+
+
+def walk_forward_folds(
+    dates: pd.Series,
+    n_folds: int = 5,
+    embargo_days: int = 1,
+    label_dates: pd.Series | None = None,
+) -> list[tuple[np.ndarray, np.ndarray]]:
+    """Expanding-window (train, test) row positions over ``dates``, oldest fold first.
+
+    The distinct dates are cut into ``n_folds + 1`` consecutive blocks; fold ``k`` tests on
+    block ``k + 1``. It trains on every row whose label is dated more than ``embargo_days``
+    days before the test window starts. ``label_dates`` is the date each row's target is
+    observed; for a next-trading-day target that is the account's next row, which can be
+    weeks after the row itself. Without it, a row's label is taken to be its own date.
+    Rows whose label date is missing are never trained on.
+    """
+    if n_folds < 1:
+        raise ValueError("n_folds must be at least 1")
+    day = pd.to_datetime(dates).to_numpy().astype("datetime64[D]").astype("int64")
+    unique = np.unique(day)
+    if len(unique) < n_folds + 1:
+        raise ValueError(f"{len(unique)} distinct dates cannot make {n_folds} walk-forward folds")
+    edges = unique[np.linspace(0, len(unique), n_folds + 2).astype("int64")[:-1]]
+    edges = np.append(edges, unique[-1] + 1)
+    if label_dates is None:
+        label_day, labelled = day, np.ones(len(day), dtype=bool)
+    else:
+        labels = pd.to_datetime(pd.Series(label_dates)).reset_index(drop=True)
+        labelled = labels.notna().to_numpy()
+        label_day = labels.to_numpy().astype("datetime64[D]").astype("int64")
+    folds = []
+    for k in range(1, n_folds + 1):
+        test_start, test_end = edges[k], edges[k + 1]
+        # Purged: a training row's target must be known before the test window (less the embargo)
+        train = np.flatnonzero(labelled & (label_day < test_start - embargo_days))
+        test = np.flatnonzero((day >= test_start) & (day < test_end))
+        folds.append((train, test))
+    return folds
+
+
+def _score_fold(X: np.ndarray, y: np.ndarray, train: np.ndarray, test: np.ndarray, params: dict) -> dict:
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.metrics import accuracy_score, roc_auc_score
+
+    # One core per fold: the fan-out across folds is what uses n_jobs
+    clf = RandomForestClassifier(**params, n_jobs=1).fit(X[train], y[train])
+    prob = clf.predict_proba(X[test])[:, list(clf.classes_).index(1)] if 1 in clf.classes_ else np.zeros(len(test))
+    return {
+        "accuracy": accuracy_score(y[test], prob > 0.5),
+        # Undefined when the test window holds only wins or only losses
+        "auc": roc_auc_score(y[test], prob) if len(np.unique(y[test])) > 1 else np.nan,
+        "prob": prob,
+    }
+
+
+@instrument()
+def walk_forward_win_probability(
+    df: pd.DataFrame,
+    n_folds: int = 5,
+    embargo_days: int = 1,
+    n_jobs: int = -1,
+    n_estimators: int = 100,
+    random_state: int = 42,
+    store: FeatureStore | None = None,
+) -> dict:
+    """Walk-forward backtest of the ``predict_win_probability`` classifier.
+
+    The lagged features come from ``store`` (built from ``df`` if not given); each fold
+    of ``walk_forward_folds`` then fits a fresh forest on its past and scores its test
+    window, with folds trained in parallel on ``n_jobs`` processes. Training rows are
+    purged by the date of their target, the account's next trading day. Returns the
+    per-fold table (windows, sizes, base rate, accuracy, AUC), the mean and std of the
+    fold metrics, and accuracy/AUC over all out-of-sample predictions pooled.
+    """
+    from joblib import Parallel, delayed
+    from sklearn.metrics import roc_auc_score
+
+    store = store if store is not None else FeatureStore.from_daily(df)
+    features = store.available(WIN_FEATURES)
+    rows = store.complete([*features, "next_day_win"])
+    if rows.sum() < 50:
+        return {"error": "Not enough historical data for win probability model"}
+
+    X = store.matrix(features, rows).to_numpy()
+    y = store["next_day_win"][rows].astype("int64")
+    index = store.index
+    # next_day_win is observed on the account's next trading day, not the next calendar day
+    next_date = index["date"].shift(-1).where(index["account"].shift(-1) == index["account"])
+    dates = pd.to_datetime(index["date"][rows]).reset_index(drop=True)
+    label_dates = pd.to_datetime(next_date[rows]).reset_index(drop=True)
+    folds = [
+        (train, test) for train, test in walk_forward_folds(dates, n_folds, embargo_days, label_dates)
+        if len(train) >= MIN_FOLD_ROWS and len(test) >= MIN_FOLD_ROWS
+    ]
+    if not folds:
+        return {"error": "Not enough history for any walk-forward fold"}
+
+    params = {"n_estimators": n_estimators, "random_state": random_state}
+    scores = Parallel(n_jobs=n_jobs)(delayed(_score_fold)(X, y, train, test, params) for train, test in folds)
+
+    table = pd.DataFrame([
+        {
+            "fold": i,
+            "train_start": dates[train].min(),
+            "train_end": dates[train].max(),
+            "train_label_end": label_dates[train].max(),
+            "test_start": dates[test].min(),
+            "test_end": dates[test].max(),
+            "n_train": len(train),
+            "n_test": len(test),
+            "base_rate": y[test].mean(),
+            "accuracy": score["accuracy"],
+            "auc": score["auc"],
+        }
+        for i, ((train, test), score) in enumerate(zip(folds, scores))
+    ]).set_index("fold")
+
+    y_oos = np.concatenate([y[test] for _, test in folds])
+    prob_oos = np.concatenate([score["prob"] for score in scores])
+    return {
+        "folds": table,
+        "features": features,
+        "accuracy": table["accuracy"].mean(),
+        "accuracy_std": table["accuracy"].std(),
+        "auc": table["auc"].mean(),
+        "auc_std": table["auc"].std(),
+        "oos_accuracy": float(((prob_oos > 0.5) == y_oos).mean()),
+        "oos_auc": roc_auc_score(y_oos, prob_oos) if len(np.unique(y_oos)) > 1 else np.nan,
+    }
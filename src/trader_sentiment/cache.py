@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+from pathlib import Path
+
+import pandas as pd
+
+from .analysis import build_daily_join
+from .data_loader import ensure_data_exists, load_trades
+from .profiling import instrument, stage
+
+# Bump whenever the output of load_trades/build_daily_join changes shape or meaning,
+# so every existing cache entry is treated as stale.
+PIPELINE_VERSION = 2
+
+CACHE_PREFIX = "daily_join-"
+TRADES_FILE = "trades.parquet"
+DAILY_FILE = "daily_join.parquet"
+
+
+def source_fingerprint(paths: list[str], hash_content: bool = False) -> str:
+    """Short key identifying the current state of the source files and the pipeline version.
+
+    Size and mtime catch ordinary rewrites/appends; ``hash_content`` additionally hashes
+    the bytes, for sources whose mtime is not trustworthy (copies, checkouts).
+    """
+    h = hashlib.sha256(f"pipeline-v{PIPELINE_VERSION}".encode())
+    for path in paths:
+        st = os.stat(path)
+        h.update(f"|{os.path.basename(path)}:{st.st_size}:{st.st_mtime_ns}".encode())
+        if hash_content:
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    h.update(block)
+    return h.hexdigest()[:16]
+
+
+def _entry_dir(processed_dir: str, key: str) -> Path:
+    return Path(processed_dir) / f"{CACHE_PREFIX}{key}"
+
+
+def _write_parquet(df: pd.DataFrame, path: Path) -> None:
+    # Write next to the target and rename, so a crashed run never leaves a half-written file
+    tmp = path.with_suffix(".tmp")
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def _prune_stale(processed_dir: str, keep: str) -> None:
+    for entry in Path(processed_dir).glob(f"{CACHE_PREFIX}*"):
+        if entry.is_dir() and entry.name != f"{CACHE_PREFIX}{keep}":
+            shutil.rmtree(entry, ignore_errors=True)
+
+
+@instrument()
+def cached_trades(
+    trades_path: str,
+    fear_greed_path: str,
+    processed_dir: str,
+    hash_content: bool = False,
+) -> pd.DataFrame:
+    """load_trades backed by a Parquet copy in ``processed_dir``."""
+    ensure_data_exists(os.path.dirname(trades_path))
+    key = source_fingerprint([trades_path, fear_greed_path], hash_content=hash_content)
+    path = _entry_dir(processed_dir, key) / TRADES_FILE
+    if path.exists():
+        with stage("read_parquet_cache"):
+            return pd.read_parquet(path)
+
+    trades = load_trades(trades_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _prune_stale(processed_dir, keep=key)
+    _write_parquet(trades, path)
+    return trades
+
+
+@instrument()
+def cached_daily_join(
+    trades_path: str,
+    fear_greed_path: str,
+    processed_dir: str,
+    hash_content: bool = False,
+    chunksize: int | None = None,
+) -> pd.DataFrame:
+    """build_daily_join backed by a Parquet copy in ``processed_dir``.
+
+    Entries live in ``daily_join-<fingerprint>/`` and are rebuilt automatically when either
+    source file or ``PIPELINE_VERSION`` changes; older entries are removed on rebuild.
+    """
+    ensure_data_exists(os.path.dirname(trades_path))
+    key = source_fingerprint([trades_path, fear_greed_path], hash_content=hash_content)
+    path = _entry_dir(processed_dir, key) / DAILY_FILE
+    if path.exists():
+        with stage("read_parquet_cache"):
+            return pd.read_parquet(path)
+
+    joined = build_daily_join(trades_path, fear_greed_path, chunksize=chunksize)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _prune_stale(processed_dir, keep=key)
+    _write_parquet(joined, path)
+    return joined
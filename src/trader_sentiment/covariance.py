@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_BATCH_ROWS = 500_000
+
+
+def _batch_moments(values: np.ndarray) -> tuple[np.ndarray, ...]:
+    """Pairwise-complete (n, mean, m2, comoment) of one in-memory block, each p x p.
+
+    Entry [i, j] is taken over rows where both column i and column j are finite, as in
+    ``DataFrame.corr``: ``mean[i, j]`` and ``m2[i, j]`` are the mean and sum of squared
+    deviations of column i over those rows, ``comoment[i, j]`` their co-moment. Sums run
+    on values shifted by each column's first finite value, which keeps constant columns
+    exactly constant and the subtraction well conditioned.
+    """
+    present = np.isfinite(values)
+    shift = np.zeros(values.shape[1])
+    has_any = present.any(axis=0)
+    shift[has_any] = values[present.argmax(axis=0)[has_any], np.flatnonzero(has_any)]
+    x = np.where(present, values - shift, 0.0)
+    m = present.astype("float64")
+
+    n = m.T @ m
+    s = x.T @ m
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_s = np.where(n > 0, s / n, 0.0)
+    m2 = np.maximum((x * x).T @ m - s * mean_s, 0.0)
+    comoment = x.T @ x - s * mean_s.T
+    # The diagonal co-moment is the variance term itself; keep them bit-identical
+    np.fill_diagonal(comoment, np.diag(m2))
+    return n, mean_s + shift[:, None], m2, comoment
+
+
+@dataclass
+class CovarianceAccumulator:
+    """Mergeable running covariance over the numeric ``columns`` of a stream of frames.
+
+    Holds pairwise-complete counts, means, squared deviations and co-moments (see
+    ``_batch_moments``). ``update`` folds in a chunk, ``merge`` combines accumulators built
+    independently (other chunks, partitions, processes) with Chan et al.'s parallel
+    update, and ``subtract`` removes rows that were folded in earlier, so replacing rows
+    never needs the full data again. Results match ``DataFrame.corr``/``cov`` on the
+    concatenated input up to floating-point rounding.
+    """
+
+    columns: list[str]
+    n: np.ndarray = None
+    mean: np.ndarray = None
+    m2: np.ndarray = None
+    comoment: np.ndarray = None
+
+    def __post_init__(self):
+        p = len(self.columns)
+        for name in ("n", "mean", "m2", "comoment"):
+            if getattr(self, name) is None:
+                setattr(self, name, np.zeros((p, p)))
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, columns: list[str] | None = None) -> "CovarianceAccumulator":
+        """Moments of one frame; ``columns`` defaults to its numeric columns."""
+        columns = list(df.select_dtypes(include=[np.number]).columns) if columns is None else list(columns)
+        values = df[columns].to_numpy(dtype="float64", na_value=np.nan)
+        return cls(columns, *_batch_moments(values))
+
+    def update(self, df: pd.DataFrame) -> "CovarianceAccumulator":
+        """Accumulator over everything seen so far plus ``df``."""
+        return self.merge(CovarianceAccumulator.from_frame(df, self.columns))
+
+    def _check(self, other: "CovarianceAccumulator") -> None:
+        if list(other.columns) != list(self.columns):
+            raise ValueError(f"Column mismatch: {self.columns} vs {other.columns}")
+
+    def merge(self, other: "CovarianceAccumulator") -> "CovarianceAccumulator":
+        self._check(other)
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        with np.errstate(invalid="ignore", divide="ignore"):
+            w = np.where(n > 0, self.n * other.n / n, 0.0)
+            mean = self.mean + delta * np.where(n > 0, other.n / n, 0.0)
+        return CovarianceAccumulator(
+            self.columns,
+            n=n,
+            mean=mean,
+            m2=self.m2 + other.m2 + delta * delta * w,
+            comoment=self.comoment + other.comoment + delta * delta.T * w,
+        )
+
+    __add__ = merge
+
+    def subtract(self, other: "CovarianceAccumulator") -> "CovarianceAccumulator":
+        """Inverse of ``merge``: moments of the rows in ``self`` that are not in ``other``.
+
+        ``other`` must describe rows that were folded into ``self`` (e.g. an account-day
+        about to be replaced by a recomputed one).
+        """
+        self._check(other)
+        n = self.n - other.n
+        if (n < 0).any():
+            raise ValueError("Cannot subtract more rows than were accumulated")
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(n > 0, (self.n * self.mean - other.n * other.mean) / n, 0.0)
+            w = np.where(self.n > 0, n * other.n / self.n, 0.0)
+        delta = np.where(n > 0, other.mean - mean, 0.0)
+        m2 = np.where(n > 0, np.maximum(self.m2 - other.m2 - delta * delta * w, 0.0), 0.0)
+        comoment = np.where(n > 0, self.comoment - other.comoment - delta * delta.T * w, 0.0)
+        np.fill_diagonal(comoment, np.diag(m2))
+        return CovarianceAccumulator(self.columns, n=n, mean=mean, m2=m2, comoment=comoment)
+
+    def cov(self, ddof: int = 1) -> pd.DataFrame:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            c = np.where(self.n > ddof, self.comoment / (self.n - ddof), np.nan)
+        return pd.DataFrame(c, index=self.columns, columns=self.columns)
+
+    def corr(self) -> pd.DataFrame:
+        """Pearson correlation, NaN where a pair has no overlap or a constant column."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            divisor = np.sqrt(self.m2 * self.m2.T)
+            r = np.where((self.n >= 1) & (divisor > 0), self.comoment / divisor, np.nan)
+        np.clip(r, -1.0, 1.0, out=r)
+        return pd.DataFrame(r, index=self.columns, columns=self.columns)
+
+
+@dataclass
+class GroupedCovariance:
+    """One ``CovarianceAccumulator`` per value of the ``by`` column (e.g. sentiment class).
+
+    Rows with a missing ``by`` value are kept under the ``None`` key, so ``corr()`` over
+    all groups still covers every row.
+    """
+
+    by: str
+    columns: list[str]
+    groups: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, by: str, columns: list[str] | None = None) -> "GroupedCovariance":
+        if columns is None:
+            columns = [c for c in df.select_dtypes(include=[np.number]).columns if c != by]
+        return cls(by=by, columns=list(columns)).update(df)
+
+    def update(self, df: pd.DataFrame) -> "GroupedCovariance":
+        parts = {}
+        keys = df[self.by].astype(object).where(df[self.by].notna(), None)
+        for key, chunk in df.groupby(keys.rename("_key"), dropna=False, sort=False):
+            key = None if pd.isna(key) else key
+            parts[key] = CovarianceAccumulator.from_frame(chunk, self.columns)
+        return self.merge(GroupedCovariance(self.by, self.columns, parts))
+
+    def merge(self, other: "GroupedCovariance") -> "GroupedCovariance":
+        groups = dict(self.groups)
+        for key, acc in other.groups.items():
+            groups[key] = groups[key].merge(acc) if key in groups else acc
+        return GroupedCovariance(self.by, self.columns, groups)
+
+    __add__ = merge
+
+    def subtract(self, other: "GroupedCovariance") -> "GroupedCovariance":
+        groups = dict(self.groups)
+        for key, acc in other.groups.items():
+            groups[key] = groups[key].subtract(acc)
+        return GroupedCovariance(self.by, self.columns, groups)
+
+    def save(self, path: str) -> None:
+        """Write all group moments to one ``.npz`` file (no pickling)."""
+        keys = list(self.groups)
+        accs = [self.groups[k] for k in keys]
+        p = len(self.columns)
+        np.savez(
+            path,
+            by=np.array(self.by),
+            columns=np.array(self.columns, dtype=str),
+            keys=np.array(["" if k is None else str(k) for k in keys], dtype=str),
+            missing=np.array([k is None for k in keys], dtype=bool),
+            moments=np.array([[a.n, a.mean, a.m2, a.comoment] for a in accs]).reshape(len(keys), 4, p, p),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "GroupedCovariance":
+        with np.load(path, allow_pickle=False) as data:
+            columns = data["columns"].tolist()
+            groups = {
+                None if missing else key: CovarianceAccumulator(columns, *moments)
+                for key, missing, moments in zip(data["keys"].tolist(), data["missing"], data["moments"])
+            }
+            return cls(by=str(data["by"]), columns=columns, groups=groups)
+
+    def total(self, keys: Iterable | None = None) -> CovarianceAccumulator:
+        """Merged accumulator over ``keys`` (all groups by default)."""
+        if keys is not None:
+            keys = {None if pd.isna(k) else k for k in keys}
+        out = CovarianceAccumulator(self.columns)
+        for key, acc in self.groups.items():
+            if keys is None or key in keys:
+                out = out.merge(acc)
+        return out
+
+    def corr(self, keys: Iterable | None = None) -> pd.DataFrame:
+        return self.total(keys).corr()
+
+    def corr_by_group(self) -> pd.DataFrame:
+        """Correlation matrix per group, stacked with the group key as the outer index level."""
+        known = sorted(k for k in self.groups if k is not None)
+        keys = known + ([None] if None in self.groups else [])
+        return pd.concat({k: self.groups[k].corr() for k in keys}, names=[self.by, None])
+
+
+def iter_frame_batches(path: str, batch_rows: int = DEFAULT_BATCH_ROWS) -> Iterator[pd.DataFrame]:
+    """Frames of at most ``batch_rows`` rows from a Parquet file (e.g. the cached daily join)."""
+    import pyarrow.parquet as pq
+
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_rows):
+        yield batch.to_pandas()
+
+
+def accumulate(
+    chunks: Iterable[pd.DataFrame],
+    by: str | None = None,
+    columns: list[str] | None = None,
+) -> CovarianceAccumulator | GroupedCovariance:
+    """Fold a stream of frames into one accumulator (grouped by ``by`` when given).
+
+    Columns default to the numeric columns of the first chunk.
+    """
+    acc = None
+    for chunk in chunks:
+        if acc is None:
+            acc = (
+                GroupedCovariance.from_frame(chunk, by, columns) if by
+                else CovarianceAccumulator.from_frame(chunk, columns)
+            )
+        else:
+            acc = acc.update(chunk)
+    if acc is None:
+        raise ValueError("No data to accumulate")
+    return acc
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .profiling import instrument
+
+PROFILE_SUMS = ["total_pnl", "volume_usd", "trades", "winning_trades", "losing_trades"]
+
+
+def _pair_sums(values: np.ndarray, codes: np.ndarray, n_cells: int) -> np.ndarray:
+    """Per-cell pairwise-complete sums, shape (4, cells, p, p): n, sum x, sum x^2, sum x*y.
+
+    Entry [.., i, j] only counts rows where both column i and column j are present, which
+    is what ``DataFrame.corr`` uses for each pair. Rows are sorted by cell and each cell's
+    block is reduced with four small matrix products, so the cost is BLAS over n x p
+    rather than a Python loop over rows or materialised per-row outer products.
+    """
+    p = values.shape[1]
+    order = np.argsort(codes, kind="stable")
+    values = values[order]
+    # Non-finite values count as missing, as in DataFrame.corr
+    present = np.isfinite(values)
+    x = np.where(present, values, 0.0)
+    m = present.astype("float64")
+    bounds = np.searchsorted(codes[order], np.arange(n_cells + 1))
+    out = np.zeros((4, n_cells, p, p))
+    for cell in range(n_cells):
+        lo, hi = bounds[cell], bounds[cell + 1]
+        xs, ms = x[lo:hi], m[lo:hi]
+        out[0, cell] = ms.T @ ms
+        # [i, j] = sum of x_i over rows where x_j is present too
+        out[1, cell] = xs.T @ ms
+        out[2, cell] = (xs * xs).T @ ms
+        out[3, cell] = xs.T @ xs
+    return out
+
+
+@dataclass
+class SentimentCube:
+    """Additive aggregates of the daily join, keyed by sentiment class, for filter-driven views.
+
+    ``by_date`` holds, per (date, classification), the row count plus each numeric column's
+    non-null count and sum; ``pairs`` holds the matching pairwise-complete sums behind a
+    correlation matrix (see ``_pair_sums``), taken around the per-column ``shift`` so the
+    variance terms do not cancel catastrophically. ``by_account`` holds per
+    (account, classification) counts and sums. Every statistic is a plain sum, so any set
+    of sentiment classes is answered by adding the matching cells.
+    """
+
+    columns: list[str]
+    shift: np.ndarray
+    by_date: pd.DataFrame
+    pairs: np.ndarray
+    by_account: pd.DataFrame
+
+    @classmethod
+    @instrument("build_sentiment_cube")
+    def from_daily(cls, df: pd.DataFrame) -> "SentimentCube":
+        """Build from the daily join; numeric columns are chosen as ``analyze_correlations`` does."""
+        columns = list(df.select_dtypes(include=[np.number]).columns)
+        frame = df[columns]
+        values = frame.to_numpy(dtype="float64", na_value=np.nan)
+        is_finite = np.isfinite(values)
+        finite = np.where(is_finite, values, np.nan)
+        shift = np.nansum(finite, axis=0) / np.maximum(is_finite.sum(axis=0), 1)
+
+        stats = pd.concat([
+            pd.Series(1, index=frame.index, name="rows"),
+            frame.notna().astype("int64").add_prefix("n_"),
+            frame.add_prefix("sum_"),
+        ], axis=1)
+
+        def keyed(*cols: str):
+            keys = [df[c].astype(object).rename(c) if c != "date" else df[c] for c in cols]
+            return stats.groupby(keys, dropna=False, sort=True)
+
+        by_date_groups = keyed("date", "classification")
+        by_date = by_date_groups.sum()
+        pairs = _pair_sums(finite - shift, by_date_groups.ngroup().to_numpy(), len(by_date))
+        by_account = keyed("account", "classification").sum()
+        return cls(columns=columns, shift=shift, by_date=by_date, pairs=pairs, by_account=by_account)
+
+    @staticmethod
+    def _selected(index: pd.MultiIndex, classifications) -> np.ndarray:
+        # Same semantics as Series.isin, including a NaN entry selecting unmatched days
+        labels = index.get_level_values("classification")
+        if classifications is None:
+            return np.ones(len(labels), dtype=bool)
+        return np.asarray(labels.isin(list(classifications)))
+
+    def totals(self, classifications=None) -> pd.DataFrame:
+        """Non-null count, sum and mean of every numeric column over the selected classes."""
+        mask = self._selected(self.by_date.index, classifications)
+        sums = self.by_date[mask].sum()
+        out = pd.DataFrame({
+            "count": [sums[f"n_{c}"] for c in self.columns],
+            "sum": [sums[f"sum_{c}"] for c in self.columns],
+        }, index=self.columns)
+        out["mean"] = out["sum"] / out["count"].where(out["count"] > 0)
+        return out
+
+    def kpis(self, classifications=None) -> dict:
+        """Dashboard KPI row: trade, volume and PnL totals and mean leverage (None if absent)."""
+        t = self.totals(classifications)
+        return {
+            "total_trades": int(t.loc["trades", "sum"]),
+            "total_volume": float(t.loc["volume_usd", "sum"]),
+            "total_pnl": float(t.loc["total_pnl", "sum"]),
+            "avg_leverage": float(t.loc["avg_leverage", "mean"]) if "avg_leverage" in t.index else None,
+        }
+
+    def corr(self, classifications=None) -> pd.DataFrame:
+        """Pearson correlation matrix equal to ``analyze_correlations`` on the filtered frame."""
+        mask = self._selected(self.by_date.index, classifications)
+        n, sx, sxx, sxy = self.pairs[:, mask].sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cov = sxy - sx * sx.T / n
+            # A constant column must give NaN as in DataFrame.corr, so rounding residue is zero
+            ss = sxx - sx * sx / n
+            ss = np.where(ss > 1e-12 * sxx, ss, 0.0)
+            divisor = np.sqrt(ss * ss.T)
+            r = np.where((n >= 1) & (divisor > 0), cov / divisor, np.nan)
+        np.clip(r, -1.0, 1.0, out=r)
+        return pd.DataFrame(r, index=self.columns, columns=self.columns)
+
+    def trader_profile(self, classifications=None) -> pd.DataFrame:
+        """``build_trader_profile`` of the filtered frame, from the (account, classification) cells."""
+        mask = self._selected(self.by_account.index, classifications)
+        cells = self.by_account[mask]
+        sums = cells[[f"sum_{c}" for c in PROFILE_SUMS]].groupby(level="account").sum()
+        profile = sums.set_axis(PROFILE_SUMS, axis=1).fillna(0)
+        profile.index.name = "account"
+        profile["win_rate"] = profile["winning_trades"] / profile["trades"]
+        return profile
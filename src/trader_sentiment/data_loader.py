@@ -2,9 +2,15 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
 
+import numpy as np
 import pandas as pd
 
+from .memory import compact_frame
+from .profiling import instrument, stage
+
 
 @dataclass
 class Paths:
@@ -21,17 +27,17 @@ class Paths:
         )
 
 
-import gdown
-from pathlib import Path
-
 # Google Drive file IDs
 FILE_IDS = {
     "historical": "1IAfLZwu6rJzyWKgBToqwSmmVYU6VbjVs",
     "fear_greed": "1PgQC0tO8XN-wqkNyghWc_-mnrYv_nhSf",
 }
 
+@instrument()
 def ensure_data_exists(raw_dir: str) -> None:
     """Check if data exists, if not, download it."""
+    import gdown
+
     raw_path = Path(raw_dir)
     raw_path.mkdir(parents=True, exist_ok=True)
     
@@ -49,9 +55,31 @@ def ensure_data_exists(raw_dir: str) -> None:
         url = f"https://drive.google.com/uc?id={FILE_IDS['fear_greed']}"
         gdown.download(url, str(fng_path), quiet=False)
 
+def to_day(values) -> pd.Series:
+    """Calendar day (UTC) as tz-naive ``datetime64[ms]`` at midnight.
+
+    This is the representation of every ``date`` column in the pipeline: one int64 per
+    row, so grouping, sorting and the sentiment lookup never hash Python ``date`` objects.
+    ms is the coarsest unit that round-trips through Parquet unchanged.
+    """
+    ts = pd.to_datetime(pd.Series(values), errors="coerce")
+    if ts.dt.tz is not None:
+        ts = ts.dt.tz_convert("UTC").dt.tz_localize(None)
+    return ts.dt.floor("D").astype("datetime64[ms]")
+
+
+def _day_numbers(dates: pd.Series) -> np.ndarray:
+    """Days since epoch as int64 (NaT -> INT64 min), from any date-like series."""
+    if not pd.api.types.is_datetime64_dtype(dates.dtype):
+        dates = to_day(dates)
+    # Truncating to [D] is exact for day keys and cheap: no parsing or flooring pass
+    return dates.to_numpy().astype("datetime64[D]").astype("int64")
+
+
+@instrument()
 def load_fear_greed(path: str) -> pd.DataFrame:
     """Load BTC Fear/Greed index. Expects columns like ['Date', 'Classification'].
-    Parses Date to datetime (UTC, date-only).
+    Parses Date to a UTC calendar day (see ``to_day``).
     """
     # Ensure data exists before loading
     ensure_data_exists(os.path.dirname(path))
@@ -62,25 +90,69 @@ def load_fear_greed(path: str) -> pd.DataFrame:
     df = df.rename(columns=cols)
     # Parse date
     if "date" in df.columns:
-        df["date"] = pd.to_datetime(df["date"], errors="coerce").dt.tz_localize("UTC", nonexistent="shift_forward", ambiguous="NaT").dt.date
+        df["date"] = to_day(df["date"])
     # Ensure classification exists
     if "classification" in df.columns:
         df["classification"] = df["classification"].str.strip().str.lower()
     return df
 
 
-def load_trades(path: str) -> pd.DataFrame:
-    """Load Hyperliquid historical trader executions.
-    Attempts CSV first; if that fails, tries Parquet.
+# Layout of the exchange's human-readable timestamps, e.g. "02-12-2024 22:50"
+EXCHANGE_TIME_FORMAT = "%d-%m-%Y %H:%M"
+_EXCHANGE_TIME_RE = r"^\d{2}-\d{2}-\d{4} \d{2}:\d{2}$"
+
+# Upper bounds on |epoch value| per unit; they tell the units apart for any date in 1973-2262
+_EPOCH_UNIT_LIMITS = (("s", 1e11), ("ms", 1e14), ("us", 1e17))
+
+
+def detect_timestamp_format(values: pd.Series, sample_size: int = 1_000) -> str | None:
+    """Guess how a timestamp column is encoded from a sample of its non-null values.
+
+    Returns "s", "ms", "us" or "ns" for epoch numbers (numeric or numeric strings, by
+    magnitude), "exchange" for ``EXCHANGE_TIME_FORMAT``, "iso8601", or None if nothing fits.
     """
-    # Ensure data exists before loading
-    ensure_data_exists(os.path.dirname(path))
+    sample = values.dropna()
+    if sample.empty:
+        return None
+    if len(sample) > sample_size:
+        sample = sample.iloc[np.linspace(0, len(sample) - 1, sample_size).astype(int)]
 
+    numbers = pd.to_numeric(sample, errors="coerce")
+    if numbers.notna().all():
+        magnitude = numbers.abs().median()
+        return next((unit for unit, limit in _EPOCH_UNIT_LIMITS if magnitude < limit), "ns")
+
+    text = sample.astype(str).str.strip()
+    if text.str.match(_EXCHANGE_TIME_RE).all():
+        return "exchange"
     try:
-        df = pd.read_csv(path)
-    except Exception:
-        df = pd.read_parquet(path)
-    # Normalize
+        pd.to_datetime(text, format="ISO8601", utc=True)
+        return "iso8601"
+    except (ValueError, TypeError):
+        return None
+
+
+@instrument()
+def parse_timestamps(values: pd.Series, fmt: str | None = None) -> pd.Series:
+    """Parse a timestamp column to UTC in a single explicit vectorized call.
+
+    ``fmt`` is one of ``detect_timestamp_format``'s results (detected when omitted).
+    Naive wall-clock formats are taken as UTC; unparseable values become NaT.
+    """
+    fmt = fmt or detect_timestamp_format(values)
+    if fmt in ("s", "ms", "us", "ns"):
+        numbers = values if pd.api.types.is_numeric_dtype(values.dtype) else pd.to_numeric(values, errors="coerce")
+        return pd.to_datetime(numbers, unit=fmt, utc=True, errors="coerce")
+    if fmt == "exchange":
+        return pd.to_datetime(values, format=EXCHANGE_TIME_FORMAT, utc=True, errors="coerce")
+    if fmt == "iso8601":
+        return pd.to_datetime(values, format="ISO8601", utc=True, errors="coerce")
+    # Unknown layout: let pandas infer, as before
+    return pd.to_datetime(values, errors="coerce", utc=True)
+
+
+def _normalize_trades(df: pd.DataFrame) -> pd.DataFrame:
+    """Lowercase column names, parse the time column and derive the trade ``date``."""
     df.columns = [c.strip().lower() for c in df.columns]
     # Parse time
     time_col = None
@@ -89,57 +161,228 @@ def load_trades(path: str) -> pd.DataFrame:
             time_col = candidate
             break
     if time_col:
-        # Try milliseconds first (common in crypto data), then regular datetime
+        # One sampled format check, then one parse (no failed attempt + re-parse)
+        df[time_col] = parse_timestamps(df[time_col])
+        df["date"] = to_day(df[time_col])
+    return df
+
+
+@instrument()
+def load_trades(path: str, compact: bool = False) -> pd.DataFrame:
+    """Load Hyperliquid historical trader executions.
+    Attempts CSV first; if that fails, tries Parquet.
+    ``compact`` shrinks dtypes (categorical strings, downcast integers).
+    """
+    # Ensure data exists before loading
+    ensure_data_exists(os.path.dirname(path))
+
+    with stage("read_trades_file") as s:
         try:
-            df[time_col] = pd.to_datetime(df[time_col], unit="ms", utc=True)
-        except (ValueError, TypeError):
-            df[time_col] = pd.to_datetime(df[time_col], errors="coerce", utc=True)
-        df["date"] = df[time_col].dt.date
+            df = pd.read_csv(path)
+        except Exception:
+            df = pd.read_parquet(path)
+        s.rows_out = len(df)
+    df = _normalize_trades(df)
+    if compact:
+        df = compact_frame(df)
     return df
 
 
+# Explicit dtypes for the trade columns we know about, keyed by normalized (lowercase) name.
+# Time columns are left out on purpose: exports carry either epoch numbers or date strings.
+TRADE_DTYPES = {
+    "account": str,
+    "coin": str,
+    "side": str,
+    "direction": str,
+    "closed pnl": "float64",
+    "closedpnl": "float64",
+    "pnl": "float64",
+    "realizedpnl": "float64",
+    "size usd": "float64",
+    "size_usd": "float64",
+    "notional": "float64",
+    "size tokens": "float64",
+    "size": "float64",
+    "qty": "float64",
+    "quantity": "float64",
+    "execution price": "float64",
+    "leverage": "float64",
+    "fee": "float64",
+}
+
+DEFAULT_CHUNKSIZE = 500_000
+
+
+def _agg_columns(columns) -> list:
+    """Normalized names of the columns daily_trader_agg actually reads from a trades file."""
+    cols = list(columns)
+    time_col = next((c for c in ("timestamp", "time", "ts") if c in cols), None)
+    roles = _trade_roles(cols)
+    if roles["size_usd"]:
+        roles["size"] = None
+    needed = {"account", time_col, *roles.values()}
+    return [c for c in cols if c in needed]
+
+
+def iter_trades(path: str, chunksize: int = DEFAULT_CHUNKSIZE, columns: list | None = None) -> Iterator[pd.DataFrame]:
+    """Stream normalized trades in chunks of ``chunksize`` rows.
+
+    Only ``columns`` (normalized names, default: the ones daily_trader_agg needs) are read,
+    with dtypes from ``TRADE_DTYPES``, so memory scales with the chunk rather than the file.
+    """
+    ensure_data_exists(os.path.dirname(path))
+
+    if str(path).endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        pf = pq.ParquetFile(path)
+        raw = {c.strip().lower(): c for c in pf.schema_arrow.names}
+        wanted = columns or _agg_columns(raw)
+        for batch in pf.iter_batches(batch_size=chunksize, columns=[raw[c] for c in wanted if c in raw]):
+            yield _normalize_trades(batch.to_pandas())
+        return
+
+    header = pd.read_csv(path, nrows=0).columns
+    raw = {c.strip().lower(): c for c in header}
+    wanted = columns or _agg_columns(raw)
+    usecols = [raw[c] for c in wanted if c in raw]
+    dtype = {raw[c]: TRADE_DTYPES[c] for c in wanted if c in raw and c in TRADE_DTYPES}
+    for chunk in pd.read_csv(path, usecols=usecols, dtype=dtype, chunksize=chunksize):
+        yield _normalize_trades(chunk)
+
+
+# Candidate source columns for each role daily_trader_agg needs; the first match wins.
+_PNL_COLS = ("closed pnl", "closedpnl", "pnl", "realizedpnl")
+_SIZE_USD_COLS = ("size usd", "size_usd", "notional")
+_SIZE_COLS = ("size tokens", "size", "qty", "quantity")
+_SIDE_COLS = ("side", "direction")
+
+
+def _trade_roles(columns) -> dict:
+    """Map each aggregation role (pnl, size_usd, size, side, leverage, fee) to its source column or None."""
+    cols = set(columns)
+    return {
+        "pnl": next((c for c in _PNL_COLS if c in cols), None),
+        "size_usd": next((c for c in _SIZE_USD_COLS if c in cols), None),
+        "size": next((c for c in _SIZE_COLS if c in cols), None),
+        "side": next((c for c in _SIDE_COLS if c in cols), None),
+        "leverage": "leverage" if "leverage" in cols else None,
+        "fee": "fee" if "fee" in cols else None,
+    }
+
+
+def _daily_partials(df: pd.DataFrame) -> pd.DataFrame:
+    """Additive per account per day sums (counts, flag totals, value sums) behind daily_trader_agg.
+
+    Every column is a plain sum, so all of them come out of a single grouped ``sum`` over
+    precomputed flag/value columns instead of a Python ``apply`` per group.
+    """
+    roles = _trade_roles(df.columns)
+    group_keys = [c for c in ["account", "date"] if c in df.columns]
+
+    work = pd.DataFrame({k: df[k] for k in group_keys}, index=df.index)
+    if roles["pnl"]:
+        pnl = df[roles["pnl"]]
+        work["pnl_sum"] = pnl
+        work["pnl_count"] = pnl.notna()
+        work["winning_trades"] = pnl > 0
+        work["losing_trades"] = pnl < 0
+    if roles["size_usd"]:
+        work["volume_usd"] = df[roles["size_usd"]].abs()
+    elif roles["size"]:
+        work["volume"] = df[roles["size"]].abs()
+    if roles["side"]:
+        # NaN sides count towards the denominator but never as long, as before
+        work["long_count"] = df[roles["side"]].str.lower().isin(["buy", "long"])
+    if roles["leverage"]:
+        work["leverage_sum"] = df[roles["leverage"]]
+        work["leverage_count"] = df[roles["leverage"]].notna()
+    if roles["fee"]:
+        work["fee_sum"] = df[roles["fee"]]
+        work["fee_count"] = df[roles["fee"]].notna()
+
+    g = work.groupby(group_keys, dropna=False, observed=True)
+    partials = g.sum()
+    partials.insert(0, "trades", g.size())
+    return partials
+
+
+def _finalize_daily_partials(partials: pd.DataFrame) -> pd.DataFrame:
+    """Turn additive partials into the public daily_trader_agg schema."""
+    out = pd.DataFrame(index=partials.index)
+    out["trades"] = partials["trades"]
+    if "pnl_sum" in partials.columns:
+        n = partials["pnl_count"]
+        # sum(min_count=1) / mean() semantics: all-NaN groups give NaN
+        out["total_pnl"] = partials["pnl_sum"].where(n > 0) if (n == 0).any() else partials["pnl_sum"]
+        out["avg_pnl_per_trade"] = partials["pnl_sum"] / n.where(n > 0)
+        out["winning_trades"] = partials["winning_trades"]
+        out["losing_trades"] = partials["losing_trades"]
+    for vol_col in ("volume_usd", "volume"):
+        if vol_col in partials.columns:
+            out[vol_col] = partials[vol_col]
+    if "long_count" in partials.columns:
+        out["long_bias"] = partials["long_count"] / partials["trades"]
+    if "leverage_sum" in partials.columns:
+        n = partials["leverage_count"]
+        out["avg_leverage"] = partials["leverage_sum"] / n.where(n > 0)
+    if "fee_sum" in partials.columns:
+        n = partials["fee_count"]
+        out["total_fees"] = partials["fee_sum"].where(n > 0) if (n == 0).any() else partials["fee_sum"]
+    return out.reset_index()
+
+
+def _merge_daily_partials(*partials: pd.DataFrame) -> pd.DataFrame:
+    """Combine partials computed on disjoint slices of the trades (e.g. file chunks)."""
+    combined = pd.concat(partials)
+    return combined.groupby(level=list(range(combined.index.nlevels)), dropna=False, observed=True).sum()
+
+
+@instrument()
 def daily_trader_agg(df: pd.DataFrame) -> pd.DataFrame:
     """Aggregate per account per day: PnL, volume, trades, long/short bias, leverage."""
-    cols = set(df.columns)
-    pnl_col = next((c for c in ["closed pnl", "closedpnl", "pnl", "realizedpnl"] if c in cols), None)
-    size_usd_col = next((c for c in ["size usd", "size_usd", "notional"] if c in cols), None)
-    size_col = next((c for c in ["size tokens", "size", "qty", "quantity"] if c in cols), None)
-    side_col = next((c for c in ["side", "direction"] if c in cols), None)
-    lev_col = "leverage" if "leverage" in cols else None
-    fee_col = "fee" if "fee" in cols else None
-
-    def long_bias(s: pd.Series) -> float:
-        if s.empty:
-            return 0.0
-        longs = (s.str.lower() == "buy") | (s.str.lower() == "long")
-        return float(longs.mean())
-
-    group_keys = ["account", "date"] if {"account", "date"}.issubset(cols) else [c for c in ["account", "date"] if c in cols]
-    g = df.groupby(group_keys, dropna=False)
-    out = pd.DataFrame()
-    out["trades"] = g.size()
-    if pnl_col:
-        out["total_pnl"] = g[pnl_col].sum(min_count=1)
-        out["avg_pnl_per_trade"] = g[pnl_col].mean()
-        out["winning_trades"] = g[pnl_col].apply(lambda x: (x > 0).sum())
-        out["losing_trades"] = g[pnl_col].apply(lambda x: (x < 0).sum())
-    if size_usd_col:
-        out["volume_usd"] = g[size_usd_col].apply(lambda x: x.abs().sum())
-    elif size_col:
-        out["volume"] = g[size_col].apply(lambda x: x.abs().sum())
-    if side_col:
-        out["long_bias"] = g[side_col].apply(long_bias)
-    if lev_col:
-        out["avg_leverage"] = g[lev_col].mean()
-    if fee_col:
-        out["total_fees"] = g[fee_col].sum(min_count=1)
-    return out.reset_index()
+    return _finalize_daily_partials(_daily_partials(df))
 
 
+@instrument()
+def daily_trader_agg_chunked(path: str, chunksize: int = DEFAULT_CHUNKSIZE) -> pd.DataFrame:
+    """Streaming daily_trader_agg over a trades file that may not fit in memory.
+
+    Each chunk is reduced to per account-day partials and folded into a running total, so
+    peak memory is one chunk plus the (account, date) state, never the whole file.
+    """
+    state = None
+    for chunk in iter_trades(path, chunksize=chunksize):
+        part = _daily_partials(chunk)
+        state = part if state is None else _merge_daily_partials(state, part)
+    if state is None:
+        raise ValueError(f"No trades found in {path}")
+    return _finalize_daily_partials(state)
+
+
+@instrument()
 def align_with_sentiment(agg: pd.DataFrame, fng: pd.DataFrame) -> pd.DataFrame:
-    """Left-join daily aggregates with Fear/Greed on date."""
+    """Left-join daily aggregates with Fear/Greed on date.
+
+    Implemented as a sorted lookup: the index is sorted once by day number and every
+    aggregate row finds its day with ``searchsorted``, instead of a hash merge on dates.
+    If the index has several rows for one day, the last one wins.
+    """
     if "date" not in agg.columns:
         raise ValueError("Aggregates must contain a 'date' column")
     if "date" not in fng.columns:
         raise ValueError("Fear/Greed must contain a 'date' column")
-    return agg.merge(fng[["date", "classification"]], on="date", how="left")
+
+    index = fng[["date", "classification"]].assign(_day=_day_numbers(fng["date"]))
+    index = index[index["date"].notna()].drop_duplicates("_day", keep="last").sort_values("_day")
+    days = index["_day"].to_numpy()
+
+    wanted = _day_numbers(agg["date"])
+    pos = np.minimum(np.searchsorted(days, wanted), max(len(days) - 1, 0))
+    found = (days[pos] == wanted) & agg["date"].notna().to_numpy() if len(days) else np.zeros(len(agg), bool)
+
+    out = agg.copy()
+    classification = index["classification"].reset_index(drop=True).reindex(np.where(found, pos, -1))
+    out["classification"] = classification.set_axis(out.index)
+    return out
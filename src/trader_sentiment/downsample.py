@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from .profiling import instrument
+
+# Default number of points sent to the browser per chart
+DEFAULT_MAX_POINTS = 5_000
+
+# Share of each class's budget reserved for its most extreme y values
+OUTLIER_SHARE = 0.2
+
+
+def _allocate(sizes: np.ndarray, budget: int) -> np.ndarray:
+    """Split ``budget`` across groups by water-filling: equal shares, capped at group size,
+    with what small groups cannot use handed on to the larger ones."""
+    alloc = np.zeros(len(sizes), dtype="int64")
+    open_ = sizes > 0
+    left = min(budget, int(sizes.sum()))
+    while left > 0 and open_.any():
+        share = max(left // open_.sum(), 1)
+        for i in np.flatnonzero(open_):
+            take = min(share, sizes[i] - alloc[i], left)
+            alloc[i] += take
+            left -= take
+            if alloc[i] == sizes[i]:
+                open_[i] = False
+            if left == 0:
+                break
+    return alloc
+
+
+@instrument()
+def sample_scatter(
+    df: pd.DataFrame,
+    y: str,
+    by: str | None = "classification",
+    max_points: int = DEFAULT_MAX_POINTS,
+    outlier_share: float = OUTLIER_SHARE,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """At most ``max_points`` rows of ``df`` for a scatter plot, stratified by ``by``.
+
+    Every class gets a share of the budget (small classes are kept whole, the rest split
+    the remainder), and within a class the ``outlier_share`` rows furthest from its median
+    ``y`` are always kept before the rest is sampled uniformly. Rows keep their order.
+    """
+    if len(df) <= max_points:
+        return df
+    rng = np.random.default_rng(seed)
+    codes = np.zeros(len(df), dtype="int64") if by is None else df[by].factorize(use_na_sentinel=False)[0]
+    sizes = np.bincount(codes)
+    alloc = _allocate(sizes, max_points)
+
+    values = df[y].to_numpy(dtype="float64", na_value=np.nan)
+    keep = []
+    for code, quota in enumerate(alloc):
+        rows = np.flatnonzero(codes == code)
+        if quota >= len(rows):
+            keep.append(rows)
+            continue
+        extreme = rows[:0]
+        finite = np.isfinite(values[rows])
+        n_extreme = min(int(quota * outlier_share), int(finite.sum()))
+        if n_extreme:
+            dist = np.abs(values[rows] - np.median(values[rows][finite]))
+            # Missing y sorts last, so it never crowds out a real outlier
+            dist[~finite] = -1.0
+            extreme = rows[np.argsort(-dist, kind="stable")[:n_extreme]]
+        rest = np.setdiff1d(rows, extreme, assume_unique=True)
+        keep.extend([extreme, rng.choice(rest, size=quota - n_extreme, replace=False)])
+    return df.iloc[np.sort(np.concatenate(keep))]
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of the Largest-Triangle-Three-Buckets downsample of a series to ``n_out`` points.
+
+    ``x`` must be sorted. The first and last points are always kept; every bucket in
+    between contributes the point forming the largest triangle with the previously kept
+    point and the mean of the next bucket, which preserves peaks and troughs.
+    """
+    n = len(x)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        raise ValueError("lttb needs n_out >= 3 (first point, last point and one bucket)")
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    edges = np.linspace(1, n - 1, n_out - 1).astype("int64")
+    out = np.empty(n_out, dtype="int64")
+    out[0], out[-1] = 0, n - 1
+    prev = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        nxt_lo, nxt_hi = hi, edges[b + 2] if b + 2 < len(edges) else n
+        avg_x, avg_y = x[nxt_lo:nxt_hi].mean(), y[nxt_lo:nxt_hi].mean()
+        area = np.abs(
+            (x[prev] - avg_x) * (y[lo:hi] - y[prev]) - (x[prev] - x[lo:hi]) * (avg_y - y[prev])
+        )
+        prev = lo + int(np.argmax(area))
+        out[b + 1] = prev
+    return out
+
+
+@instrument()
+def downsample_series(df: pd.DataFrame, x: str, y: str, max_points: int = DEFAULT_MAX_POINTS) -> pd.DataFrame:
+    """At most ``max_points`` rows of a line series, chosen by LTTB on (``x``, ``y``).
+
+    Rows are sorted by ``x`` first; datetime ``x`` is compared as its int64 epoch value.
+    Rows with a missing ``y`` are dropped, since a line cannot show them anyway.
+    """
+    data = df[df[y].notna()].sort_values(x, kind="stable")
+    if len(data) <= max_points:
+        return data
+    xs = data[x]
+    xs = xs.astype("int64") if pd.api.types.is_datetime64_any_dtype(xs.dtype) else xs
+    idx = lttb(xs.to_numpy(dtype="float64"), data[y].to_numpy(dtype="float64"), max_points)
+    return data.iloc[idx]
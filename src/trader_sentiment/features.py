@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .profiling import instrument
+
+# Bump whenever the stored columns change meaning, so saved stores are rebuilt
+FEATURE_VERSION = 2
+
+VALUES_FILE = "values.npy"
+TARGETS_FILE = "targets.npy"
+INDEX_FILE = "index.parquet"
+META_FILE = "meta.json"
+
+# Daily-join columns copied as they are: model inputs (float32) and labels (float64)
+INPUT_COLUMNS = ["sentiment_score", "volume_usd", "trades", "avg_leverage"]
+LABEL_COLUMNS = ["total_pnl"]
+BASE_COLUMNS = INPUT_COLUMNS + LABEL_COLUMNS
+# Feature -> input column shifted one trading day back within the account
+LAG_COLUMNS = {"prev_sentiment": "sentiment_score", "prev_leverage": "avg_leverage", "prev_volume_usd": "volume_usd"}
+# Target -> label column shifted one trading day forward within the account
+LEAD_COLUMNS = {"next_day_pnl": "total_pnl"}
+
+WIN_FEATURES = ["sentiment_score", "prev_sentiment", "volume_usd", "avg_leverage", "prev_leverage"]
+PNL_FEATURES = ["sentiment_score", "volume_usd", "trades"]
+
+
+def data_version(df: pd.DataFrame) -> str:
+    """Key of the daily-join content the store is built from (plus ``FEATURE_VERSION``)."""
+    inputs = [c for c in ["account", "date", *BASE_COLUMNS] if c in df.columns]
+    h = hashlib.sha256(f"features-v{FEATURE_VERSION}|{','.join(inputs)}".encode())
+    h.update(pd.util.hash_pandas_object(df[inputs], index=False).to_numpy().tobytes())
+    return h.hexdigest()[:16]
+
+
+def _shift_within(values: np.ndarray, first: np.ndarray, last: np.ndarray, periods: int) -> np.ndarray:
+    """Shift every column of account-sorted ``values`` by ``periods`` rows without crossing accounts."""
+    out = np.full_like(values, np.nan)
+    if periods > 0:
+        out[periods:] = values[:-periods]
+        out[first] = np.nan
+    else:
+        out[:periods] = values[-periods:]
+        out[last] = np.nan
+    return out
+
+
+@dataclass
+class FeatureStore:
+    """Model inputs (float32) and targets (float64) of the daily join, built once per data version.
+
+    ``values`` holds the model inputs and ``targets`` the labels and targets
+    (``total_pnl``, ``next_day_pnl``, ``next_day_win``), kept in float64 so PnL is fitted
+    and scored at full precision. Both are column-major, shape (n_columns, n_rows), so
+    every column is a contiguous view; rows follow ``index`` (account, date), sorted by
+    account then date. Lags and leads are taken within each account over its trading
+    days, and are NaN where the account has no previous/next day. ``next_day_win`` is
+    1/0, NaN without a next day.
+    """
+
+    index: pd.DataFrame
+    columns: list[str]
+    values: np.ndarray
+    target_columns: list[str]
+    targets: np.ndarray
+    version: str | None = None
+
+    @classmethod
+    @instrument("build_feature_store")
+    def from_daily(cls, df: pd.DataFrame, version: str | None = None) -> "FeatureStore":
+        daily = df.sort_values(["account", "date"], kind="stable")
+        codes = pd.factorize(daily["account"])[0]
+        starts = np.flatnonzero(np.diff(codes, prepend=-2) != 0)
+        # First and last row of every account, where lags/leads would cross into another one
+        first, last = starts, np.append(starts[1:] - 1, len(codes) - 1)[: len(starts)]
+
+        inputs = [c for c in INPUT_COLUMNS if c in daily.columns]
+        labels = [c for c in LABEL_COLUMNS if c in daily.columns]
+        lags = {k: v for k, v in LAG_COLUMNS.items() if v in inputs}
+        leads = {k: v for k, v in LEAD_COLUMNS.items() if v in labels}
+        columns = inputs + list(lags)
+        target_columns = labels + list(leads) + ["next_day_win"]
+
+        def block(base: list[str], shifted: dict, periods: int, dtype: str, n_extra: int) -> np.ndarray:
+            # The copied columns, then all shifted ones in one shift of a 2-D block
+            out = np.empty((len(base) + len(shifted) + n_extra, len(daily)), dtype=dtype)
+            out[: len(base)] = daily[base].to_numpy(dtype=dtype, na_value=np.nan).T
+            if shifted:
+                src = out[[base.index(c) for c in shifted.values()]].T
+                out[len(base): len(base) + len(shifted)] = _shift_within(src, first, last, periods).T
+            return out
+
+        values = block(inputs, lags, 1, "float32", 0)
+        targets = block(labels, leads, -1, "float64", 1)
+        next_pnl = targets[target_columns.index("next_day_pnl")] if leads else np.full(len(daily), np.nan)
+        targets[-1] = np.where(np.isnan(next_pnl), np.nan, next_pnl > 0)
+
+        index = daily[["account", "date"]].reset_index(drop=True)
+        return cls(
+            index=index, columns=columns, values=values, target_columns=target_columns, targets=targets,
+            version=version or data_version(df),
+        )
+
+    def __len__(self) -> int:
+        return self.values.shape[1]
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        """One column as a contiguous view: float32 for inputs, float64 for labels and targets."""
+        if column in self.target_columns:
+            return self.targets[self.target_columns.index(column)]
+        return self.values[self.columns.index(column)]
+
+    def available(self, features: list[str]) -> list[str]:
+        """The model inputs among ``features``."""
+        return [f for f in features if f in self.columns]
+
+    def complete(self, columns: list[str]) -> np.ndarray:
+        """Rows where every one of ``columns`` is present."""
+        mask = np.ones(len(self), dtype=bool)
+        for c in columns:
+            mask &= ~np.isnan(self[c])
+        return mask
+
+    def matrix(self, features: list[str], rows: np.ndarray | None = None) -> pd.DataFrame:
+        """Input ``features`` of the selected ``rows`` (mask or positions) as a float32 frame.
+
+        The cells are gathered once into a Fortran-ordered block (what tree estimators use
+        internally) and the frame wraps it without a further copy.
+        """
+        cols = [self.columns.index(f) for f in features]
+        rows = np.arange(len(self)) if rows is None else rows
+        rows = np.flatnonzero(rows) if rows.dtype == bool else rows
+        block = self.values[np.ix_(cols, rows)].T
+        return pd.DataFrame(block, columns=features, copy=False)
+
+    def save(self, path: str) -> None:
+        """Write to directory ``path``: the matrices as ``.npy`` (memory-mappable), index as Parquet."""
+        out = Path(path)
+        out.mkdir(parents=True, exist_ok=True)
+        np.save(out / VALUES_FILE, self.values)
+        np.save(out / TARGETS_FILE, self.targets)
+        self.index.to_parquet(out / INDEX_FILE, index=False)
+        # Meta last: a directory without it is an incomplete save
+        meta = {"columns": self.columns, "target_columns": self.target_columns, "version": self.version}
+        (out / META_FILE).write_text(json.dumps(meta))
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "FeatureStore":
+        meta = json.loads((Path(path) / META_FILE).read_text())
+        mode = "r" if mmap else None
+        values = np.load(Path(path) / VALUES_FILE, mmap_mode=mode)
+        targets = np.load(Path(path) / TARGETS_FILE, mmap_mode=mode)
+        index = pd.read_parquet(Path(path) / INDEX_FILE)
+        return cls(
+            index=index, columns=meta["columns"], values=values, target_columns=meta["target_columns"],
+            targets=targets, version=meta["version"],
+        )
+
+    @classmethod
+    def cached(cls, df: pd.DataFrame, cache_dir: str) -> "FeatureStore":
+        """Load the store for ``df``'s data version from ``cache_dir``, building and saving it if absent.
+
+        Older versions in ``cache_dir`` are removed when a new one is written.
+        """
+        version = data_version(df)
+        path = Path(cache_dir) / version
+        if (path / META_FILE).exists():
+            return cls.load(str(path))
+        store = cls.from_daily(df, version=version)
+        if Path(cache_dir).exists():
+            for entry in Path(cache_dir).iterdir():
+                if entry.is_dir() and entry.name != version:
+                    shutil.rmtree(entry, ignore_errors=True)
+        tmp = Path(cache_dir) / f"{version}.tmp"
+        for stale in (tmp, path):
+            shutil.rmtree(stale, ignore_errors=True)
+        store.save(str(tmp))
+        os.replace(tmp, path)
+        return store
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .analysis import join_sentiment
+from .covariance import GroupedCovariance
+from .data_loader import _daily_partials, _finalize_daily_partials, _merge_daily_partials
+
+PARTIALS_FILE = "daily_partials.parquet"
+JOINED_FILE = "daily_join.parquet"
+CORRELATIONS_FILE = "correlations.npz"
+
+
+def _day_numbers(dates) -> np.ndarray:
+    values = pd.to_datetime(pd.Series(dates)).to_numpy()
+    return np.where(np.isnat(values), -1, values.astype("datetime64[D]").astype("int64"))
+
+
+class _KeySpace:
+    """Maps (account, date) rows to int64 keys that sort like ``sort_values(["account", "date"])``
+    with missing values last, so sorted frames can be spliced with ``np.searchsorted``.
+
+    Accounts are laid out back to back, each with a block of day numbers one wider than
+    the date span (the extra slot holds missing dates), as in ``rolling_risk_metrics``.
+    """
+
+    def __init__(self, *frames: pd.DataFrame):
+        accounts = [pd.Series(f["account"]).dropna().unique() for f in frames if "account" in f]
+        self.accounts = pd.Index(np.concatenate(accounts) if accounts else []).unique().sort_values()
+        days = np.concatenate([_day_numbers(f["date"]) for f in frames if "date" in f] or [np.array([-1])])
+        known = days[days >= 0]
+        self.day0 = int(known.min()) if len(known) else 0
+        self.width = (int(known.max()) - self.day0 + 2) if len(known) else 1
+
+    def keys(self, frame: pd.DataFrame) -> np.ndarray:
+        key = np.zeros(len(frame), dtype="int64")
+        if "account" in frame:
+            codes = pd.Categorical(pd.Series(frame["account"]).astype(object), categories=self.accounts).codes
+            key += np.where(codes < 0, len(self.accounts), codes).astype("int64") * self.width
+        if "date" in frame:
+            day = _day_numbers(frame["date"])
+            key += np.where(day < 0, self.width - 1, day - self.day0)
+        return key
+
+
+def _locate(sorted_keys: np.ndarray, keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Insertion positions of ``keys`` in ``sorted_keys`` and whether each is already there."""
+    pos = np.searchsorted(sorted_keys, keys)
+    found = pos < len(sorted_keys)
+    found[found] = sorted_keys[pos[found]] == keys[found]
+    return pos, found
+
+
+def _splice(old: pd.DataFrame, new: pd.DataFrame, pos: np.ndarray, found: np.ndarray) -> pd.DataFrame:
+    """``old`` with the rows of ``new`` replacing those at ``pos[found]`` and inserted at the
+    other positions; ``new`` must be in key order. Costs a copy, not a sort, of ``old``."""
+    n = len(old)
+    source = np.arange(n)
+    source[pos[found]] = n + np.flatnonzero(found)
+    order = np.insert(source, pos[~found], n + np.flatnonzero(~found))
+    return pd.concat([old, new]).iloc[order]
+
+
+@dataclass
+class DailyJoinState:
+    """Daily join plus the additive account-day partials it was finalized from.
+
+    Keeping the partials (sums and counts rather than means/ratios) is what lets appended
+    trades be folded into an existing account-day exactly, including late fills for days
+    that were already aggregated.
+    """
+
+    partials: pd.DataFrame
+    joined: pd.DataFrame
+    correlations: GroupedCovariance | None = None
+
+    @classmethod
+    def from_trades(cls, trades: pd.DataFrame, fng: pd.DataFrame, correlations: bool = False) -> "DailyJoinState":
+        """Full build from normalized trades (as returned by ``load_trades``).
+
+        ``correlations`` also keeps per-sentiment covariance moments of the joined rows,
+        which ``update`` then maintains by removing replaced rows and adding fresh ones.
+        """
+        partials = _daily_partials(trades)
+        joined = join_sentiment(_finalize_daily_partials(partials), fng)
+        corr = GroupedCovariance.from_frame(joined, by="classification") if correlations else None
+        return cls(partials=partials, joined=joined, correlations=corr)
+
+    def update(self, new_trades: pd.DataFrame, fng: pd.DataFrame) -> "DailyJoinState":
+        """Fold newly appended trades in, recomputing only the account-days they touch.
+
+        The result is identical to ``from_trades`` on the old and new trades together.
+        Touched rows are located by binary search and spliced into the sorted partials and
+        join, so only the batch is sorted, never the whole history.
+        """
+        if new_trades.empty:
+            return self
+        delta = _daily_partials(new_trades)
+        old_keys = self.partials.index.to_frame(index=False)
+        space = _KeySpace(old_keys, delta.index.to_frame(index=False), self.joined)
+
+        touched = space.keys(delta.index.to_frame(index=False))
+        delta = delta.iloc[np.argsort(touched, kind="stable")]
+        touched = np.sort(touched)
+        pos, found = _locate(space.keys(old_keys), touched)
+        merged = _merge_daily_partials(self.partials.iloc[pos[found]], delta).reindex(delta.index)
+        partials = _splice(self.partials, merged, pos, found)
+
+        # Only touched account-days are re-finalized and re-joined with sentiment
+        fresh = join_sentiment(_finalize_daily_partials(merged), fng).reset_index(drop=True)
+        pos, found = _locate(space.keys(self.joined), space.keys(fresh))
+        joined = _splice(self.joined, fresh, pos, found).reset_index(drop=True)
+        corr = self.correlations
+        if corr is not None:
+            by, columns = corr.by, corr.columns
+            corr = corr.subtract(GroupedCovariance.from_frame(self.joined.iloc[pos[found]], by, columns))
+            corr = corr.merge(GroupedCovariance.from_frame(fresh, by, columns))
+        return DailyJoinState(partials=partials, joined=joined, correlations=corr)
+
+    def save(self, directory: str) -> None:
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+        self.partials.reset_index().to_parquet(path / PARTIALS_FILE, index=False)
+        self.joined.to_parquet(path / JOINED_FILE, index=False)
+        if self.correlations is not None:
+            self.correlations.save(str(path / CORRELATIONS_FILE))
+
+    @classmethod
+    def load(cls, directory: str) -> "DailyJoinState":
+        path = Path(directory)
+        partials = pd.read_parquet(path / PARTIALS_FILE)
+        keys = [c for c in ["account", "date"] if c in partials.columns]
+        corr_path = path / CORRELATIONS_FILE
+        return cls(
+            partials=partials.set_index(keys),
+            joined=pd.read_parquet(path / JOINED_FILE),
+            correlations=GroupedCovariance.load(str(corr_path)) if corr_path.exists() else None,
+        )
@@ -1,55 +1,236 @@
+from __future__ import annotations
+
+import heapq
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .data_loader import to_day
+
+API_URL = "https://api.hyperliquid.xyz/info"
+
+
+def make_session(pool_size: int = 16, retries: int = 3, backoff: float = 0.3) -> requests.Session:
+    """Keep-alive session with a connection pool sized for concurrent polling and retries on 429/5xx."""
+    session = requests.Session()
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"POST"}),
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Content-Type": "application/json"})
+    return session
+
+
+def _request_trades(session: requests.Session, coin: str, url: str, timeout: float) -> list[dict]:
+    response = session.post(url, json={"type": "recentTrades", "coin": coin}, timeout=timeout)
+    response.raise_for_status()
+    return response.json() or []
+
+
+def _trade_time(trade: dict) -> int:
+    return trade.get("time", 0)
 
 
-def fetch_recent_trades(coin: str = "BTC") -> pd.DataFrame:
+def normalize_live_trades(data: list[dict]) -> pd.DataFrame:
+    """Raw ``recentTrades`` records -> frame shaped like our historical schema where possible."""
+    if not data:
+        return pd.DataFrame()
+    df = pd.DataFrame(data)
+
+    # Expected fields: coin, side, px, sz, time, hash
+    df["price"] = df["px"].astype(float)
+    df["size"] = df["sz"].astype(float)
+    df["volume_usd"] = df["price"] * df["size"]
+    df["side"] = df["side"].apply(lambda x: "Buy" if x == "B" else "Sell")
+    df["time"] = pd.to_datetime(df["time"], unit="ms", utc=True)
+    df["date"] = to_day(df["time"])
+
+    # Add dummy fields to match historical schema for compatibility
+    df["account"] = "Live_Market_User" # We don't get account IDs in public trade feeds usually
+    df["total_pnl"] = 0.0 # Can't know PnL from public feed
+    df["avg_leverage"] = 1.0 # Unknown
+
+    return df
+
+
+def fetch_recent_trades(
+    coin: str = "BTC",
+    session: requests.Session | None = None,
+    url: str = API_URL,
+    timeout: float = 10.0,
+) -> pd.DataFrame:
     """
     Fetch recent trades for a specific coin from Hyperliquid API.
     Endpoint: https://api.hyperliquid.xyz/info
     """
-    url = "https://api.hyperliquid.xyz/info"
-    payload = {
-        "type": "l2Book", 
-        "coin": coin
-    }
-    # Note: 'recentTrades' might be the better type if available, but let's check l2Book or similar first.
-    # Actually, let's use the 'recentTrades' type as found in research.
-    
-    payload = {"type": "recentTrades", "coin": coin}
-    
     try:
-        response = requests.post(url, json=payload, headers={"Content-Type": "application/json"})
-        response.raise_for_status()
-        data = response.json()
-        
-        # Data structure is typically a list of dicts
-        if not data:
-            return pd.DataFrame()
-            
-        df = pd.DataFrame(data)
-        
-        # Normalize columns to match our historical schema where possible
-        # Expected fields: coin, side, px, sz, time, hash
-        
-        df["price"] = df["px"].astype(float)
-        df["size"] = df["sz"].astype(float)
-        df["volume_usd"] = df["price"] * df["size"]
-        df["side"] = df["side"].apply(lambda x: "Buy" if x == "B" else "Sell")
-        df["time"] = pd.to_datetime(df["time"], unit="ms", utc=True)
-        df["date"] = df["time"].dt.date
-        
-        # Add dummy fields to match historical schema for compatibility
-        df["account"] = "Live_Market_User" # We don't get account IDs in public trade feeds usually
-        df["total_pnl"] = 0.0 # Can't know PnL from public feed
-        df["avg_leverage"] = 1.0 # Unknown
-        
-        return df
-        
+        if session is not None:
+            return normalize_live_trades(_request_trades(session, coin, url, timeout))
+        with requests.Session() as own:
+            return normalize_live_trades(_request_trades(own, coin, url, timeout))
     except Exception as e:
         print(f"Error fetching live data: {e}")
         return pd.DataFrame()
 
+
+@dataclass
+class CoinStats:
+    """Running aggregates over every distinct trade seen for one coin."""
+
+    trades: int = 0
+    volume: float = 0.0
+    notional: float = 0.0
+    buy_volume: float = 0.0
+    sell_volume: float = 0.0
+    last_price: float = float("nan")
+    last_time: int = -1
+
+    @property
+    def vwap(self) -> float:
+        return self.notional / self.volume if self.volume else float("nan")
+
+    @property
+    def imbalance(self) -> float:
+        """(buy - sell) / (buy + sell) size, in [-1, 1]."""
+        total = self.buy_volume + self.sell_volume
+        return (self.buy_volume - self.sell_volume) / total if total else 0.0
+
+
+class LiveTradeFeed:
+    """Polls many coins concurrently and keeps a bounded, de-duplicated buffer per coin.
+
+    Each ``poll()`` fetches all coins on a thread pool over one pooled keep-alive session.
+    Trades are keyed by (hash, time, tid) - tid separates fills sharing a transaction hash
+    when the API provides it - so overlapping responses are only counted once, and a late
+    trade older than ones already seen is still counted. The keys of the last
+    ``key_history`` counted trades are remembered (by default ten ring buffers' worth), so
+    a trade re-sent after leaving the buffer is not counted twice. The most recent
+    ``buffer_size`` trades per coin by trade time are kept in a time-ordered ring buffer, so
+    a late batch evicts the oldest trades rather than the earliest to arrive, and VWAP,
+    volume and buy/sell imbalance are updated incrementally as new trades arrive.
+    """
+
+    def __init__(
+        self,
+        coins: list[str],
+        url: str = API_URL,
+        buffer_size: int = 1_000,
+        max_workers: int = 8,
+        timeout: float = 5.0,
+        session: requests.Session | None = None,
+        key_history: int | None = None,
+    ):
+        self.coins = list(coins)
+        self.url = url
+        self.buffer_size = buffer_size
+        self.key_history = key_history or 10 * buffer_size
+        self.timeout = timeout
+        self.session = session or make_session(pool_size=max(max_workers, len(self.coins)))
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._lock = threading.Lock()
+        self._buffers: dict[str, deque] = {c: deque(maxlen=buffer_size) for c in self.coins}
+        self._seen: dict[str, set] = {c: set() for c in self.coins}
+        self._seen_order: dict[str, deque] = {c: deque() for c in self.coins}
+        self.stats: dict[str, CoinStats] = {c: CoinStats() for c in self.coins}
+        self.errors: dict[str, str] = {}
+
+    @staticmethod
+    def _key(trade: dict) -> tuple:
+        return trade.get("hash"), trade.get("time"), trade.get("tid")
+
+    def _remember(self, coin: str, key: tuple) -> None:
+        seen, order = self._seen[coin], self._seen_order[coin]
+        seen.add(key)
+        order.append(key)
+        if len(order) > self.key_history:
+            seen.discard(order.popleft())
+
+    def ingest(self, coin: str, trades: list[dict]) -> int:
+        """Add raw trades for ``coin``; returns how many were new."""
+        with self._lock:
+            buffer, seen, stats = self._buffers[coin], self._seen[coin], self.stats[coin]
+            fresh = []
+            for trade in sorted(trades, key=_trade_time):
+                key = self._key(trade)
+                if key in seen:
+                    continue
+                self._remember(coin, key)
+                fresh.append(trade)
+            if fresh and buffer and _trade_time(fresh[0]) < _trade_time(buffer[-1]):
+                # Late trades: merge by time and keep the newest buffer_size
+                merged = heapq.merge(buffer, fresh, key=_trade_time)
+                self._buffers[coin] = deque(merged, maxlen=self.buffer_size)
+            else:
+                buffer.extend(fresh)
+
+            for trade in fresh:
+                px, sz = float(trade["px"]), float(trade["sz"])
+                stats.trades += 1
+                stats.volume += sz
+                stats.notional += px * sz
+                if trade.get("side") == "B":
+                    stats.buy_volume += sz
+                else:
+                    stats.sell_volume += sz
+            # A late batch of old trades does not move the last price back
+            if fresh and _trade_time(fresh[-1]) >= stats.last_time:
+                stats.last_price = float(fresh[-1]["px"])
+                stats.last_time = _trade_time(fresh[-1])
+            return len(fresh)
+
+    def _poll_coin(self, coin: str) -> int:
+        try:
+            trades = _request_trades(self.session, coin, self.url, self.timeout)
+        except Exception as e:
+            self.errors[coin] = str(e)
+            return 0
+        self.errors.pop(coin, None)
+        return self.ingest(coin, trades)
+
+    def poll(self) -> dict[str, int]:
+        """Fetch every coin concurrently; returns the number of new trades per coin."""
+        return dict(zip(self.coins, self._pool.map(self._poll_coin, self.coins)))
+
+    def frame(self, coin: str) -> pd.DataFrame:
+        """Buffered trades for ``coin``, oldest first, in the normalized live schema."""
+        with self._lock:
+            data = list(self._buffers[coin])
+        return normalize_live_trades(data)
+
+    def summary(self) -> pd.DataFrame:
+        """One row per coin with the running aggregates."""
+        with self._lock:
+            rows = [
+                {
+                    "coin": coin,
+                    "trades": s.trades,
+                    "volume": s.volume,
+                    "volume_usd": s.notional,
+                    "vwap": s.vwap,
+                    "imbalance": s.imbalance,
+                    "last_price": s.last_price,
+                    "buffered": len(self._buffers[coin]),
+                }
+                for coin, s in self.stats.items()
+            ]
+        return pd.DataFrame(rows).set_index("coin")
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False)
+        self.session.close()
+
+
 if __name__ == "__main__":
     df = fetch_recent_trades()
     print(df.head())
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+# String columns that are always low-cardinality relative to row count in our data
+CATEGORY_COLUMNS = ("account", "coin", "side", "direction", "classification", "crossed")
+
+# Other string columns become categorical when unique values are at most this share of rows
+CATEGORY_RATIO = 0.5
+
+# Integers are never downcast below this: counts are multiplied and differenced downstream,
+# and int8/int16 arithmetic wraps silently (int8 100 * 100 == 16)
+MIN_INT_BYTES = 4
+
+
+def _is_string(series: pd.Series) -> bool:
+    return pd.api.types.is_object_dtype(series.dtype) or pd.api.types.is_string_dtype(series.dtype)
+
+
+def compact_frame(
+    df: pd.DataFrame,
+    float32: bool | list[str] = False,
+    category_ratio: float = CATEGORY_RATIO,
+) -> pd.DataFrame:
+    """Return a copy of ``df`` with a smaller dtype for every column where that is lossless.
+
+    - strings in ``CATEGORY_COLUMNS`` (or repetitive enough) become categoricals,
+    - integers are downcast to the smallest signed type that holds them, but no smaller
+      than 32 bits (``MIN_INT_BYTES``),
+    - floats stay float64 unless ``float32`` is True (all float columns) or a list of
+      column names, since that is the one lossy step.
+    """
+    out = df.copy()
+    n = max(len(out), 1)
+    float32_cols = set(out.columns) if float32 is True else set(float32 or [])
+    for col in out.columns:
+        s = out[col]
+        if _is_string(s):
+            if col in CATEGORY_COLUMNS or s.nunique(dropna=True) / n <= category_ratio:
+                out[col] = s.astype("category")
+        elif pd.api.types.is_bool_dtype(s.dtype):
+            continue
+        elif pd.api.types.is_integer_dtype(s.dtype):
+            # Signed only: unsigned counts would wrap on subtraction downstream
+            small = pd.to_numeric(s, downcast="integer")
+            if small.dtype.itemsize < MIN_INT_BYTES:
+                small = small.astype("Int32" if pd.api.types.is_extension_array_dtype(small.dtype) else np.int32)
+            out[col] = small
+        elif pd.api.types.is_float_dtype(s.dtype) and col in float32_cols:
+            out[col] = s.astype(np.float32)
+    return out
+
+
+def memory_report(before: pd.DataFrame, after: pd.DataFrame | None = None) -> pd.DataFrame:
+    """Per-column dtype and deep memory usage before/after compaction, plus a total row."""
+    if after is None:
+        after = compact_frame(before)
+    mb = 1024 ** 2
+    report = pd.DataFrame({
+        "dtype_before": before.dtypes.astype(str),
+        "dtype_after": after.dtypes.reindex(before.columns).astype(str),
+        "mb_before": before.memory_usage(deep=True, index=False) / mb,
+        "mb_after": after.memory_usage(deep=True, index=False).reindex(before.columns) / mb,
+    })
+    report.loc["TOTAL"] = ["", "", report["mb_before"].sum(), report["mb_after"].sum()]
+    report["saved_pct"] = 100 * (1 - report["mb_after"] / report["mb_before"])
+    return report
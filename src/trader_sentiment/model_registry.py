@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+MODEL_FILE = "model.joblib"
+META_FILE = "meta.json"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def to_jsonable(value):
+    """``value`` with dict keys turned into strings and numpy scalars into Python numbers,
+    recursively, so ``json.dumps`` accepts model metrics and feature importances."""
+    if isinstance(value, dict):
+        return {str(k): to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (np.floating, np.integer)):
+        return value.item()
+    return value
+
+
+class ModelRegistry:
+    """On-disk cache of trained models keyed by their training data and settings.
+
+    Each entry is a directory holding the pickled result dict (model, metrics, feature
+    importance) and a small JSON sidecar with everything but the model. Entries are
+    evicted least-recently-used first once the directory exceeds ``max_bytes``.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def make_key(X: pd.DataFrame, y: pd.Series, features: list[str], params: dict) -> str:
+        """Hash of the training frame, the feature list and the hyperparameters."""
+        h = hashlib.sha256()
+        h.update(pd.util.hash_pandas_object(X, index=False).to_numpy().tobytes())
+        h.update(pd.util.hash_pandas_object(y, index=False).to_numpy().tobytes())
+        h.update(json.dumps({"features": list(features), "params": params}, sort_keys=True, default=str).encode())
+        return h.hexdigest()[:24]
+
+    def get(self, key: str) -> dict | None:
+        path = self.cache_dir / key / MODEL_FILE
+        if not path.exists():
+            return None
+        import joblib
+
+        try:
+            result = joblib.load(path)
+        except Exception:
+            # Truncated or from an incompatible sklearn: drop it and retrain
+            shutil.rmtree(path.parent, ignore_errors=True)
+            return None
+        # mtime doubles as the LRU clock
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted by another process since the load; the result is still good
+            pass
+        return result
+
+    def put(self, key: str, result: dict) -> None:
+        import joblib
+
+        entry = self.cache_dir / key
+        entry.mkdir(parents=True, exist_ok=True)
+        # Per-process name: report workers can train the same key into a shared directory
+        tmp = entry / f"{MODEL_FILE}.{os.getpid()}.tmp"
+        joblib.dump(result, tmp)
+        os.replace(tmp, entry / MODEL_FILE)
+        meta = {k: v for k, v in result.items() if k != "model"}
+        meta["model_class"] = type(result.get("model")).__name__
+        meta["created_at"] = time.time()
+        (entry / META_FILE).write_text(json.dumps(to_jsonable(meta), indent=2))
+        self.evict(keep=key)
+
+    def entries(self) -> pd.DataFrame:
+        """One row per cached model: key, size on disk and last use.
+
+        Entries deleted by another process while they are being listed are skipped.
+        """
+        rows = []
+        for entry in self.cache_dir.glob("*"):
+            model = entry / MODEL_FILE
+            try:
+                if entry.is_dir() and model.exists():
+                    size = sum(f.stat().st_size for f in entry.iterdir() if f.is_file())
+                    rows.append({"key": entry.name, "bytes": size, "last_used": model.stat().st_mtime})
+            except FileNotFoundError:
+                continue
+        return pd.DataFrame(rows, columns=["key", "bytes", "last_used"])
+
+    def evict(self, keep: str | None = None) -> None:
+        """Delete least-recently-used entries until the cache fits in ``max_bytes``."""
+        entries = self.entries().sort_values("last_used")
+        total = entries["bytes"].sum()
+        for row in entries.itertuples():
+            if total <= self.max_bytes:
+                break
+            if row.key == keep:
+                continue
+            shutil.rmtree(self.cache_dir / row.key, ignore_errors=True)
+            total -= row.bytes
+
+    def fetch_or_train(self, X: pd.DataFrame, y: pd.Series, params: dict, train) -> dict:
+        """Return the cached result for this training set, or call ``train()`` and cache it."""
+        key = self.make_key(X, y, list(X.columns), params)
+        result = self.get(key)
+        if result is None:
+            result = train()
+            self.put(key, result)
+        return result
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import functools
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .analysis import join_sentiment
+from .covariance import CovarianceAccumulator, GroupedCovariance, accumulate
+from .data_loader import daily_trader_agg
+
+
+def partition_by_account(trades: pd.DataFrame, n_partitions: int) -> list[pd.DataFrame]:
+    """Split trades into ``n_partitions`` frames by a stable hash of the account.
+
+    Every fill of an account lands in the same partition, so per-account (and per
+    account-day) work on one partition never needs data from another.
+    """
+    buckets = pd.util.hash_array(trades["account"].to_numpy()) % np.uint64(n_partitions)
+    order = np.argsort(buckets, kind="stable")
+    bounds = np.searchsorted(buckets[order], np.arange(n_partitions + 1, dtype=np.uint64))
+    return [trades.iloc[order[lo:hi]] for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+
+def _join_partition(trades: pd.DataFrame, fng: pd.DataFrame) -> pd.DataFrame:
+    return join_sentiment(daily_trader_agg(trades), fng)
+
+
+def _accumulate_partition(frame: pd.DataFrame, by: str | None, columns: list[str]):
+    return accumulate([frame], by=by, columns=columns)
+
+
+def _pool_context():
+    """forkserver where the platform has it, spawn elsewhere.
+
+    Workers are never forked from the caller, which may be running threads (Streamlit,
+    the live feed's pool) whose locks a fork would copy in a held state.
+    """
+    methods = mp.get_all_start_methods()
+    return mp.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def map_partitions(func, partitions: list, args: tuple = (), n_jobs: int | None = None) -> list:
+    """``[func(p, *args) for p in partitions]`` on a pool of ``n_jobs`` processes.
+
+    Each task is pickled with its own partition and arguments, so concurrent calls share
+    no state; send each only what it needs. ``func`` must be importable (module level).
+    Results come back in partition order. Runs in this process when ``n_jobs`` is 1 or
+    there is at most one partition.
+    """
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if n_jobs == 1 or len(partitions) <= 1:
+        return [func(p, *args) for p in partitions]
+    with ProcessPoolExecutor(max_workers=min(n_jobs, len(partitions)), mp_context=_pool_context()) as pool:
+        futures = [pool.submit(func, p, *args) for p in partitions]
+        return [f.result() for f in futures]
+
+
+def parallel_daily_join(trades: pd.DataFrame, fng: pd.DataFrame, n_jobs: int | None = None) -> pd.DataFrame:
+    """daily_trader_agg + join_sentiment fanned out over a process pool by account.
+
+    Output rows (and values) match the single-process path: results are concatenated and
+    sorted by (account, date) so the order does not depend on which worker finishes first.
+    """
+    n_jobs = n_jobs or os.cpu_count() or 1
+    partitions = [p for p in partition_by_account(trades, n_jobs) if len(p)]
+    results = map_partitions(_join_partition, partitions, (fng,), n_jobs)
+
+    if not results:
+        return _join_partition(trades, fng)
+    keys = [c for c in ["account", "date"] if c in results[0].columns]
+    return (
+        pd.concat(results, ignore_index=True)
+        .sort_values(keys, na_position="last", kind="stable")
+        .reset_index(drop=True)
+    )
+
+
+def parallel_correlations(
+    df: pd.DataFrame,
+    by: str | None = None,
+    n_jobs: int | None = None,
+) -> CovarianceAccumulator | GroupedCovariance:
+    """Covariance accumulator of ``df`` built per account partition on a process pool.
+
+    Each worker returns only its p x p moments, which are merged in the parent; call
+    ``.corr()`` (or ``.corr_by_group()`` with ``by``) on the result.
+    """
+    n_jobs = n_jobs or os.cpu_count() or 1
+    columns = [c for c in df.select_dtypes(include=[np.number]).columns if c != by]
+    partitions = [p for p in partition_by_account(df, n_jobs) if len(p)] or [df]
+    parts = map_partitions(_accumulate_partition, partitions, (by, columns), n_jobs)
+    return functools.reduce(lambda a, b: a.merge(b), parts)
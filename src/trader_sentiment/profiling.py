@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import cProfile
+import functools
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Set to "1" to record stages in the dashboard, or "cprofile"/"pyinstrument" to also profile them
+ENV_VAR = "TRADER_SENTIMENT_PROFILE"
+PROFILERS = ("cprofile", "pyinstrument")
+
+PROFILE_LINES = 30
+
+
+@dataclass
+class StageRecord:
+    """Timings of one instrumented stage; ``parent`` is the enclosing stage, if any."""
+
+    name: str
+    started: float = 0.0
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    peak_rss_delta_mb: float = 0.0
+    rows_in: int | None = None
+    rows_out: int | None = None
+    parent: str | None = None
+    depth: int = 0
+    profile: str | None = None
+
+
+class _Disabled:
+    """Stand-in yielded by ``stage()`` while recording is off; row counts set on it are dropped."""
+
+    rows_in = rows_out = None
+
+    def __setattr__(self, name, value):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_DISABLED = _Disabled()
+
+
+class Recorder:
+    """Collects the stages of one run; activate it with ``recording``.
+
+    Each dashboard session (or script) uses its own recorder, so concurrent runs never
+    see or clear each other's records. ``profiler`` ("cprofile" or "pyinstrument") also
+    profiles each outermost stage and keeps the report on its record.
+    """
+
+    def __init__(self, profiler: str | None = None):
+        if profiler not in (None, *PROFILERS):
+            raise ValueError(f"Unknown profiler: {profiler!r}")
+        self.profiler = profiler
+        self._records: list[StageRecord] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Recorder | None:
+        """A recorder configured by ``ENV_VAR``, or None when it is unset."""
+        mode = os.environ.get(ENV_VAR, "").strip().lower()
+        if not mode:
+            return None
+        return cls(mode if mode in PROFILERS else None)
+
+    def add(self, record: StageRecord) -> None:
+        with self._lock:
+            self._records.append(record)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._records.clear()
+
+    def records(self) -> pd.DataFrame:
+        """Completed stages in start order, so each parent precedes its nested stages.
+
+        ``started`` is a ``time.perf_counter()`` reading, only meaningful relative to other rows.
+        """
+        with self._lock:
+            rows = [asdict(r) for r in sorted(self._records, key=lambda r: r.started)]
+        return pd.DataFrame(rows, columns=list(StageRecord.__dataclass_fields__))
+
+    def last_profile(self) -> str | None:
+        """Profiler report of the most recent outermost stage, when a profiler was set."""
+        with self._lock:
+            for rec in reversed(self._records):
+                if rec.profile is not None:
+                    return rec.profile
+        return None
+
+
+# The active recorder and the names of the open stages, per thread/async context
+_recorder: ContextVar[Recorder | None] = ContextVar("trader_sentiment_recorder", default=None)
+_open_stages: ContextVar[tuple[str, ...]] = ContextVar("trader_sentiment_open_stages", default=())
+# The interpreter runs one profiler at a time (a second cProfile raises on 3.12+), so
+# concurrent sessions take turns; a stage that finds it busy is timed but not profiled
+_profiler_slot = threading.Lock()
+
+
+@contextmanager
+def recording(recorder: Recorder | None):
+    """Record stages run inside the block (in this thread or async context) into ``recorder``.
+
+    ``None`` leaves recording off, so callers can pass ``Recorder.from_env()`` through.
+    """
+    token = _recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _recorder.reset(token)
+
+
+def active() -> Recorder | None:
+    return _recorder.get()
+
+
+def _peak_rss_mb() -> float:
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, KiB elsewhere
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+def _start_profiler(profiler: str):
+    if profiler == "pyinstrument":
+        from pyinstrument import Profiler
+
+        prof = Profiler()
+        prof.start()
+        return prof
+    prof = cProfile.Profile()
+    prof.enable()
+    return prof
+
+
+def _stop_profiler(profiler: str, prof) -> str:
+    if profiler == "pyinstrument":
+        prof.stop()
+        return prof.output_text()
+    prof.disable()
+    out = io.StringIO()
+    pstats.Stats(prof, stream=out).sort_stats("cumulative").print_stats(PROFILE_LINES)
+    return out.getvalue()
+
+
+class _Stage:
+    __slots__ = ("record", "_recorder", "_token", "_wall", "_cpu", "_rss", "_prof")
+
+    def __init__(self, recorder: Recorder, name: str, rows_in: int | None):
+        self.record = StageRecord(name=name, rows_in=rows_in)
+        self._recorder = recorder
+
+    def __setattr__(self, name, value):
+        # ``with stage(...) as s: s.rows_out = len(df)`` sets the record's fields
+        if name in ("rows_in", "rows_out"):
+            setattr(self.record, name, value)
+        else:
+            object.__setattr__(self, name, value)
+
+    def __enter__(self):
+        stack = _open_stages.get()
+        self.record.parent = stack[-1] if stack else None
+        self.record.depth = len(stack)
+        self._token = _open_stages.set(stack + (self.record.name,))
+        self._prof = None
+        profiler = self._recorder.profiler
+        if profiler and not self.record.depth and _profiler_slot.acquire(blocking=False):
+            try:
+                self._prof = _start_profiler(profiler)
+            except BaseException:
+                _profiler_slot.release()
+                raise
+        self._rss = _peak_rss_mb()
+        self._cpu = time.process_time()
+        self._wall = self.record.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        rec = self.record
+        rec.wall_s = time.perf_counter() - self._wall
+        rec.cpu_s = time.process_time() - self._cpu
+        rec.peak_rss_delta_mb = _peak_rss_mb() - self._rss
+        if self._prof is not None:
+            try:
+                rec.profile = _stop_profiler(self._recorder.profiler, self._prof)
+            finally:
+                _profiler_slot.release()
+        _open_stages.reset(self._token)
+        self._recorder.add(rec)
+        return False
+
+
+def stage(name: str, rows_in: int | None = None):
+    """Context manager timing a block as stage ``name``.
+
+    Records wall time, CPU time, growth of the process's peak RSS and optional row counts
+    (set ``rows_out`` on the yielded object) into the active recorder. With none active it
+    returns a shared no-op.
+    """
+    recorder = _recorder.get()
+    if recorder is None:
+        return _DISABLED
+    return _Stage(recorder, name, rows_in)
+
+
+def _rows(value) -> int | None:
+    return len(value) if isinstance(value, (pd.DataFrame, pd.Series)) else None
+
+
+def instrument(name: str | None = None):
+    """Decorator form of ``stage``: rows in/out are taken from the first argument and the
+    return value when they are DataFrames. Costs one context lookup per call while disabled."""
+
+    def decorate(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            recorder = _recorder.get()
+            if recorder is None:
+                return fn(*args, **kwargs)
+            with _Stage(recorder, label, _rows(args[0]) if args else None) as s:
+                result = fn(*args, **kwargs)
+                s.rows_out = _rows(result)
+            return result
+
+        return wrapper
+
+    return decorate
@@ -0,0 +1,236 @@
+"""Headless batch report: build the daily join once, run the analyses in parallel, write artifacts.
+
+    python -m src.trader_sentiment.report --jobs 4
+
+Every task writes its outputs to ``<out>/<artifact>.parquet`` (frames) or ``.json``
+(model metrics), and ``manifest.json`` records which source files they were built from,
+so the dashboard only picks up a report that matches the data it is showing.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from .analysis import (
+    analyze_correlations,
+    build_trader_profile,
+    calculate_risk_metrics,
+    cluster_traders,
+    predict_pnl,
+    predict_win_probability,
+    rolling_risk_metrics,
+    select_n_clusters,
+)
+from .cache import cached_daily_join, source_fingerprint
+from .features import FeatureStore
+from .model_registry import ModelRegistry, to_jsonable
+from .parallel import map_partitions
+from .profiling import instrument
+
+MANIFEST_FILE = "manifest.json"
+
+
+def _correlations(df: pd.DataFrame, options: dict) -> dict:
+    return {
+        "correlations": analyze_correlations(df).rename_axis("feature"),
+        "correlations_by_class": analyze_correlations(df, by="classification").rename_axis(
+            ["classification", "feature"]
+        ),
+    }
+
+
+def _clusters(df: pd.DataFrame, options: dict) -> dict:
+    out = {}
+    n_clusters = options.get("n_clusters", 3)
+    if n_clusters == "auto":
+        # One worker per task already; keep the k search in this process
+        n_clusters, scores = select_n_clusters(build_trader_profile(df), k_values=range(2, 11), n_jobs=1)
+        out["cluster_k_scores"] = scores
+    out["clusters"] = cluster_traders(df, n_clusters=n_clusters)
+    return out
+
+
+def _registry(options: dict) -> ModelRegistry | None:
+    return ModelRegistry(options["model_dir"]) if options.get("model_dir") else None
+
+
+def _pnl_model(df: pd.DataFrame, options: dict) -> dict:
+    return {"pnl_model": predict_pnl(df, registry=_registry(options), store=options.get("store"))}
+
+
+def _win_probability(df: pd.DataFrame, options: dict) -> dict:
+    return {"win_probability": predict_win_probability(df, registry=_registry(options), store=options.get("store"))}
+
+
+def _risk_metrics(df: pd.DataFrame, options: dict) -> dict:
+    return {"risk_metrics": calculate_risk_metrics(df), "rolling_risk_metrics": rolling_risk_metrics(df)}
+
+
+# Task name -> function(daily_join, options) returning {artifact name: frame or result dict}
+TASKS = {
+    "correlations": _correlations,
+    "clusters": _clusters,
+    "pnl_model": _pnl_model,
+    "win_probability": _win_probability,
+    "risk_metrics": _risk_metrics,
+}
+
+# Columns of the daily join each task reads; only these are pickled to its worker. The
+# model tasks train from the shared feature store; tasks not listed (correlations) get
+# every numeric column plus the classification.
+TASK_COLUMNS = {
+    "clusters": ["account", "total_pnl", "volume_usd", "trades", "winning_trades", "losing_trades"],
+    "pnl_model": [],
+    "win_probability": [],
+    "risk_metrics": ["account", "date", "total_pnl"],
+}
+STORE_TASKS = {"pnl_model", "win_probability"}
+
+
+def _task_input(name: str, df: pd.DataFrame, options: dict) -> tuple[str, pd.DataFrame, dict]:
+    """What is sent to the worker running ``name``: its columns and, for model tasks, the store."""
+    if name in TASK_COLUMNS:
+        columns = [c for c in TASK_COLUMNS[name] if c in df.columns]
+    else:
+        columns = [c for c in df.columns if c == "classification" or pd.api.types.is_numeric_dtype(df[c])]
+    if name not in STORE_TASKS:
+        options = {k: v for k, v in options.items() if k != "store"}
+    return name, df[columns], options
+
+
+def _write_artifact(out_dir: Path, name: str, value) -> str:
+    # Write next to the target and rename, so readers never see a half-written file
+    if isinstance(value, pd.DataFrame):
+        path = out_dir / f"{name}.parquet"
+        tmp = path.with_suffix(".tmp")
+        value.to_parquet(tmp)
+    else:
+        path = out_dir / f"{name}.json"
+        tmp = path.with_suffix(".tmp")
+        # Fitted models stay in the model registry; only their metrics go in the report
+        result = {k: v for k, v in value.items() if k != "model"}
+        tmp.write_text(json.dumps(to_jsonable(result), indent=2, default=str))
+    os.replace(tmp, path)
+    return path.name
+
+
+def _run_task(task: tuple[str, pd.DataFrame, dict], out_dir: str) -> dict:
+    """Run one task (from ``_task_input``) and write its artifacts; failures are reported, not raised."""
+    name, df, options = task
+    started = time.perf_counter()
+    entry = {"status": "ok", "files": [], "error": None}
+    try:
+        for artifact, value in TASKS[name](df, options).items():
+            entry["files"].append(_write_artifact(Path(out_dir), artifact, value))
+    except Exception as e:
+        entry.update(status="failed", error=f"{type(e).__name__}: {e}")
+    entry["wall_s"] = time.perf_counter() - started
+    return entry
+
+
+@instrument()
+def run_report(
+    df: pd.DataFrame,
+    out_dir: str,
+    tasks: list[str] | None = None,
+    n_jobs: int | None = None,
+    source: str | None = None,
+    **options,
+) -> dict:
+    """Run ``tasks`` (all by default) on the daily join at once, one process each.
+
+    ``options`` are passed to the tasks: ``n_clusters`` (int or "auto"), ``model_dir``
+    (a ``ModelRegistry`` directory, so unchanged training sets reuse saved models) and
+    ``store`` (a ``FeatureStore`` of ``df``; built here once for all model tasks if absent).
+    ``source`` is stored in the manifest for ``read_artifact`` to check against.
+    Returns the manifest.
+    """
+    tasks = list(TASKS) if tasks is None else list(tasks)
+    unknown = sorted(set(tasks) - set(TASKS))
+    if unknown:
+        raise ValueError(f"Unknown report tasks: {unknown}")
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    n_jobs = min(n_jobs or os.cpu_count() or 1, len(tasks))
+    if options.get("store") is None and STORE_TASKS & set(tasks):
+        options["store"] = FeatureStore.from_daily(df)
+
+    inputs = [_task_input(name, df, options) for name in tasks]
+    results = map_partitions(_run_task, inputs, (out_dir,), n_jobs)
+    manifest = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "source": source,
+        "rows": len(df),
+        "tasks": dict(zip(tasks, results)),
+    }
+    tmp = Path(out_dir) / f"{MANIFEST_FILE}.tmp"
+    tmp.write_text(json.dumps(manifest, indent=2, default=str))
+    os.replace(tmp, Path(out_dir) / MANIFEST_FILE)
+    return manifest
+
+
+def read_manifest(report_dir: str, source: str | None = None) -> dict | None:
+    """The report's manifest, or None if there is none or it was built from other sources."""
+    path = Path(report_dir) / MANIFEST_FILE
+    if not path.exists():
+        return None
+    manifest = json.loads(path.read_text())
+    if source is not None and manifest.get("source") != source:
+        return None
+    return manifest
+
+
+def read_artifact(report_dir: str, name: str, source: str | None = None):
+    """A frame or result dict written by ``run_report``, or None if missing or stale."""
+    manifest = read_manifest(report_dir, source)
+    if manifest is None:
+        return None
+    for filename in (f"{name}.parquet", f"{name}.json"):
+        written = any(filename in t["files"] for t in manifest["tasks"].values())
+        path = Path(report_dir) / filename
+        if written and path.exists():
+            return pd.read_parquet(path) if filename.endswith(".parquet") else json.loads(path.read_text())
+    return None
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Precompute the dashboard's analyses as Parquet/JSON artifacts.")
+    parser.add_argument("--trades", default="data/raw/hyperliquid_trades.csv")
+    parser.add_argument("--fear-greed", default="data/raw/fear_greed.csv")
+    parser.add_argument("--processed-dir", default="data/processed")
+    parser.add_argument("--out", default=None, help="Report directory (default: <processed-dir>/report)")
+    parser.add_argument("--tasks", nargs="+", choices=list(TASKS), default=list(TASKS))
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: one per task, up to CPUs)")
+    parser.add_argument("--clusters", default="3", help="Number of trader clusters, or 'auto'")
+    parser.add_argument("--no-model-cache", action="store_true", help="Always retrain instead of reusing saved models")
+    args = parser.parse_args(argv)
+
+    out_dir = args.out or os.path.join(args.processed_dir, "report")
+    daily = cached_daily_join(args.trades, args.fear_greed, processed_dir=args.processed_dir)
+    # Saved per data version: a nightly run on unchanged data skips feature construction
+    store = FeatureStore.cached(daily, os.path.join(args.processed_dir, "features"))
+    manifest = run_report(
+        daily,
+        out_dir,
+        tasks=args.tasks,
+        n_jobs=args.jobs,
+        source=source_fingerprint([args.trades, args.fear_greed]),
+        n_clusters=args.clusters if args.clusters == "auto" else int(args.clusters),
+        model_dir=None if args.no_model_cache else os.path.join(args.processed_dir, "models"),
+        store=store,
+    )
+
+    print(f"{manifest['rows']:,} account-days -> {out_dir}")
+    for name, entry in manifest["tasks"].items():
+        detail = ", ".join(entry["files"]) if entry["status"] == "ok" else entry["error"]
+        print(f"  {name:<16} {entry['status']:<7} {entry['wall_s']:7.2f}s  {detail}")
+    return 0 if all(t["status"] == "ok" for t in manifest["tasks"].values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_COINS = ("BTC", "ETH", "SOL", "HYPE", "DOGE", "ARB", "AVAX", "LINK")
+
+# Fear/Greed value bands, as published with the index
+_FNG_BANDS = ((24, "Extreme Fear"), (44, "Fear"), (55, "Neutral"), (74, "Greed"), (100, "Extreme Greed"))
+
+_DIRECTIONS = np.array(["Open Long", "Close Long", "Open Short", "Close Short"], dtype=object)
+_IST = pd.Timedelta(hours=5, minutes=30)
+
+
+def account_weights(n_accounts: int, skew: float = 1.0, seed: int = 42) -> np.ndarray:
+    """Share of trades per account: Zipf-like ``rank ** -skew``, in a shuffled account order.
+
+    ``skew=0`` spreads trades evenly; ~1 gives the long tail of real exchange data, where a
+    handful of accounts place most of the fills.
+    """
+    rng = np.random.default_rng(seed)
+    weights = np.arange(1, n_accounts + 1, dtype="float64") ** -skew
+    rng.shuffle(weights)
+    return weights / weights.sum()
+
+
+def make_fear_greed(n_days: int = 365, start: str = "2024-01-01", seed: int = 42) -> pd.DataFrame:
+    """Daily Fear/Greed rows in the layout of the published CSV (timestamp, value, classification, date)."""
+    rng = np.random.default_rng(seed)
+    days = pd.date_range(start, periods=n_days, freq="D")
+    # Mean-reverting walk around 50, so regimes last for days rather than flipping daily
+    value = np.empty(n_days)
+    level = 50.0
+    for i, step in enumerate(rng.normal(0, 10, size=n_days)):
+        level = float(np.clip(level + 0.1 * (50 - level) + step, 1, 99))
+        value[i] = level
+    value = value.round().astype("int64")
+    bounds = np.array([b for b, _ in _FNG_BANDS])
+    labels = np.array([label for _, label in _FNG_BANDS], dtype=object)
+    return pd.DataFrame({
+        "timestamp": days.asi8 // 10**9,
+        "value": value,
+        "classification": labels[np.searchsorted(bounds, value)],
+        "date": days.strftime("%Y-%m-%d"),
+    })
+
+
+def make_trades(
+    n_rows: int,
+    n_accounts: int = 1_000,
+    n_days: int = 365,
+    skew: float = 1.0,
+    start: str = "2024-01-01",
+    coins: tuple[str, ...] = DEFAULT_COINS,
+    seed: int = 42,
+) -> pd.DataFrame:
+    """Seeded fills in the raw Hyperliquid export layout (title-case headers, epoch-ms ``Timestamp``).
+
+    Trades per account follow ``account_weights(n_accounts, skew)`` and are spread uniformly
+    over ``n_days`` days from ``start``. Only closing fills carry a non-zero ``Closed PnL``,
+    as in the real export.
+    """
+    rng = np.random.default_rng(seed)
+    accounts = np.array([f"0x{i:040x}" for i in range(n_accounts)], dtype=object)
+    coins = np.array(coins, dtype=object)
+
+    account_idx = rng.choice(n_accounts, size=n_rows, p=account_weights(n_accounts, skew, seed))
+    minute = rng.integers(0, n_days * 1_440, size=n_rows)
+    ts_ms = pd.Timestamp(start).value // 10**6 + minute * 60_000 + rng.integers(0, 60_000, size=n_rows)
+    # Format each distinct minute once; there are far fewer of them than rows
+    uniq, inverse = np.unique(minute, return_inverse=True)
+    ist = (pd.Timestamp(start) + pd.to_timedelta(uniq, unit="min") + _IST).strftime("%d-%m-%Y %H:%M")
+
+    direction = _DIRECTIONS[rng.integers(0, len(_DIRECTIONS), size=n_rows)]
+    is_buy = (direction == "Open Long") | (direction == "Close Short")
+    closing = (direction == "Close Long") | (direction == "Close Short")
+
+    coin_idx = rng.integers(0, len(coins), size=n_rows)
+    base_price = rng.lognormal(3, 2, size=len(coins))
+    price = base_price[coin_idx] * rng.lognormal(0, 0.05, size=n_rows)
+    size_usd = rng.lognormal(6, 1.5, size=n_rows)
+    pnl = np.where(closing, rng.normal(0, 0.03, size=n_rows) * size_usd, 0.0)
+
+    return pd.DataFrame({
+        "Account": accounts[account_idx],
+        "Coin": coins[coin_idx],
+        "Execution Price": price.round(6),
+        "Size Tokens": (size_usd / price).round(6),
+        "Size USD": size_usd.round(2),
+        "Side": np.where(is_buy, "BUY", "SELL").astype(object),
+        "Timestamp IST": ist[inverse],
+        "Start Position": rng.normal(0, 1_000, size=n_rows).round(4),
+        "Direction": direction,
+        "Closed PnL": pnl.round(6),
+        "Order ID": rng.integers(10**10, 10**11, size=n_rows),
+        "Crossed": rng.random(size=n_rows) < 0.6,
+        "Fee": (size_usd * 0.00035).round(6),
+        "Trade ID": rng.integers(10**14, 10**15, size=n_rows),
+        "Timestamp": ts_ms,
+    })
+
+
+def write_dataset(
+    out_dir: str,
+    n_rows: int,
+    n_accounts: int = 1_000,
+    n_days: int = 365,
+    skew: float = 1.0,
+    start: str = "2024-01-01",
+    seed: int = 42,
+) -> tuple[Path, Path]:
+    """Write a synthetic trades file and matching fear_greed.csv; returns (trades_path, fear_greed_path).
+
+    File names match ``ensure_data_exists``, so the directory can stand in for ``data/raw``.
+    """
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    trades = make_trades(n_rows, n_accounts=n_accounts, n_days=n_days, skew=skew, start=start, seed=seed)
+    trades_path = out / "hyperliquid_trades.csv"
+    trades.to_csv(trades_path, index=False)
+    fng_path = out / "fear_greed.csv"
+    make_fear_greed(n_days=n_days, start=start, seed=seed).to_csv(fng_path, index=False)
+    return trades_path, fng_path
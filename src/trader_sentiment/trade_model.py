@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import warnings
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from .analysis import SENTIMENT_MAP
+from .data_loader import DEFAULT_CHUNKSIZE, _trade_roles, iter_trades, load_fear_greed
+from .profiling import instrument, stage
+
+# Closing fills per account that the rolling win rate looks back over
+DEFAULT_WINDOW = 20
+
+# Normalized trade columns the pipeline reads (whichever of them the file has)
+TRADE_COLUMNS = [
+    "account", "timestamp", "time", "ts",
+    "closed pnl", "closedpnl", "pnl", "realizedpnl",
+    "size usd", "size_usd", "notional", "leverage",
+]
+
+TRADE_FEATURES = ["prev_win", "win_rate", "log_gap_s", "leverage", "sentiment_score", "log_size_usd"]
+
+# Values for features that are undefined at a fill: no earlier close, first fill, no leverage
+# column, a day without a Fear/Greed reading
+_NEUTRAL = {"prev_win": 0.5, "win_rate": 0.5, "log_gap_s": 0.0, "leverage": 1.0, "sentiment_score": 2.0}
+
+
+def _epoch_ms(values: pd.Series) -> np.ndarray:
+    return (pd.to_datetime(values, utc=True) - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(milliseconds=1)
+
+
+def sentiment_by_day(fng: pd.DataFrame) -> pd.Series:
+    """Fear/Greed score per calendar day, for looking up the sentiment at fill time."""
+    days = fng.dropna(subset=["date"]).drop_duplicates("date", keep="last")
+    return days["classification"].astype(object).map(SENTIMENT_MAP).set_axis(days["date"])
+
+
+@dataclass
+class TradeSequenceState:
+    """Per-account state carried from one chunk of fills to the next.
+
+    ``history`` keeps each account's last ``window`` closing fills (time, win) and
+    ``last_fill`` its latest fill time (epoch ms), so memory grows with the number of
+    accounts, never with the length of the history streamed through. ``late_fills``
+    counts fills that arrived after a later fill of the same account had already been
+    streamed (see ``advance``).
+    """
+
+    window: int = DEFAULT_WINDOW
+    history: pd.DataFrame = field(
+        default_factory=lambda: pd.DataFrame({
+            "account": pd.Series(dtype=object), "time": pd.Series(dtype="float64"), "win": pd.Series(dtype="float64"),
+        })
+    )
+    last_fill: pd.Series = field(default_factory=lambda: pd.Series(dtype="float64"))
+    late_fills: int = 0
+
+    def advance(self, trades: pd.DataFrame, sentiment: pd.Series) -> tuple[pd.DataFrame, "TradeSequenceState"]:
+        """Features of the closing fills in ``trades`` (normalized, as from ``iter_trades``) and the next state.
+
+        Fills are expected in time order across chunks, as the exchange exports them;
+        within a chunk they are sorted. A fill older than its account's last seen fill
+        gets a zero gap and is compared against history that is ahead of it, so such
+        fills are counted in ``late_fills`` and a ``RuntimeWarning`` is issued; sort the
+        file by time for exact features.
+        """
+        roles = _trade_roles(trades.columns)
+        time_col = next(c for c in ("timestamp", "time", "ts") if c in trades.columns)
+        pnl = trades[roles["pnl"]] if roles["pnl"] else pd.Series(np.nan, index=trades.index)
+        size_usd = trades[roles["size_usd"]] if roles["size_usd"] else pd.Series(np.nan, index=trades.index)
+        fills = pd.DataFrame({
+            "account": trades["account"].astype(object),
+            "time": _epoch_ms(trades[time_col]).astype("float64"),
+            "pnl": pnl.astype("float64"),
+            "size_usd": size_usd.astype("float64").abs(),
+            "leverage": trades["leverage"].astype("float64") if roles["leverage"] else np.nan,
+            "date": trades["date"],
+        }).sort_values(["account", "time"], kind="stable")
+
+        late = int((fills["time"] < fills["account"].map(self.last_fill)).sum())
+        if late:
+            warnings.warn(
+                # Fixed text, so the default filter shows it once; the count is in late_fills
+                "Fills are older than fills of the same account in an earlier chunk; their "
+                "sequence features are approximate. Sort the trades by time.",
+                RuntimeWarning,
+                stacklevel=2,
+            )
+
+        # Time since the account's previous fill of any kind, continuing from the last chunk
+        prev = fills.groupby("account", sort=False)["time"].shift(1)
+        first = prev.isna()
+        prev[first] = fills.loc[first, "account"].map(self.last_fill)
+        fills["gap_s"] = ((fills["time"] - prev) / 1_000).clip(lower=0)
+
+        # Outcome features over the closing fills, with the carried history in front
+        closes = fills[fills["pnl"].fillna(0) != 0].assign(win=lambda d: (d["pnl"] > 0).astype("float64"))
+        seq = pd.concat(
+            [self.history.assign(carried=True), closes[["account", "time", "win"]].assign(carried=False)],
+            ignore_index=True,
+        ).sort_values(["account", "time"], kind="stable")
+        g = seq.groupby("account", sort=False)
+        n_prior = g.cumcount()
+        prior_wins = g["win"].cumsum() - seq["win"]
+        dropped = prior_wins.groupby(seq["account"], sort=False).shift(self.window).fillna(0.0)
+        seq["prev_win"] = g["win"].shift(1)
+        seq["win_rate"] = (prior_wins - dropped) / np.minimum(n_prior, self.window).where(n_prior > 0)
+        fresh = seq[~seq["carried"].astype(bool)]
+
+        out = closes.assign(
+            prev_win=fresh["prev_win"].to_numpy(),
+            win_rate=fresh["win_rate"].to_numpy(),
+            log_gap_s=np.log1p(closes["gap_s"]),
+            sentiment_score=closes["date"].map(sentiment).astype("float64"),
+            log_size_usd=np.log1p(closes["size_usd"]),
+        )
+
+        last_fill = fills.groupby("account", sort=False)["time"].max()
+        state = TradeSequenceState(
+            window=self.window,
+            history=seq.groupby("account", sort=False).tail(self.window)[["account", "time", "win"]],
+            last_fill=pd.concat([self.last_fill, last_fill]).groupby(level=0).max(),
+            late_fills=self.late_fills + late,
+        )
+        return out[["account", "time", *TRADE_FEATURES, "win"]].reset_index(drop=True), state
+
+
+def trade_features(
+    chunks: Iterable[pd.DataFrame],
+    sentiment: pd.Series,
+    window: int = DEFAULT_WINDOW,
+) -> Iterator[pd.DataFrame]:
+    """Features of every closing fill in a stream of trade chunks, one frame per chunk."""
+    state = TradeSequenceState(window=window)
+    for chunk in chunks:
+        with stage("trade_features", rows_in=len(chunk)) as s:
+            features, state = state.advance(chunk, sentiment)
+            s.rows_out = len(features)
+        yield features
+
+
+def _design(features: pd.DataFrame) -> np.ndarray:
+    return features[TRADE_FEATURES].fillna(_NEUTRAL).fillna(0.0).to_numpy(dtype="float64")
+
+
+@instrument()
+def train_trade_win_model(
+    trades_path: str,
+    fear_greed_path: str,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    sample_frac: float = 0.25,
+    window: int = DEFAULT_WINDOW,
+    random_state: int = 42,
+) -> dict:
+    """Trade-level win model (is this closing fill profitable?) trained out of core.
+
+    Trades are streamed in ``chunksize`` rows; each chunk's closing fills get sequential
+    features (see ``TradeSequenceState``), a ``sample_frac`` sample of them is scored by
+    the model so far (progressive validation) and then fed to ``StandardScaler`` and
+    ``SGDClassifier`` via ``partial_fit``. Peak memory is one chunk plus the per-account
+    state, whatever the length of the history. ``n_late_fills`` reports fills that broke
+    the time order across chunks.
+    """
+    from sklearn.linear_model import SGDClassifier
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    sentiment = sentiment_by_day(load_fear_greed(fear_greed_path))
+    scaler = StandardScaler()
+    # The adaptive schedule keeps the small eta0 step while the loss improves and shrinks
+    # it after that; the default "optimal" schedule starts with huge steps and overshoots
+    # on the first batches
+    clf = SGDClassifier(loss="log_loss", learning_rate="adaptive", eta0=0.01, random_state=random_state)
+    rng = np.random.default_rng(random_state)
+
+    n_fills = n_labelled = n_trained = n_scored = 0
+    wins = correct = log_loss = 0.0
+    state = TradeSequenceState(window=window)
+    for chunk in iter_trades(trades_path, chunksize=chunksize, columns=TRADE_COLUMNS):
+        with stage("trade_features", rows_in=len(chunk)):
+            features, state = state.advance(chunk, sentiment)
+        n_fills += len(chunk)
+        n_labelled += len(features)
+        batch = features[rng.random(len(features)) < sample_frac]
+        if batch.empty:
+            continue
+        X, y = _design(batch), batch["win"].to_numpy(dtype="int64")
+        if n_trained:
+            # Score on the batch before learning from it: an out-of-sample estimate for free
+            prob = np.clip(clf.predict_proba(scaler.transform(X))[:, 1], 1e-15, 1 - 1e-15)
+            correct += float(((prob > 0.5) == y).sum())
+            log_loss -= float(np.sum(y * np.log(prob) + (1 - y) * np.log(1 - prob)))
+            n_scored += len(y)
+        scaler.partial_fit(X)
+        clf.partial_fit(scaler.transform(X), y, classes=[0, 1])
+        n_trained += len(y)
+        wins += float(y.sum())
+
+    if not n_trained:
+        return {"error": "No closing fills to train on"}
+    return {
+        "model": make_pipeline(scaler, clf),
+        "features": TRADE_FEATURES,
+        "n_fills": n_fills,
+        "n_labelled": n_labelled,
+        "n_trained": n_trained,
+        "n_late_fills": state.late_fills,
+        "base_rate": wins / n_trained,
+        "progressive_accuracy": correct / n_scored if n_scored else np.nan,
+        "progressive_log_loss": log_loss / n_scored if n_scored else np.nan,
+        "coefficients": dict(zip(TRADE_FEATURES, clf.coef_[0])),
+    }
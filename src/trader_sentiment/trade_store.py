@@ -0,0 +1,253 @@
+"""Day-partitioned Parquet copy of the raw trades, sorted by account, with an account index.
+
+    python -m src.trader_sentiment.trade_store --trades data/raw/hyperliquid_trades.csv
+
+Layout (Hive style)::
+
+    <root>/date=2024-01-01/part-0.parquet   # that day's fills, sorted by account then time
+    <root>/_account_index.parquet           # account, date, row_start, row_stop
+    <root>/_store.json                      # source fingerprint, row count, columns
+
+``TradeStore`` reads only the partitions inside a date range, and for account filters
+only the row groups holding that account's rows.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .cache import source_fingerprint
+from .data_loader import DEFAULT_CHUNKSIZE, iter_trades
+from .profiling import instrument, stage
+
+INDEX_FILE = "_account_index.parquet"
+META_FILE = "_store.json"
+STAGING_DIR = "_staging"
+PART_FILE = "part-0.parquet"
+# Small enough that one account's rows on a day decode a group or two, not the whole day
+DEFAULT_ROW_GROUP_SIZE = 4_096
+
+
+def account_ranges(accounts) -> dict:
+    """``{account: (start, stop)}`` row ranges of an account-sorted sequence, for O(1) slicing."""
+    values = np.asarray(accounts, dtype=object)
+    if not len(values):
+        return {}
+    starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+    stops = np.r_[starts[1:], len(values)]
+    return {values[lo]: (int(lo), int(hi)) for lo, hi in zip(starts, stops)}
+
+
+def _partition(root: Path, day) -> Path:
+    return root / f"date={pd.Timestamp(day):%Y-%m-%d}"
+
+
+def _source_columns(trades_path: str) -> list[str]:
+    if str(trades_path).endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        names = pq.ParquetFile(trades_path).schema_arrow.names
+    else:
+        names = pd.read_csv(trades_path, nrows=0).columns
+    return [c.strip().lower() for c in names]
+
+
+@instrument()
+def write_trade_store(
+    trades_path: str,
+    root: str,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+) -> dict:
+    """Convert a trades file into a day-partitioned store under ``root`` (replacing any existing one).
+
+    Chunks are streamed from ``iter_trades`` and spilled per day; each day is then sorted
+    by account and time and written as one file of ``row_group_size``-row groups, so
+    memory is bounded by one chunk or one day, whichever is larger. Returns the metadata.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    out = Path(root)
+    tmp = out.with_name(out.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    staging = tmp / STAGING_DIR
+
+    time_col = None
+    for i, chunk in enumerate(iter_trades(trades_path, chunksize=chunksize, columns=_source_columns(trades_path))):
+        time_col = next((c for c in ("timestamp", "time", "ts") if c in chunk.columns), None)
+        with stage("spill_trade_chunk", rows_in=len(chunk)):
+            for day, part in chunk.groupby("date", sort=False):
+                path = _partition(staging, day)
+                path.mkdir(parents=True, exist_ok=True)
+                part.drop(columns="date").to_parquet(path / f"chunk-{i}.parquet", index=False)
+
+    sort_keys = [("account", "ascending")] + ([(time_col, "ascending")] if time_col else [])
+    index_parts = []
+    n_rows = 0
+    for spill in sorted(staging.glob("date=*")) if staging.exists() else []:
+        with stage("write_trade_partition") as s:
+            tables = [pq.read_table(f) for f in sorted(spill.glob("*.parquet"))]
+            table = pa.concat_tables(tables, promote_options="permissive").sort_by(sort_keys)
+            target = tmp / spill.name
+            target.mkdir(parents=True)
+            pq.write_table(table, target / PART_FILE, row_group_size=row_group_size)
+            ranges = account_ranges(table.column("account").to_numpy(zero_copy_only=False))
+            index_parts.append(pd.DataFrame({
+                "account": list(ranges),
+                "date": pd.Timestamp(spill.name.split("=", 1)[1]),
+                "row_start": [lo for lo, _ in ranges.values()],
+                "row_stop": [hi for _, hi in ranges.values()],
+            }))
+            n_rows += table.num_rows
+            s.rows_out = table.num_rows
+    shutil.rmtree(staging, ignore_errors=True)
+
+    index = pd.concat(index_parts, ignore_index=True) if index_parts else pd.DataFrame(
+        {"account": [], "date": [], "row_start": [], "row_stop": []}
+    )
+    index["date"] = pd.to_datetime(index["date"]).astype("datetime64[ms]")
+    index = index.sort_values(["account", "date"], kind="stable").reset_index(drop=True)
+    tmp.mkdir(parents=True, exist_ok=True)
+    index.to_parquet(tmp / INDEX_FILE, index=False)
+    meta = {
+        "source": source_fingerprint([trades_path]),
+        "rows": n_rows,
+        "days": len(index_parts),
+        "accounts": int(index["account"].nunique()),
+        "time_column": time_col,
+        "row_group_size": row_group_size,
+    }
+    (tmp / META_FILE).write_text(json.dumps(meta, indent=2))
+
+    # Swap the finished store in by renames: the old one is moved aside and only deleted
+    # afterwards, so ``root`` never holds a partly written or partly deleted store. It is
+    # missing between the two renames, and readers still open on the old store lose it
+    # once it is deleted.
+    old = out.with_name(out.name + ".old")
+    shutil.rmtree(old, ignore_errors=True)
+    if out.exists():
+        os.replace(out, old)
+    os.replace(tmp, out)
+    shutil.rmtree(old, ignore_errors=True)
+    return meta
+
+
+class TradeStore:
+    """Reader for a store written by ``write_trade_store``.
+
+    ``read`` prunes by date through the partition directories and by account through the
+    index: an account's fills on a day are one contiguous row range, so only the row
+    groups overlapping it are decoded.
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self.meta = json.loads((self.root / META_FILE).read_text())
+        self.index = pd.read_parquet(self.root / INDEX_FILE)
+        self._ranges = account_ranges(self.index["account"])
+        self._footers: dict[Path, tuple] = {}
+
+    @staticmethod
+    def exists(root: str) -> bool:
+        return (Path(root) / META_FILE).exists()
+
+    def is_current(self, trades_path: str) -> bool:
+        """Whether the store was built from ``trades_path`` as it is now."""
+        return self.meta["source"] == source_fingerprint([trades_path])
+
+    @property
+    def days(self) -> list[pd.Timestamp]:
+        return sorted(pd.Timestamp(p.name.split("=", 1)[1]) for p in self.root.glob("date=*"))
+
+    def accounts(self) -> list:
+        return list(self._ranges)
+
+    def _footer(self, path: Path) -> tuple:
+        """A file's Parquet metadata and cumulative row-group row counts, read once."""
+        if path not in self._footers:
+            import pyarrow.parquet as pq
+
+            md = pq.read_metadata(path)
+            sizes = [md.row_group(i).num_rows for i in range(md.num_row_groups)]
+            self._footers[path] = md, np.r_[0, np.cumsum(sizes)]
+        return self._footers[path]
+
+    def _read_range(self, path: Path, start: int, stop: int, columns: list[str] | None):
+        import pyarrow.parquet as pq
+
+        metadata, offsets = self._footer(path)
+        first = int(np.searchsorted(offsets, start, side="right")) - 1
+        last = int(np.searchsorted(offsets, stop, side="left"))
+        table = pq.ParquetFile(path, metadata=metadata).read_row_groups(list(range(first, last)), columns=columns)
+        return table.slice(start - offsets[first], stop - start)
+
+    @staticmethod
+    def _in_range(days: pd.Series, start, end) -> np.ndarray:
+        mask = np.ones(len(days), dtype=bool)
+        if start is not None:
+            mask &= np.asarray(days >= pd.Timestamp(start))
+        if end is not None:
+            mask &= np.asarray(days <= pd.Timestamp(end))
+        return mask
+
+    @instrument("read_trade_store")
+    def read(self, start=None, end=None, accounts=None, columns: list[str] | None = None) -> pd.DataFrame:
+        """Fills with ``start <= date <= end`` (either may be None), optionally only for ``accounts``.
+
+        Rows come back ordered by date, then account and time, with the ``date`` partition
+        key as a column.
+        """
+        import pyarrow as pa
+
+        pieces = []
+        if accounts is not None:
+            spans = [self.index.iloc[lo:hi] for lo, hi in (self._ranges.get(a, (0, 0)) for a in accounts)]
+            hits = pd.concat(spans) if spans else self.index.iloc[:0]
+            hits = hits[self._in_range(hits["date"], start, end)].sort_values(["date", "account"], kind="stable")
+            for day, row_start, row_stop in hits[["date", "row_start", "row_stop"]].itertuples(index=False):
+                table = self._read_range(_partition(self.root, day) / PART_FILE, row_start, row_stop, columns)
+                pieces.append((day, table))
+        else:
+            import pyarrow.parquet as pq
+
+            days = pd.Series(self.days, dtype="datetime64[ms]")
+            for day in days[self._in_range(days, start, end)]:
+                pieces.append((day, pq.read_table(_partition(self.root, day) / PART_FILE, columns=columns)))
+
+        if not pieces:
+            return pd.DataFrame(columns=[*(columns or []), "date"])
+        table = pa.concat_tables([t for _, t in pieces], promote_options="permissive")
+        df = table.to_pandas()
+        df["date"] = np.repeat(
+            np.array([d for d, _ in pieces], dtype="datetime64[ms]"), [t.num_rows for _, t in pieces]
+        )
+        return df
+
+    def trader(self, account, start=None, end=None, columns: list[str] | None = None) -> pd.DataFrame:
+        """One account's fills, located through the index."""
+        return self.read(start=start, end=end, accounts=[account], columns=columns)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Convert the raw trades into a day-partitioned Parquet store.")
+    parser.add_argument("--trades", default="data/raw/hyperliquid_trades.csv")
+    parser.add_argument("--out", default="data/processed/trade_store")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--row-group-size", type=int, default=DEFAULT_ROW_GROUP_SIZE)
+    args = parser.parse_args(argv)
+
+    meta = write_trade_store(args.trades, args.out, chunksize=args.chunksize, row_group_size=args.row_group_size)
+    print(f"{meta['rows']:,} fills, {meta['accounts']:,} accounts, {meta['days']:,} days -> {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def raw_trades():
+    rng = np.random.default_rng(7)
+    n = 2_000
+    df = pd.DataFrame({
+        "account": rng.choice(["A", "B", "C", "D"], size=n),
+        "date": pd.to_datetime("2024-01-01") + pd.to_timedelta(rng.integers(0, 20, size=n), unit="D"),
+        "closed pnl": rng.normal(0, 50, size=n).round(0),
+        "size usd": rng.normal(0, 1_000, size=n),
+        "side": rng.choice(["BUY", "SELL", "Long", "short"], size=n),
+        "leverage": rng.integers(1, 20, size=n).astype(float),
+        "fee": rng.random(size=n),
+    })
+    df["date"] = df["date"].dt.date
+    # Sprinkle gaps so the NaN/min_count semantics are exercised
+    df.loc[df.sample(frac=0.05, random_state=1).index, "closed pnl"] = np.nan
+    df.loc[df.sample(frac=0.05, random_state=2).index, "side"] = np.nan
+    df.loc[df.sample(frac=0.05, random_state=3).index, "leverage"] = np.nan
+    # One account-day with no PnL or fee at all
+    only = df.index[(df["account"] == "D") & (df["date"] == df["date"].min())]
+    df.loc[only, ["closed pnl", "fee"]] = np.nan
+    return df
+
+
+@pytest.fixture
+def trades_csv(tmp_path, raw_trades):
+    # Raw export layout: title-case headers, epoch-ms timestamps and columns we never aggregate
+    ts = pd.to_datetime(raw_trades["date"]).astype("datetime64[ms]").astype("int64") + 3_600_000
+    raw = raw_trades.drop(columns=["date"]).rename(columns=str.title).assign(
+        Timestamp=ts, Coin="BTC", **{"Transaction Hash": "0xabc"}
+    )
+    path = tmp_path / "hyperliquid_trades.csv"
+    raw.to_csv(path, index=False)
+    fng = pd.DataFrame({
+        "date": pd.date_range("2024-01-01", periods=20).strftime("%Y-%m-%d"),
+        "classification": ["Fear", "Greed", "Extreme Fear", "Neutral"] * 5,
+    })
+    fng.to_csv(tmp_path / "fear_greed.csv", index=False)
+    return path
+
+
+@pytest.fixture
+def fear_greed_csv(trades_csv):
+    return trades_csv.parent / "fear_greed.csv"
+
+
+@pytest.fixture
+def daily_df(request):
+    """Synthetic account-day frame in the shape of ``build_daily_join``'s output.
+
+    Parametrise indirectly to vary it, e.g.
+    ``@pytest.mark.parametrize("daily_df", [{"n_days": 30}], indirect=True)``. Options:
+    ``seed``, ``n_accounts``, ``n_days``, ``missing_days`` (fraction of account-days
+    dropped), ``missing_leverage`` (fraction of blank leverages) and ``shuffled``.
+    """
+    options = {
+        "seed": 5, "n_accounts": 12, "n_days": 60, "missing_days": 0.0, "missing_leverage": 0.0, "shuffled": False,
+        **getattr(request, "param", {}),
+    }
+    rng = np.random.default_rng(options["seed"])
+    n_accounts, n_days = options["n_accounts"], options["n_days"]
+    n = n_accounts * n_days
+    df = pd.DataFrame({
+        "account": np.repeat([f"acct{i}" for i in range(n_accounts)], n_days),
+        "date": np.tile(pd.date_range("2024-01-01", periods=n_days), n_accounts),
+        "total_pnl": rng.normal(0, 100, n),
+        "volume_usd": rng.lognormal(8, 1, n),
+        "trades": rng.integers(1, 50, n).astype(float),
+        "sentiment_score": np.tile(rng.integers(0, 5, n_days), n_accounts).astype(float),
+        "avg_leverage": rng.integers(1, 10, n).astype(float),
+    })
+    df.loc[df.sample(frac=options["missing_leverage"], random_state=1).index, "avg_leverage"] = np.nan
+    df = df.drop(df.sample(frac=options["missing_days"], random_state=2).index)
+    return df.sample(frac=1, random_state=3) if options["shuffled"] else df
@@ -1,7 +1,19 @@
+import numpy as np
 import pandas as pd
 import pytest
 
-from src.trader_sentiment.analysis import analyze_correlations, cluster_traders
+from src.trader_sentiment.analysis import (
+    analyze_correlations,
+    build_trader_profile,
+    calculate_max_drawdown,
+    calculate_risk_metrics,
+    calculate_sharpe_ratio,
+    calculate_sortino_ratio,
+    cluster_traders,
+    fit_trader_clusters,
+    rolling_risk_metrics,
+    select_n_clusters,
+)
 
 
 @pytest.fixture
@@ -29,3 +41,120 @@ def test_cluster_traders(sample_df):
     clusters = cluster_traders(sample_df, n_clusters=2)
     assert "cluster" in clusters.columns
     assert len(clusters) == 3  # 3 unique accounts
+
+
+def test_calculate_risk_metrics_matches_per_account(sample_df):
+    metrics = calculate_risk_metrics(sample_df)
+    assert list(metrics.index) == ["A", "B", "C"]
+    for account, trader_df in sample_df.groupby("account"):
+        returns = trader_df.sort_values("date")["total_pnl"]
+        row = metrics.loc[account]
+        assert row["total_pnl"] == returns.sum()
+        assert row["sharpe_ratio"] == pytest.approx(calculate_sharpe_ratio(returns), nan_ok=True)
+        assert row["sortino_ratio"] == pytest.approx(calculate_sortino_ratio(returns), nan_ok=True)
+        assert row["max_drawdown"] == pytest.approx(calculate_max_drawdown(returns.cumsum()))
+
+
+def test_calculate_max_drawdown_non_positive_peak():
+    assert calculate_max_drawdown(pd.Series([-10.0, -20.0, -5.0])) == 0.0
+    assert calculate_max_drawdown(pd.Series([0.0, 100.0, 50.0])) == pytest.approx(-0.5)
+    losing_start = pd.DataFrame({"account": "A", "date": [1, 2, 3], "total_pnl": [-10.0, -10.0, 15.0]})
+    metrics = calculate_risk_metrics(losing_start)
+    assert metrics.loc["A", "max_drawdown"] == 0.0
+    assert metrics.loc["A", "max_drawdown_usd"] == -10.0
+
+
+def test_rolling_risk_metrics_matches_window_slices():
+    rng = np.random.default_rng(0)
+    days = pd.date_range("2024-01-01", periods=60)
+    frames = []
+    for account in ["A", "B", "C"]:
+        # Irregular trading calendars so windows span missing days
+        picked = np.sort(rng.choice(len(days), size=35, replace=False))
+        frames.append(pd.DataFrame({"account": account, "date": days[picked].date, "total_pnl": rng.normal(5, 50, 35)}))
+    df = pd.concat(frames).sample(frac=1.0, random_state=0)
+
+    out = rolling_risk_metrics(df, windows=(7, 30))
+    assert len(out) == len(df)
+    for _, row in out.sample(25, random_state=1).iterrows():
+        history = df[df["account"] == row["account"]].sort_values("date")
+        for w in (7, 30):
+            lo = row["date"] - pd.Timedelta(days=w - 1)
+            window = history[(history["date"] >= lo) & (history["date"] <= row["date"])]["total_pnl"]
+            assert row[f"days_{w}d"] == len(window)
+            assert row[f"sharpe_{w}d"] == pytest.approx(calculate_sharpe_ratio(window), nan_ok=True)
+            assert row[f"sortino_{w}d"] == pytest.approx(calculate_sortino_ratio(window), nan_ok=True)
+            cumulative = history[history["date"] <= row["date"]]["total_pnl"].cumsum()
+            peak = cumulative.iloc[-len(window):].max()
+            expected = (cumulative.iloc[-1] - peak) / peak if peak > 0 else 0.0
+            assert row[f"drawdown_{w}d"] == pytest.approx(expected)
+
+
+def test_rolling_risk_metrics_without_dates():
+    df = pd.DataFrame({
+        "account": ["A", "A", "A", "B"],
+        "date": pd.to_datetime(["2024-01-01", None, "2024-01-03", None]),
+        "total_pnl": [10.0, 99.0, -5.0, 1.0],
+    })
+    out = rolling_risk_metrics(df, windows=(7,))
+    assert list(out["account"]) == ["A", "A"]
+    assert list(out["days_7d"]) == [1, 2]
+
+    empty = rolling_risk_metrics(df.iloc[:0], windows=(7,))
+    assert empty.empty
+    assert list(empty.columns) == ["account", "date", "sharpe_7d", "sortino_7d", "drawdown_7d", "days_7d"]
+    assert rolling_risk_metrics(df[df["account"] == "B"], windows=(7,)).empty
+
+
+@pytest.fixture
+def blob_daily():
+    # Three well separated trader archetypes
+    rng = np.random.default_rng(1)
+    rows = []
+    for i in range(300):
+        kind = i % 3
+        pnl, volume, win = [(-500, 1e3, 2), (50, 1e5, 15), (5_000, 1e7, 28)][kind]
+        rows.append({
+            "account": f"acct{i}",
+            "total_pnl": pnl * rng.uniform(0.9, 1.1),
+            "volume_usd": volume * rng.uniform(0.9, 1.1),
+            "trades": 30,
+            "winning_trades": win,
+            "losing_trades": 30 - win,
+        })
+    return pd.DataFrame(rows)
+
+
+def test_select_n_clusters_finds_archetypes(blob_daily):
+    profile = build_trader_profile(blob_daily)
+    best, scores = select_n_clusters(profile, k_values=range(2, 7), sample_size=200, n_jobs=2)
+    assert best == 3
+    assert list(scores.index) == [2, 3, 4, 5, 6]
+    assert select_n_clusters(profile, k_values=range(2, 7), metric="inertia", n_jobs=1)[0] == 3
+
+
+def test_select_n_clusters_without_defined_silhouette(blob_daily, monkeypatch):
+    from src.trader_sentiment import analysis
+
+    inertia = {2: 100.0, 3: 20.0, 4: 15.0, 5: 12.0}
+    monkeypatch.setattr(
+        analysis, "_score_k", lambda X, k, seed: {"k": k, "inertia": inertia[k], "silhouette": np.nan}
+    )
+    best, scores = select_n_clusters(build_trader_profile(blob_daily), k_values=range(2, 6), n_jobs=1)
+    assert best == 3
+    assert scores["silhouette"].isna().all()
+    with pytest.raises(ValueError):
+        select_n_clusters(build_trader_profile(blob_daily), metric="gap", n_jobs=1)
+
+
+def test_cluster_model_assigns_new_accounts(blob_daily):
+    profile = build_trader_profile(blob_daily)
+    seen = profile.sample(240, random_state=0)
+    model = fit_trader_clusters(seen, n_clusters=3, method="minibatch")
+    assert (model.assign(seen).to_numpy() == model.kmeans.labels_).all()
+
+    # Unseen accounts land in the cluster of the archetype they were generated from
+    labels = model.assign(profile)
+    kind = profile.index.str.removeprefix("acct").astype(int) % 3
+    assert labels.groupby(kind).nunique().eq(1).all()
+    assert labels.groupby(kind).first().nunique() == 3
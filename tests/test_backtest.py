@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.trader_sentiment.backtest import walk_forward_folds, walk_forward_win_probability
+
+
+def test_folds_are_time_ordered_with_embargo():
+    dates = pd.Series(pd.date_range("2024-01-01", periods=30).repeat(3))
+    folds = walk_forward_folds(dates, n_folds=4, embargo_days=2)
+    assert len(folds) == 4
+    tested = []
+    for train, test in folds:
+        # Every training row ends more than the embargo before the test window opens
+        assert (dates[test].min() - dates[train].max()).days > 2
+        tested.append(test)
+    tested = np.concatenate(tested)
+    # Test windows do not overlap and cover everything after the first block
+    assert len(tested) == len(np.unique(tested))
+    assert dates[tested].min() > dates.min()
+    assert dates[tested].max() == dates.max()
+
+
+def test_folds_purge_training_labels_of_sparse_accounts():
+    # Sporadic traders: the next trading day, where the target lives, is often weeks away
+    rng = np.random.default_rng(9)
+    days = pd.date_range("2024-01-01", periods=120)
+    df = pd.concat([
+        pd.DataFrame({"account": f"acct{i}", "date": np.sort(rng.choice(days, size=20, replace=False))})
+        for i in range(50)
+    ], ignore_index=True)
+    label_dates = df.groupby("account")["date"].shift(-1)
+
+    purged = walk_forward_folds(df["date"], n_folds=4, embargo_days=1, label_dates=label_dates)
+    calendar = walk_forward_folds(df["date"], n_folds=4, embargo_days=1)
+    for (train, test), (calendar_train, _) in zip(purged, calendar):
+        test_start = df["date"][test].min()
+        assert (test_start - label_dates[train].max()).days > 1
+        assert label_dates[train].notna().all()
+        assert set(train) < set(calendar_train)
+        # The calendar-day embargo alone lets labels from the test window into training
+        assert (label_dates[calendar_train] >= test_start).any()
+
+
+def test_folds_need_enough_distinct_dates():
+    with pytest.raises(ValueError):
+        walk_forward_folds(pd.Series(pd.date_range("2024-01-01", periods=3)), n_folds=5)
+
+
+def test_parallel_folds_match_serial(daily_df):
+    serial = walk_forward_win_probability(daily_df, n_folds=3, n_jobs=1, n_estimators=20)
+    parallel = walk_forward_win_probability(daily_df, n_folds=3, n_jobs=2, n_estimators=20)
+
+    pd.testing.assert_frame_equal(serial["folds"], parallel["folds"])
+    assert serial["oos_auc"] == parallel["oos_auc"]
+    assert len(serial["folds"]) == 3
+    assert (serial["folds"]["test_start"] > serial["folds"]["train_end"]).all()
+    assert (serial["folds"]["test_start"] > serial["folds"]["train_label_end"]).all()
+    assert serial["accuracy"] == pytest.approx(serial["folds"]["accuracy"].mean())
+
+
+def test_too_little_history_reports_error(daily_df):
+    assert "error" in walk_forward_win_probability(daily_df.head(30), n_jobs=1)
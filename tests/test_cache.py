@@ -0,0 +1,38 @@
+import os
+
+import pandas as pd
+
+from src.trader_sentiment import cache
+from src.trader_sentiment.analysis import build_daily_join
+
+
+def test_cached_daily_join_round_trip(trades_csv, fear_greed_csv, tmp_path, monkeypatch):
+    processed = tmp_path / "processed"
+    first = cache.cached_daily_join(str(trades_csv), str(fear_greed_csv), str(processed))
+    pd.testing.assert_frame_equal(first, build_daily_join(str(trades_csv), str(fear_greed_csv)))
+    assert len(list(processed.glob("daily_join-*/daily_join.parquet"))) == 1
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cache hit expected")
+
+    monkeypatch.setattr(cache, "build_daily_join", fail)
+    pd.testing.assert_frame_equal(cache.cached_daily_join(str(trades_csv), str(fear_greed_csv), str(processed)), first)
+
+
+def test_cached_daily_join_invalidates_on_source_change(trades_csv, fear_greed_csv, tmp_path):
+    processed = tmp_path / "processed"
+    before = cache.cached_daily_join(str(trades_csv), str(fear_greed_csv), str(processed))
+
+    trades = pd.read_csv(trades_csv)
+    trades.iloc[: len(trades) // 2].to_csv(trades_csv, index=False)
+    after = cache.cached_daily_join(str(trades_csv), str(fear_greed_csv), str(processed))
+
+    assert after["trades"].sum() < before["trades"].sum()
+    # The stale entry is pruned
+    assert len(os.listdir(processed)) == 1
+
+
+def test_source_fingerprint_tracks_pipeline_version(trades_csv, monkeypatch):
+    key = cache.source_fingerprint([str(trades_csv)], hash_content=True)
+    monkeypatch.setattr(cache, "PIPELINE_VERSION", cache.PIPELINE_VERSION + 1)
+    assert cache.source_fingerprint([str(trades_csv)], hash_content=True) != key
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.trader_sentiment.analysis import analyze_correlations, build_daily_join
+from src.trader_sentiment.covariance import CovarianceAccumulator, GroupedCovariance, iter_frame_batches
+from src.trader_sentiment.data_loader import load_fear_greed, load_trades
+from src.trader_sentiment.incremental import DailyJoinState
+from src.trader_sentiment.parallel import parallel_correlations
+
+
+@pytest.fixture
+def daily(trades_csv, fear_greed_csv):
+    df = build_daily_join(str(trades_csv), str(fear_greed_csv))
+    df.loc[df.index[:5], "classification"] = np.nan
+    df.loc[df.index[7], "long_bias"] = np.inf
+    return df
+
+
+def chunks(df, n):
+    bounds = np.linspace(0, len(df), n + 1).astype(int)
+    return [df.iloc[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+
+def per_class(df):
+    numeric = df.select_dtypes(include=[np.number]).columns
+    classes = sorted(df["classification"].dropna().unique())
+    out = {c: df.loc[df["classification"] == c, numeric].corr() for c in classes}
+    out[None] = df.loc[df["classification"].isna(), numeric].corr()
+    return pd.concat(out, names=["classification", None])
+
+
+def test_streamed_correlations_match_in_memory(daily, tmp_path):
+    expected = analyze_correlations(daily)
+    pd.testing.assert_frame_equal(analyze_correlations(chunks(daily, 7)), expected, atol=1e-12)
+    pd.testing.assert_frame_equal(analyze_correlations(daily, by="classification"), per_class(daily), atol=1e-12)
+
+    path = tmp_path / "daily.parquet"
+    daily.to_parquet(path, index=False)
+    streamed = analyze_correlations(iter_frame_batches(str(path), batch_rows=13), by="classification")
+    pd.testing.assert_frame_equal(streamed, per_class(daily), atol=1e-12)
+
+    acc = CovarianceAccumulator.from_frame(daily)
+    numeric = daily.select_dtypes(include=[np.number])
+    pd.testing.assert_frame_equal(acc.cov(), numeric.cov(), rtol=1e-10)
+
+
+def test_merge_subtract_and_parallel_partitions(daily):
+    head, tail = daily.iloc[:40], daily.iloc[40:]
+    a, b = CovarianceAccumulator.from_frame(head), CovarianceAccumulator.from_frame(tail)
+    pd.testing.assert_frame_equal((a + b).subtract(b).corr(), analyze_correlations(head), atol=1e-10)
+    with pytest.raises(ValueError):
+        a.subtract(a + b)
+
+    grouped = parallel_correlations(daily, by="classification", n_jobs=2)
+    pd.testing.assert_frame_equal(grouped.corr_by_group(), per_class(daily), atol=1e-12)
+    pd.testing.assert_frame_equal(grouped.corr(["fear", np.nan]), analyze_correlations(
+        daily[daily["classification"].isin(["fear", np.nan])]
+    ), atol=1e-12)
+    pd.testing.assert_frame_equal(
+        parallel_correlations(daily, n_jobs=2).corr(), analyze_correlations(daily), atol=1e-12
+    )
+
+
+def test_incremental_state_keeps_correlations_current(trades_csv, fear_greed_csv, tmp_path):
+    trades = load_trades(str(trades_csv)).sort_values("timestamp", kind="stable").reset_index(drop=True)
+    fng = load_fear_greed(str(fear_greed_csv))
+    state = DailyJoinState.from_trades(trades.iloc[:1_500], fng, correlations=True)
+    for batch in chunks(trades.iloc[1_500:].sample(frac=1.0, random_state=0), 3):
+        state = state.update(batch, fng)
+
+    expected = analyze_correlations(state.joined, by="classification")
+    pd.testing.assert_frame_equal(state.correlations.corr_by_group(), expected, atol=1e-10)
+
+    state.save(str(tmp_path / "state"))
+    reloaded = DailyJoinState.load(str(tmp_path / "state"))
+    assert isinstance(reloaded.correlations, GroupedCovariance)
+    pd.testing.assert_frame_equal(reloaded.correlations.corr_by_group(), expected, atol=1e-10)
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.trader_sentiment.analysis import analyze_correlations, build_daily_join, build_trader_profile
+from src.trader_sentiment.cube import SentimentCube
+
+
+@pytest.fixture(params=[False, True], ids=["full", "compact"])
+def daily(request, trades_csv, fear_greed_csv):
+    df = build_daily_join(str(trades_csv), str(fear_greed_csv), compact=request.param)
+    # One day without a sentiment match, and an infinite value corr must skip
+    unmatched = df["date"] == df["date"].max()
+    df.loc[unmatched, ["classification", "sentiment_score"]] = np.nan
+    df.loc[df.index[3], "long_bias"] = np.inf
+    return df
+
+
+SELECTIONS = [None, ["fear"], ["greed", "extreme fear"], ["neutral", np.nan], []]
+
+
+@pytest.mark.parametrize("selected", SELECTIONS)
+def test_cube_matches_filtered_frame(daily, selected):
+    cube = SentimentCube.from_daily(daily)
+    filtered = daily if selected is None else daily[daily["classification"].isin(selected)]
+
+    pd.testing.assert_frame_equal(cube.corr(selected), analyze_correlations(filtered), atol=1e-10)
+
+    kpis = cube.kpis(selected)
+    assert kpis["total_trades"] == filtered["trades"].sum()
+    assert kpis["total_volume"] == pytest.approx(filtered["volume_usd"].sum(), rel=1e-12)
+    assert kpis["total_pnl"] == pytest.approx(filtered["total_pnl"].sum(), rel=1e-12, abs=1e-9)
+    assert kpis["avg_leverage"] == pytest.approx(filtered["avg_leverage"].mean(), nan_ok=True)
+
+    profile = cube.trader_profile(selected)
+    expected = build_trader_profile(filtered)
+    pd.testing.assert_frame_equal(
+        profile.set_axis(profile.index.astype(str)),
+        expected.set_axis(expected.index.astype(str)),
+        check_dtype=False,
+    )
@@ -0,0 +1,120 @@
+import pandas as pd
+import pytest
+
+from src.trader_sentiment.data_loader import (
+    align_with_sentiment,
+    daily_trader_agg,
+    daily_trader_agg_chunked,
+    detect_timestamp_format,
+    iter_trades,
+    load_trades,
+    parse_timestamps,
+    to_day,
+)
+
+
+def legacy_daily_trader_agg(df: pd.DataFrame) -> pd.DataFrame:
+    """The original groupby/apply implementation, kept as the reference for equivalence."""
+    cols = set(df.columns)
+    pnl_col = next((c for c in ["closed pnl", "closedpnl", "pnl", "realizedpnl"] if c in cols), None)
+    size_usd_col = next((c for c in ["size usd", "size_usd", "notional"] if c in cols), None)
+    size_col = next((c for c in ["size tokens", "size", "qty", "quantity"] if c in cols), None)
+    side_col = next((c for c in ["side", "direction"] if c in cols), None)
+    lev_col = "leverage" if "leverage" in cols else None
+    fee_col = "fee" if "fee" in cols else None
+
+    def long_bias(s: pd.Series) -> float:
+        if s.empty:
+            return 0.0
+        longs = (s.str.lower() == "buy") | (s.str.lower() == "long")
+        return float(longs.mean())
+
+    group_keys = [c for c in ["account", "date"] if c in cols]
+    g = df.groupby(group_keys, dropna=False)
+    out = pd.DataFrame()
+    out["trades"] = g.size()
+    if pnl_col:
+        out["total_pnl"] = g[pnl_col].sum(min_count=1)
+        out["avg_pnl_per_trade"] = g[pnl_col].mean()
+        out["winning_trades"] = g[pnl_col].apply(lambda x: (x > 0).sum())
+        out["losing_trades"] = g[pnl_col].apply(lambda x: (x < 0).sum())
+    if size_usd_col:
+        out["volume_usd"] = g[size_usd_col].apply(lambda x: x.abs().sum())
+    elif size_col:
+        out["volume"] = g[size_col].apply(lambda x: x.abs().sum())
+    if side_col:
+        out["long_bias"] = g[side_col].apply(long_bias)
+    if lev_col:
+        out["avg_leverage"] = g[lev_col].mean()
+    if fee_col:
+        out["total_fees"] = g[fee_col].sum(min_count=1)
+    return out.reset_index()
+
+
+def test_daily_trader_agg_matches_legacy(raw_trades):
+    pd.testing.assert_frame_equal(daily_trader_agg(raw_trades), legacy_daily_trader_agg(raw_trades))
+
+
+def test_daily_trader_agg_size_fallback(raw_trades):
+    trades = raw_trades.drop(columns=["size usd", "leverage", "fee"]).assign(size=raw_trades["size usd"] / 100)
+    out = daily_trader_agg(trades)
+    pd.testing.assert_frame_equal(out, legacy_daily_trader_agg(trades))
+    assert "volume" in out.columns and "volume_usd" not in out.columns
+
+
+def test_iter_trades_reads_only_agg_columns(trades_csv):
+    chunks = list(iter_trades(str(trades_csv), chunksize=300))
+    assert len(chunks) == 7
+    expected = {"account", "closed pnl", "size usd", "side", "leverage", "fee", "timestamp", "date"}
+    assert set(chunks[0].columns) == expected
+    assert chunks[0]["closed pnl"].dtype == "float64"
+
+
+def test_daily_trader_agg_chunked_matches_in_memory(trades_csv):
+    expected = daily_trader_agg(load_trades(str(trades_csv)))
+    pd.testing.assert_frame_equal(daily_trader_agg_chunked(str(trades_csv), chunksize=300), expected)
+
+
+def test_align_with_sentiment_sorted_lookup():
+    agg = pd.DataFrame({
+        "account": ["A", "A", "B", "B"],
+        "date": to_day(["2024-01-03", "2024-01-01", "2024-01-02", None]),
+        "total_pnl": [1.0, 2.0, 3.0, 4.0],
+    })
+    fng = pd.DataFrame({
+        # Unsorted, one duplicate day (last wins) and no entry for 2024-01-02
+        "date": to_day(["2024-01-03", "2024-01-01", "2023-12-31", "2024-01-03"]),
+        "classification": ["fear", "greed", "neutral", "extreme fear"],
+    })
+    out = align_with_sentiment(agg, fng)
+    assert out["classification"].tolist()[:2] == ["extreme fear", "greed"]
+    assert out["classification"].iloc[2:].isna().all()
+    pd.testing.assert_frame_equal(out.drop(columns="classification"), agg)
+
+
+def test_dates_are_compact_day_keys(trades_csv):
+    trades = load_trades(str(trades_csv))
+    assert trades["date"].dtype == "datetime64[ms]"
+    assert (trades["date"] == trades["date"].dt.normalize()).all()
+
+
+@pytest.mark.parametrize(
+    "values, fmt",
+    [
+        (pd.Series([1_733_179_800, 1_733_183_400]), "s"),
+        (pd.Series([1.7331798e12, 1.7331834e12]), "ms"),
+        (pd.Series(["1733179800000", "1733183400000"]), "ms"),
+        (pd.Series([1_733_179_800_000_000, None]), "us"),
+        (pd.Series(["2024-12-02T22:50:00Z", "2024-12-02 23:50:00+00:00"]), "iso8601"),
+        (pd.Series(["02-12-2024 22:50", "02-12-2024 23:50"]), "exchange"),
+    ],
+)
+def test_timestamp_formats_parse_to_same_instant(values, fmt):
+    assert detect_timestamp_format(values) == fmt
+    parsed = parse_timestamps(values)
+    assert parsed.iloc[0] == pd.Timestamp("2024-12-02 22:50", tz="UTC")
+
+
+def test_detect_timestamp_format_unknown():
+    assert detect_timestamp_format(pd.Series(["yesterday", "today"])) is None
+    assert detect_timestamp_format(pd.Series([None, None])) is None
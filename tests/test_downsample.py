@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.trader_sentiment.downsample import downsample_series, lttb, sample_scatter
+
+
+@pytest.fixture
+def skewed_days():
+    rng = np.random.default_rng(3)
+    n = 50_000
+    return pd.DataFrame({
+        "date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365, size=n), unit="D"),
+        "total_pnl": rng.standard_cauchy(size=n),
+        "classification": rng.choice(["fear", "greed", "extreme greed", None], p=[0.6, 0.39, 0.005, 0.005], size=n),
+    })
+
+
+def test_sample_scatter_bounds_payload_and_keeps_extremes(skewed_days):
+    out = sample_scatter(skewed_days, y="total_pnl", max_points=2_000)
+
+    assert len(out) == 2_000
+    assert out.index.is_monotonic_increasing
+    # Rare classes (and missing sentiment) are kept whole instead of being sampled away
+    rare = skewed_days["classification"].isin(["extreme greed"]) | skewed_days["classification"].isna()
+    assert skewed_days.index[rare].isin(out.index).all()
+    for _, group in skewed_days.groupby("classification"):
+        assert group["total_pnl"].idxmax() in out.index
+        assert group["total_pnl"].idxmin() in out.index
+
+    pd.testing.assert_frame_equal(out, sample_scatter(skewed_days, y="total_pnl", max_points=2_000))
+    assert len(sample_scatter(skewed_days.head(100), y="total_pnl", max_points=2_000)) == 100
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    x = np.arange(10_000, dtype=float)
+    y = np.sin(x / 500)
+    y[4_321] = 50.0
+    idx = lttb(x, y, 200)
+
+    assert len(idx) == 200
+    assert idx[0] == 0 and idx[-1] == len(x) - 1
+    assert (np.diff(idx) > 0).all()
+    assert 4_321 in idx
+    np.testing.assert_array_equal(lttb(x[:50], y[:50], 200), np.arange(50))
+    with pytest.raises(ValueError):
+        lttb(x, y, 2)
+
+
+def test_downsample_series_sorts_and_drops_missing():
+    times = pd.date_range("2024-01-01", periods=5_000, freq="s", tz="UTC")
+    df = pd.DataFrame({"time": times, "price": np.linspace(100, 200, 5_000)}).iloc[::-1]
+    df.loc[df.index[10], "price"] = np.nan
+
+    out = downsample_series(df, x="time", y="price", max_points=300)
+    assert len(out) == 300
+    assert out["time"].is_monotonic_increasing
+    assert out["price"].notna().all()
+    assert out["time"].iloc[0] == times[0] and out["time"].iloc[-1] == times[-1]
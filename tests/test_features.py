@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.trader_sentiment import features
+from src.trader_sentiment.analysis import predict_pnl, predict_win_probability
+from src.trader_sentiment.features import FeatureStore
+from src.trader_sentiment.model_registry import ModelRegistry
+
+# Accounts trade on different days, leverage has gaps and rows arrive unsorted
+pytestmark = pytest.mark.parametrize(
+    "daily_df",
+    [{"seed": 11, "n_accounts": 8, "n_days": 40, "missing_days": 0.2, "missing_leverage": 0.05, "shuffled": True}],
+    indirect=True,
+)
+
+
+def test_lags_and_leads_match_groupby_shift(daily_df):
+    store = FeatureStore.from_daily(daily_df)
+    expected = daily_df.sort_values(["account", "date"]).reset_index(drop=True)
+    g = expected.groupby("account")
+
+    pd.testing.assert_frame_equal(store.index, expected[["account", "date"]])
+    assert store.values.dtype == np.float32
+    assert store["prev_sentiment"].flags["C_CONTIGUOUS"]
+    for column, source, periods in [
+        ("prev_sentiment", "sentiment_score", 1),
+        ("prev_leverage", "avg_leverage", 1),
+        ("prev_volume_usd", "volume_usd", 1),
+    ]:
+        np.testing.assert_allclose(store[column], g[source].shift(periods).to_numpy(), rtol=1e-6)
+    # Labels and targets are kept at full precision
+    assert store.targets.dtype == np.float64
+    assert "total_pnl" not in store.columns
+    next_pnl = g["total_pnl"].shift(-1)
+    np.testing.assert_array_equal(store["total_pnl"], expected["total_pnl"].to_numpy())
+    np.testing.assert_array_equal(store["next_day_pnl"], next_pnl.to_numpy())
+    np.testing.assert_array_equal(store["next_day_win"], np.where(next_pnl.isna(), np.nan, next_pnl > 0))
+
+
+def test_cached_store_is_reused_until_the_data_changes(daily_df, tmp_path, monkeypatch):
+    built = FeatureStore.cached(daily_df, str(tmp_path))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("expected the saved store")
+
+    with monkeypatch.context() as m:
+        m.setattr(FeatureStore, "from_daily", fail)
+        loaded = FeatureStore.cached(daily_df, str(tmp_path))
+    assert isinstance(loaded.values, np.memmap)
+    np.testing.assert_array_equal(loaded.values, built.values)
+    np.testing.assert_array_equal(loaded.targets, built.targets)
+    assert loaded.columns == built.columns
+    assert loaded.target_columns == built.target_columns
+
+    changed = daily_df.assign(total_pnl=daily_df["total_pnl"] + 1)
+    assert FeatureStore.cached(changed, str(tmp_path)).version != built.version
+    assert [p.name for p in tmp_path.iterdir()] == [features.data_version(changed)]
+
+
+def test_models_train_from_a_shared_store(daily_df):
+    store = FeatureStore.from_daily(daily_df)
+    win = predict_win_probability(daily_df, store=store)
+    assert win["auc"] == predict_win_probability(daily_df)["auc"]
+    assert list(win["feature_importance"]) == features.WIN_FEATURES
+
+    pnl = predict_pnl(daily_df, store=store)
+    assert list(pnl["feature_importance"]) == features.PNL_FEATURES
+
+
+def test_pnl_model_fits_on_float64_targets(daily_df, tmp_path, monkeypatch):
+    seen = {}
+    fetch_or_train = ModelRegistry.fetch_or_train
+
+    def spy(self, X, y, params, train):
+        seen.update(X=set(X.dtypes), y=y.dtype)
+        return fetch_or_train(self, X, y, params, train)
+
+    monkeypatch.setattr(ModelRegistry, "fetch_or_train", spy)
+    predict_pnl(daily_df, registry=ModelRegistry(str(tmp_path)))
+    assert seen == {"X": {np.dtype("float32")}, "y": np.dtype("float64")}
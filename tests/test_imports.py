@@ -0,0 +1,53 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import src.trader_sentiment as ts
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+LIGHT_MODULES = [
+    "src.trader_sentiment",
+    "src.trader_sentiment.analysis",
+    "src.trader_sentiment.backtest",
+    "src.trader_sentiment.cache",
+    "src.trader_sentiment.cube",
+    "src.trader_sentiment.data_loader",
+    "src.trader_sentiment.incremental",
+    "src.trader_sentiment.model_registry",
+    "src.trader_sentiment.parallel",
+    "src.trader_sentiment.report",
+    "src.trader_sentiment.trade_model",
+    "src.trader_sentiment.trade_store",
+]
+
+
+def _loaded_after(code: str) -> set[str]:
+    # A fresh interpreter: this test process has long since imported sklearn
+    out = subprocess.run(
+        [sys.executable, "-c", f"{code}\nimport sys; print(' '.join(sys.modules))"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    ).stdout
+    return {name.split(".")[0] for name in out.split()}
+
+
+@pytest.mark.parametrize("module", LIGHT_MODULES)
+def test_heavy_dependencies_are_not_imported_eagerly(module):
+    loaded = _loaded_after(f"import {module}")
+    assert not loaded & {"sklearn", "scipy", "joblib", "gdown"}
+
+
+def test_package_exports_resolve_lazily():
+    loaded = _loaded_after(
+        "import src.trader_sentiment as ts\n"
+        "assert 'pandas' not in __import__('sys').modules\n"
+        "assert ts.build_daily_join.__module__ == 'src.trader_sentiment.analysis'\n"
+        "assert ts.cube.SentimentCube is ts.SentimentCube"
+    )
+    assert "sklearn" not in loaded
+
+
+def test_all_lists_every_lazy_export():
+    assert sorted(ts.__all__) == sorted(ts._EXPORTS)
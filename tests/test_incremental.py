@@ -0,0 +1,58 @@
+import pandas as pd
+
+from src.trader_sentiment.analysis import build_daily_join
+from src.trader_sentiment.data_loader import load_fear_greed, load_trades
+from src.trader_sentiment.incremental import DailyJoinState
+
+
+def test_update_matches_full_rebuild(trades_csv, fear_greed_csv, tmp_path):
+    trades = load_trades(str(trades_csv))
+    fng = load_fear_greed(str(fear_greed_csv))
+    # Day-ordered history, then a batch of new days plus late fills for already-closed days
+    trades = trades.sort_values("timestamp", kind="stable").reset_index(drop=True)
+    history = trades.iloc[:1_200]
+    late = trades.iloc[1_200:].sample(frac=1.0, random_state=0)
+
+    state = DailyJoinState.from_trades(history, fng)
+    for batch in (late.iloc[:300], late.iloc[300:301], late.iloc[301:]):
+        state = state.update(batch, fng)
+
+    expected = build_daily_join(str(trades_csv), str(fear_greed_csv))
+    pd.testing.assert_frame_equal(state.joined, expected)
+
+    state.save(str(tmp_path / "state"))
+    reloaded = DailyJoinState.load(str(tmp_path / "state"))
+    pd.testing.assert_frame_equal(reloaded.joined, expected)
+    pd.testing.assert_frame_equal(reloaded.partials, state.partials)
+
+
+def test_update_leaves_untouched_rows_alone(trades_csv, fear_greed_csv):
+    trades = load_trades(str(trades_csv))
+    fng = load_fear_greed(str(fear_greed_csv))
+    state = DailyJoinState.from_trades(trades, fng)
+
+    fill = trades[trades["account"] == "A"].iloc[[0]].assign(**{"closed pnl": 1_000.0})
+    updated = state.update(fill, fng)
+
+    key = (updated.joined["account"] == "A") & (updated.joined["date"] == fill["date"].iloc[0])
+    before = state.joined[key]
+    assert updated.joined.loc[key, "trades"].item() == before["trades"].item() + 1
+    pd.testing.assert_frame_equal(updated.joined[~key], state.joined[~key])
+
+
+def test_update_splices_new_accounts_and_days_in_key_order(trades_csv, fear_greed_csv):
+    trades = load_trades(str(trades_csv))
+    fng = load_fear_greed(str(fear_greed_csv))
+    state = DailyJoinState.from_trades(trades[trades["account"] != "B"], fng)
+
+    # New keys before, between and after existing ones, plus a fill with no account
+    batch = pd.concat([
+        trades[trades["account"] == "B"].sample(frac=1.0, random_state=1),
+        trades.iloc[[0]].assign(account=None),
+        trades.iloc[[1]].assign(account="0-first"),
+        trades.iloc[[2]].assign(account="zz-last"),
+    ])
+    updated = state.update(batch, fng)
+    expected = DailyJoinState.from_trades(pd.concat([trades[trades["account"] != "B"], batch]), fng)
+    pd.testing.assert_frame_equal(updated.joined, expected.joined)
+    pd.testing.assert_frame_equal(updated.partials, expected.partials)
@@ -0,0 +1,114 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.trader_sentiment.live_data import LiveTradeFeed, fetch_recent_trades
+
+
+def _trade(coin, t, px, sz, side, tid):
+    return {"coin": coin, "side": side, "px": str(px), "sz": str(sz), "time": t, "hash": f"0x{t:x}", "tid": tid}
+
+
+@pytest.fixture
+def stand_in_api():
+    """Local stand-in for the Hyperliquid info endpoint; responses are set per coin by the test."""
+    responses = {}
+    requests_seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            requests_seen.append(body)
+            payload = json.dumps(responses.get(body["coin"], [])).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/info", responses, requests_seen
+    server.shutdown()
+
+
+def test_fetch_recent_trades_against_stand_in(stand_in_api):
+    url, responses, _ = stand_in_api
+    responses["BTC"] = [_trade("BTC", 1_700_000_000_000, 100.0, 2.0, "B", 1)]
+    df = fetch_recent_trades("BTC", url=url)
+    assert df["volume_usd"].tolist() == [200.0]
+    assert df["side"].tolist() == ["Buy"]
+
+
+def test_feed_dedupes_buffers_and_aggregates(stand_in_api):
+    url, responses, requests_seen = stand_in_api
+    t0 = 1_700_000_000_000
+    responses["BTC"] = [_trade("BTC", t0 + i, 100.0 + i, 1.0, "B" if i % 2 else "A", i) for i in range(3)]
+    responses["ETH"] = [_trade("ETH", t0, 10.0, 4.0, "A", 7)]
+
+    feed = LiveTradeFeed(["BTC", "ETH"], url=url, buffer_size=4, max_workers=2)
+    try:
+        assert feed.poll() == {"BTC": 3, "ETH": 1}
+
+        # Overlapping response: only the two unseen BTC trades count
+        responses["BTC"] = [_trade("BTC", t0 + i, 100.0 + i, 1.0, "B" if i % 2 else "A", i) for i in range(1, 5)]
+        assert feed.poll() == {"BTC": 2, "ETH": 0}
+        assert len(requests_seen) == 4
+
+        btc = feed.frame("BTC")
+        assert len(btc) == 4  # ring buffer keeps the latest buffer_size trades
+        assert btc["price"].tolist() == [101.0, 102.0, 103.0, 104.0]
+
+        # An evicted trade showing up again is not double counted
+        responses["BTC"] = [_trade("BTC", t0, 100.0, 1.0, "A", 0)]
+        assert feed.poll()["BTC"] == 0
+
+        summary = feed.summary()
+        assert summary.loc["BTC", "trades"] == 5
+        assert summary.loc["BTC", "vwap"] == pytest.approx(102.0)
+        assert summary.loc["BTC", "imbalance"] == pytest.approx((2 - 3) / 5)
+        assert summary.loc["ETH", "imbalance"] == -1.0
+        assert summary.loc["BTC", "last_price"] == 104.0
+    finally:
+        feed.close()
+
+
+def test_feed_counts_late_trades_once():
+    t0 = 1_700_000_000_000
+    feed = LiveTradeFeed(["BTC"], url="http://unused", buffer_size=2, key_history=3)
+    try:
+        assert feed.ingest("BTC", [_trade("BTC", t0 + i, 100.0, 1.0, "B", i) for i in (5, 6, 7)]) == 3
+        # Older than everything buffered, but never seen: counted
+        assert feed.ingest("BTC", [_trade("BTC", t0 + 1, 90.0, 1.0, "A", 1)]) == 1
+        assert feed.ingest("BTC", [_trade("BTC", t0 + 1, 90.0, 1.0, "A", 1)]) == 0
+        assert feed.stats["BTC"].trades == 4
+        assert feed.stats["BTC"].last_price == 100.0
+        assert feed.frame("BTC")["time"].is_monotonic_increasing
+        assert len(feed._seen["BTC"]) == 3
+    finally:
+        feed.close()
+
+
+def test_feed_buffer_keeps_the_newest_trades_by_time():
+    t0 = 1_700_000_000_000
+    feed = LiveTradeFeed(["BTC"], url="http://unused", buffer_size=3)
+    try:
+        feed.ingest("BTC", [_trade("BTC", t0 + i, 100.0 + i, 1.0, "B", i) for i in (10, 11, 12)])
+        # Out of order, straddling the buffer: the late trade at +5 is older than all kept ones
+        assert feed.ingest("BTC", [_trade("BTC", t0 + i, 100.0 + i, 1.0, "B", i) for i in (15, 5, 13)]) == 3
+        assert list(feed._buffers["BTC"]) == sorted(feed._buffers["BTC"], key=lambda t: t["time"])
+        assert feed.frame("BTC")["price"].tolist() == [112.0, 113.0, 115.0]
+
+        feed.ingest("BTC", [_trade("BTC", t0 + 14, 114.0, 1.0, "A", 14)])
+        assert feed.frame("BTC")["price"].tolist() == [113.0, 114.0, 115.0]
+        assert feed.stats["BTC"].trades == 7
+    finally:
+        feed.close()
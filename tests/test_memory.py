@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.trader_sentiment.analysis import (
+    analyze_correlations,
+    build_daily_join,
+    calculate_risk_metrics,
+    cluster_traders,
+    rolling_risk_metrics,
+)
+from src.trader_sentiment.data_loader import daily_trader_agg, load_trades
+from src.trader_sentiment.memory import compact_frame, memory_report
+
+
+@pytest.fixture
+def daily_pair(trades_csv, fear_greed_csv):
+    full = build_daily_join(str(trades_csv), str(fear_greed_csv))
+    return full, build_daily_join(str(trades_csv), str(fear_greed_csv), compact=True)
+
+
+def test_compact_frame_dtypes(daily_pair):
+    full, compact = daily_pair
+    assert compact["account"].dtype == "category"
+    assert compact["classification"].dtype == "category"
+    assert compact["trades"].dtype.itemsize < full["trades"].dtype.itemsize
+    assert compact["total_pnl"].dtype == np.float64
+    assert compact_frame(full, float32=["avg_leverage"])["avg_leverage"].dtype == np.float32
+
+    # Small counts stop at int32, so products downstream do not wrap
+    counts = compact_frame(pd.DataFrame({"n": [100, 3], "m": pd.array([100, None], dtype="Int64")}))
+    assert counts["n"].dtype == np.int32 and counts["m"].dtype == "Int32"
+    assert (counts["n"] * counts["n"]).tolist() == [10_000, 9]
+
+    report = memory_report(full, compact)
+    assert report.loc["TOTAL", "mb_after"] < report.loc["TOTAL", "mb_before"]
+
+
+def test_memory_report_on_wallet_addresses():
+    trades = pd.DataFrame({"account": [f"0x{i % 50:040x}" for i in range(10_000)], "n": np.arange(10_000)})
+    report = memory_report(trades)
+    assert list(report.index) == ["account", "n", "TOTAL"]
+    assert report.loc["account", "dtype_after"] == "category"
+    assert report.loc["n", "dtype_after"] == "int32"
+    assert report.loc["account", "saved_pct"] > 90
+
+
+def test_downstream_results_unchanged_on_compact_frames(daily_pair, trades_csv):
+    full, compact = daily_pair
+    pd.testing.assert_frame_equal(analyze_correlations(compact), analyze_correlations(full))
+    risk = calculate_risk_metrics(compact)
+    pd.testing.assert_frame_equal(risk.set_axis(risk.index.astype(str)), calculate_risk_metrics(full))
+    pd.testing.assert_frame_equal(
+        rolling_risk_metrics(compact).astype({"account": str}), rolling_risk_metrics(full), check_dtype=False
+    )
+    clusters = cluster_traders(compact, n_clusters=2)
+    pd.testing.assert_frame_equal(
+        clusters.set_axis(clusters.index.astype(str)), cluster_traders(full, n_clusters=2), check_dtype=False
+    )
+
+    trades = load_trades(str(trades_csv))
+    pd.testing.assert_frame_equal(
+        daily_trader_agg(load_trades(str(trades_csv), compact=True)).astype({"account": str}),
+        daily_trader_agg(trades),
+        check_dtype=False,
+    )
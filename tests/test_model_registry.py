@@ -0,0 +1,54 @@
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.trader_sentiment.analysis import predict_win_probability
+from src.trader_sentiment.model_registry import ModelRegistry
+
+
+@pytest.mark.parametrize("daily_df", [{"seed": 3, "n_accounts": 10, "n_days": 30}], indirect=True)
+def test_predict_win_probability_reuses_saved_model(daily_df, tmp_path, monkeypatch):
+    registry = ModelRegistry(str(tmp_path / "models"))
+    first = predict_win_probability(daily_df, registry=registry)
+    assert len(registry.entries()) == 1
+
+    monkeypatch.setattr(registry, "put", lambda *a, **k: pytest.fail("expected a cache hit"))
+    second = predict_win_probability(daily_df, registry=registry)
+    assert second["auc"] == first["auc"]
+    assert second["feature_importance"] == first["feature_importance"]
+
+    # Different data is a different key
+    monkeypatch.undo()
+    predict_win_probability(daily_df.assign(total_pnl=daily_df["total_pnl"] * -1), registry=registry)
+    assert len(registry.entries()) == 2
+
+
+def test_registry_evicts_least_recently_used(tmp_path):
+    registry = ModelRegistry(str(tmp_path), max_bytes=10**9)
+    for i, key in enumerate(["old", "mid", "new"]):
+        registry.put(key, {"model": np.zeros(10_000), "score": i})
+    registry.get("old")  # touching makes "mid" the least recently used
+
+    registry.max_bytes = 2 * registry.entries()["bytes"].max()
+    registry.evict()
+    assert set(registry.entries()["key"]) == {"old", "new"}
+
+
+def test_registry_tolerates_entries_removed_concurrently(tmp_path, monkeypatch):
+    registry = ModelRegistry(str(tmp_path), max_bytes=10**9)
+    for key in ["a", "b"]:
+        registry.put(key, {"model": np.zeros(1_000)})
+    stale = list(tmp_path.glob("*"))
+    files = {entry: list(entry.iterdir()) for entry in stale}
+    shutil.rmtree(tmp_path / "a")
+
+    # As if the directory was listed and checked just before another worker evicted "a"
+    monkeypatch.setattr(Path, "glob", lambda self, pattern: iter(stale))
+    monkeypatch.setattr(Path, "iterdir", lambda self: iter(files[self]))
+    for check in ("is_dir", "is_file", "exists"):
+        monkeypatch.setattr(Path, check, lambda self: True)
+    assert list(registry.entries()["key"]) == ["b"]
+    registry.max_bytes = 1
+    registry.evict()
@@ -0,0 +1,31 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from src.trader_sentiment.analysis import build_daily_join
+from src.trader_sentiment.data_loader import load_fear_greed, load_trades
+from src.trader_sentiment.parallel import parallel_daily_join, partition_by_account
+
+
+def test_partition_by_account_keeps_accounts_together(trades_csv):
+    trades = load_trades(str(trades_csv))
+    parts = partition_by_account(trades, 3)
+    assert sum(len(p) for p in parts) == len(trades)
+    seen = [set(p["account"]) for p in parts]
+    assert all(not (a & b) for i, a in enumerate(seen) for b in seen[i + 1:])
+
+
+def test_parallel_build_daily_join_matches_serial(trades_csv, fear_greed_csv):
+    serial = build_daily_join(str(trades_csv), str(fear_greed_csv))
+    parallel = build_daily_join(str(trades_csv), str(fear_greed_csv), n_jobs=3)
+    pd.testing.assert_frame_equal(parallel, serial)
+
+
+def test_overlapping_calls_keep_their_own_partitions(trades_csv, fear_greed_csv):
+    trades = load_trades(str(trades_csv))
+    fng = load_fear_greed(str(fear_greed_csv))
+    inputs = [trades[trades["account"].isin(group)] for group in (["A", "B"], ["C", "D"])]
+    with ThreadPoolExecutor(max_workers=2) as threads:
+        results = list(threads.map(lambda t: parallel_daily_join(t, fng, n_jobs=2), inputs))
+    for got, t in zip(results, inputs):
+        pd.testing.assert_frame_equal(got, parallel_daily_join(t, fng, n_jobs=1))
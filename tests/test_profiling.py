@@ -0,0 +1,83 @@
+import threading
+
+import pytest
+
+from src.trader_sentiment import profiling
+from src.trader_sentiment.analysis import build_daily_join
+from src.trader_sentiment.profiling import Recorder, recording
+
+
+def test_disabled_records_nothing(trades_csv, fear_greed_csv):
+    recorder = Recorder()
+    with profiling.stage("anything") as s:
+        s.rows_out = 10
+    build_daily_join(str(trades_csv), str(fear_greed_csv))
+    with recording(None):
+        build_daily_join(str(trades_csv), str(fear_greed_csv))
+    assert profiling.active() is None
+    assert recorder.records().empty
+
+
+def test_records_nested_pipeline_stages(trades_csv, fear_greed_csv):
+    with recording(Recorder()) as recorder:
+        joined = build_daily_join(str(trades_csv), str(fear_greed_csv))
+    assert profiling.active() is None
+    rec = recorder.records().set_index("name")
+
+    assert rec.index[0] == "build_daily_join"
+    expected = {"load_trades", "read_trades_file", "parse_timestamps", "daily_trader_agg", "join_sentiment"}
+    assert expected <= set(rec.index)
+    assert rec.loc["load_trades", "parent"] == "build_daily_join"
+    assert rec.loc["read_trades_file", "depth"] == 2
+    assert rec.loc["read_trades_file", "rows_out"] == 2_000
+    assert rec.loc["build_daily_join", "rows_out"] == len(joined)
+    assert (rec["wall_s"] >= 0).all() and (rec["cpu_s"] >= 0).all()
+    # The parent's wall time covers its children
+    assert rec.loc["build_daily_join", "wall_s"] >= rec.loc["load_trades", "wall_s"]
+    assert recorder.last_profile() is None
+
+
+def test_cprofile_mode_profiles_outermost_stage(trades_csv, fear_greed_csv):
+    with recording(Recorder("cprofile")) as recorder:
+        build_daily_join(str(trades_csv), str(fear_greed_csv))
+    rec = recorder.records().set_index("name")
+    assert rec["profile"].notna().sum() == 1
+    assert "daily_trader_agg" in recorder.last_profile()
+
+    with pytest.raises(ValueError):
+        Recorder("perf")
+
+
+def test_concurrent_sessions_keep_their_own_records(trades_csv, fear_greed_csv):
+    recorders = [Recorder("cprofile"), Recorder("cprofile")]
+    start = threading.Barrier(len(recorders))
+
+    def session(recorder):
+        with recording(recorder):
+            start.wait()
+            with profiling.stage("session") as s:
+                build_daily_join(str(trades_csv), str(fear_greed_csv))
+                s.rows_out = id(recorder)
+
+    threads = [threading.Thread(target=session, args=(r,)) for r in recorders]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    for recorder in recorders:
+        rec = recorder.records()
+        assert (rec["name"] == "session").sum() == 1
+        assert rec.loc[rec["name"] == "session", "rows_out"].item() == id(recorder)
+        assert rec.loc[rec["name"] == "build_daily_join", "parent"].item() == "session"
+    # Only one profiler runs at a time; the session that found it busy is timed, not profiled
+    assert sum(r.last_profile() is not None for r in recorders) >= 1
+
+
+def test_recorder_from_env(monkeypatch):
+    monkeypatch.delenv(profiling.ENV_VAR, raising=False)
+    assert Recorder.from_env() is None
+    monkeypatch.setenv(profiling.ENV_VAR, "1")
+    assert Recorder.from_env().profiler is None
+    monkeypatch.setenv(profiling.ENV_VAR, "cprofile")
+    assert Recorder.from_env().profiler == "cprofile"
@@ -0,0 +1,73 @@
+import pandas as pd
+
+from src.trader_sentiment import report
+from src.trader_sentiment.analysis import analyze_correlations, build_daily_join, calculate_risk_metrics
+
+
+def test_run_report_writes_artifacts_in_parallel(trades_csv, fear_greed_csv, tmp_path):
+    daily = build_daily_join(str(trades_csv), str(fear_greed_csv))
+    out = tmp_path / "report"
+    manifest = report.run_report(daily, str(out), n_jobs=2, source="abc", n_clusters=2)
+
+    assert list(manifest["tasks"]) == list(report.TASKS)
+    assert all(t["status"] == "ok" for t in manifest["tasks"].values())
+    pd.testing.assert_frame_equal(
+        report.read_artifact(str(out), "risk_metrics", source="abc"), calculate_risk_metrics(daily)
+    )
+    pd.testing.assert_frame_equal(
+        report.read_artifact(str(out), "correlations", source="abc"),
+        analyze_correlations(daily).rename_axis("feature"),
+    )
+    clusters = report.read_artifact(str(out), "clusters")
+    assert clusters["cluster"].nunique() == 2
+    # Model metrics are JSON; the fitted model itself is not written
+    assert "model" not in report.read_artifact(str(out), "win_probability")
+    # A report built from other sources is ignored
+    assert report.read_artifact(str(out), "risk_metrics", source="other") is None
+
+
+def test_failed_task_is_recorded_without_stopping_the_others(trades_csv, fear_greed_csv, tmp_path, monkeypatch):
+    daily = build_daily_join(str(trades_csv), str(fear_greed_csv))
+
+    def broken(df, options):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(report.TASKS, "clusters", broken)
+    manifest = report.run_report(daily, str(tmp_path), tasks=["clusters", "risk_metrics"], n_jobs=1)
+    assert manifest["tasks"]["clusters"]["status"] == "failed"
+    assert "boom" in manifest["tasks"]["clusters"]["error"]
+    assert report.read_artifact(str(tmp_path), "clusters") is None
+    assert report.read_artifact(str(tmp_path), "risk_metrics") is not None
+
+
+def test_tasks_are_sent_only_the_columns_they_read(trades_csv, fear_greed_csv, tmp_path, monkeypatch):
+    daily = build_daily_join(str(trades_csv), str(fear_greed_csv))
+    seen = {}
+
+    def spy(name):
+        def task(df, options):
+            seen[name] = (list(df.columns), set(options))
+            return {}
+        return task
+
+    for name in ("correlations", "risk_metrics", "pnl_model"):
+        monkeypatch.setitem(report.TASKS, name, spy(name))
+    report.run_report(daily, str(tmp_path), tasks=["correlations", "risk_metrics", "pnl_model"], n_jobs=1)
+
+    assert seen["risk_metrics"] == (["account", "date", "total_pnl"], set())
+    assert seen["pnl_model"] == ([], {"store"})
+    columns, _ = seen["correlations"]
+    assert "classification" in columns and "account" not in columns and "date" not in columns
+
+
+def test_cli_builds_join_once_and_reports_status(trades_csv, fear_greed_csv, tmp_path):
+    processed = tmp_path / "processed"
+    code = report.main([
+        "--trades", str(trades_csv), "--fear-greed", str(fear_greed_csv),
+        "--processed-dir", str(processed), "--tasks", "correlations", "risk_metrics", "--jobs", "2",
+    ])
+    assert code == 0
+    manifest = report.read_manifest(str(processed / "report"))
+    assert manifest["source"] == report.source_fingerprint([str(trades_csv), str(fear_greed_csv)])
+    assert set(manifest["tasks"]) == {"correlations", "risk_metrics"}
+    assert len(list(processed.glob("daily_join-*/daily_join.parquet"))) == 1
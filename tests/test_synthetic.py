@@ -0,0 +1,31 @@
+import pandas as pd
+import pytest
+
+from src.trader_sentiment.analysis import build_daily_join
+from src.trader_sentiment.synthetic import account_weights, make_trades, write_dataset
+
+
+def test_make_trades_is_seeded_and_skewed():
+    a = make_trades(5_000, n_accounts=200, n_days=30, seed=1)
+    pd.testing.assert_frame_equal(a, make_trades(5_000, n_accounts=200, n_days=30, seed=1))
+    assert not a.equals(make_trades(5_000, n_accounts=200, n_days=30, seed=2))
+
+    even = make_trades(5_000, n_accounts=200, n_days=30, skew=0)["Account"].value_counts()
+    skewed = a["Account"].value_counts()
+    assert skewed.iloc[0] > 5 * even.iloc[0]
+    assert account_weights(200, skew=1.0).sum() == pytest.approx(1.0)
+
+    # Only closing fills realise PnL
+    opening = a["Direction"].str.startswith("Open")
+    assert (a.loc[opening, "Closed PnL"] == 0).all()
+
+
+def test_write_dataset_round_trips_through_pipeline(tmp_path):
+    trades_path, fng_path = write_dataset(tmp_path, 3_000, n_accounts=50, n_days=20)
+    joined = build_daily_join(str(trades_path), str(fng_path))
+
+    assert joined["account"].nunique() == 50
+    assert joined["trades"].sum() == 3_000
+    # The fear/greed file covers every trading day
+    assert joined["classification"].notna().all()
+    assert joined["sentiment_score"].between(0, 4).all()
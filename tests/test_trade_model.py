@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.trader_sentiment import synthetic
+from src.trader_sentiment.data_loader import _normalize_trades, iter_trades, load_fear_greed
+from src.trader_sentiment.trade_model import (
+    TRADE_COLUMNS,
+    TRADE_FEATURES,
+    TradeSequenceState,
+    sentiment_by_day,
+    trade_features,
+    train_trade_win_model,
+)
+
+# 2024-01-01 00:00 UTC in epoch ms, as in the raw export
+T0 = 1_704_067_200_000
+
+
+def chunks(df, size):
+    return [df.iloc[i:i + size] for i in range(0, len(df), size)]
+
+
+def test_state_carries_across_chunk_boundaries():
+    fills = _normalize_trades(pd.DataFrame({
+        "Account": ["a", "a", "b", "a", "a", "b", "a"],
+        "Timestamp": T0 + np.array([1_000, 2_000, 2_500, 5_000, 9_000, 9_500, 10_000]),
+        "Closed PnL": [0.0, 10.0, -1.0, -5.0, 0.0, 3.0, 2.0],
+    }))
+    sentiment = pd.Series([3.0], index=pd.to_datetime(["2024-01-01"]).astype("datetime64[ms]"))
+    state = TradeSequenceState(window=2)
+    parts = []
+    for chunk in chunks(fills, 2):
+        out, state = state.advance(chunk, sentiment)
+        parts.append(out)
+    got = pd.concat(parts).set_index(["account", "time"])
+
+    a = got.loc["a"]
+    # a's closes: +10 @2s, -5 @5s, +2 @10s
+    np.testing.assert_array_equal(a["win"], [1.0, 0.0, 1.0])
+    np.testing.assert_array_equal(a["prev_win"], [np.nan, 1.0, 0.0])
+    np.testing.assert_array_equal(a["win_rate"], [np.nan, 1.0, 0.5])
+    # Gaps are to the previous fill of any kind, including the non-closing one at 9s
+    np.testing.assert_allclose(a["log_gap_s"], np.log1p([1.0, 3.0, 1.0]))
+    assert (got["sentiment_score"] == 3.0).all()
+    # State holds at most `window` closes per account
+    assert state.history.groupby("account").size().max() <= 2
+    assert state.last_fill.to_dict() == {"a": T0 + 10_000.0, "b": T0 + 9_500.0}
+
+
+def test_chunked_stream_matches_single_pass(tmp_path):
+    trades_path, fng_path = synthetic.write_dataset(str(tmp_path), 20_000, n_accounts=50, n_days=30)
+    pd.read_csv(trades_path).sort_values("Timestamp").to_csv(trades_path, index=False)
+    sentiment = sentiment_by_day(load_fear_greed(str(fng_path)))
+
+    def run(chunksize):
+        stream = iter_trades(str(trades_path), chunksize=chunksize, columns=TRADE_COLUMNS)
+        return pd.concat(trade_features(stream, sentiment)).sort_values(["account", "time"], kind="stable")
+
+    pd.testing.assert_frame_equal(run(1_337).reset_index(drop=True), run(10**6).reset_index(drop=True))
+
+
+def test_train_trade_win_model(trades_csv, fear_greed_csv):
+    pd.read_csv(trades_csv).sort_values("Timestamp").to_csv(trades_csv, index=False)
+    result = train_trade_win_model(str(trades_csv), str(fear_greed_csv), chunksize=300, sample_frac=0.5)
+
+    assert result["n_fills"] == len(pd.read_csv(trades_csv))
+    assert 0 < result["n_trained"] < result["n_labelled"]
+    assert 0.0 <= result["progressive_accuracy"] <= 1.0
+    assert list(result["coefficients"]) == TRADE_FEATURES
+    assert result["n_late_fills"] == 0
+    proba = result["model"].predict_proba(np.zeros((3, len(TRADE_FEATURES))))
+    assert proba.shape == (3, 2)
+
+
+def test_fills_out_of_time_order_across_chunks_are_flagged(trades_csv, fear_greed_csv):
+    fills = _normalize_trades(pd.DataFrame({
+        "Account": ["a", "a", "b"],
+        "Timestamp": T0 + np.array([5_000, 1_000, 2_000]),
+        "Closed PnL": [1.0, -1.0, 1.0],
+    }))
+    _, state = TradeSequenceState().advance(fills.iloc[:1], pd.Series(dtype="float64"))
+    with pytest.warns(RuntimeWarning, match="older than fills of the same account"):
+        _, state = state.advance(fills.iloc[1:], pd.Series(dtype="float64"))
+    assert state.late_fills == 1
+
+    # The fixture's fills are in random order
+    with pytest.warns(RuntimeWarning):
+        result = train_trade_win_model(str(trades_csv), str(fear_greed_csv), chunksize=300)
+    assert result["n_late_fills"] > 0
+
+
+def test_no_closing_fills_reports_error(trades_csv, fear_greed_csv):
+    raw = pd.read_csv(trades_csv).sort_values("Timestamp").assign(**{"Closed Pnl": 0.0})
+    raw.to_csv(trades_csv, index=False)
+    assert "error" in train_trade_win_model(str(trades_csv), str(fear_greed_csv), chunksize=500)
+
+
+@pytest.mark.parametrize("window", [1, 3])
+def test_win_rate_window(window):
+    fills = _normalize_trades(pd.DataFrame({
+        "Account": ["a"] * 5,
+        "Timestamp": T0 + np.arange(1, 6) * 1_000,
+        "Closed PnL": [1.0, 1.0, -1.0, -1.0, 1.0],
+    }))
+    out, _ = TradeSequenceState(window=window).advance(fills, pd.Series(dtype="float64"))
+    wins = np.array([1.0, 1.0, 0.0, 0.0, 1.0])
+    expected = [np.nan] + [wins[max(0, i - window):i].mean() for i in range(1, 5)]
+    np.testing.assert_allclose(out["win_rate"], expected)
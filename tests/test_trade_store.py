@@ -0,0 +1,96 @@
+import json
+
+import pandas as pd
+import pytest
+
+from src.trader_sentiment import synthetic
+from src.trader_sentiment.data_loader import load_trades
+from src.trader_sentiment.trade_store import (
+    INDEX_FILE,
+    META_FILE,
+    TradeStore,
+    account_ranges,
+    write_trade_store,
+)
+
+
+@pytest.fixture
+def store_and_trades(tmp_path):
+    trades_path, _ = synthetic.write_dataset(str(tmp_path / "raw"), 5_000, n_accounts=20, n_days=15)
+    meta = write_trade_store(str(trades_path), str(tmp_path / "store"), chunksize=700, row_group_size=97)
+    return TradeStore(str(tmp_path / "store")), load_trades(str(trades_path)), meta
+
+
+def _canonical(df: pd.DataFrame) -> pd.DataFrame:
+    cols = sorted(c for c in df.columns if c != "date")
+    out = df.sort_values(["account", "timestamp", *[c for c in cols if c not in ("account", "timestamp")]])
+    return out[cols + ["date"]].reset_index(drop=True)
+
+
+def test_account_ranges():
+    assert account_ranges(["a", "a", "b", "c", "c", "c"]) == {"a": (0, 2), "b": (2, 3), "c": (3, 6)}
+    assert account_ranges([]) == {}
+
+
+def test_round_trip_matches_load_trades(store_and_trades):
+    store, trades, meta = store_and_trades
+    assert store.is_current(str(store.root.parent / "raw" / "hyperliquid_trades.csv"))
+    assert meta["rows"] == len(trades)
+    assert meta["accounts"] == trades["account"].nunique()
+    assert store.days == sorted(trades["date"].unique())
+
+    got = store.read()
+    pd.testing.assert_frame_equal(_canonical(got), _canonical(trades[got.columns]), check_dtype=False)
+
+
+def test_partitions_are_sorted_by_account_and_indexed(store_and_trades):
+    store, _, _ = store_and_trades
+    assert not store.root.joinpath("_staging").exists()
+    assert json.loads((store.root / META_FILE).read_text())["row_group_size"] == 97
+    index = pd.read_parquet(store.root / INDEX_FILE)
+    day = store.days[3]
+    part = store.read(start=day, end=day)
+    assert part["account"].is_monotonic_increasing
+    expected = account_ranges(part["account"])
+    on_day = index[index["date"] == day]
+    assert dict(zip(on_day["account"], zip(on_day["row_start"], on_day["row_stop"]))) == expected
+
+
+def test_filters_prune_by_date_and_account(store_and_trades):
+    store, trades, _ = store_and_trades
+    start, end = store.days[2], store.days[9]
+    accounts = sorted(trades["account"].unique())[::4]
+
+    in_range = trades[(trades["date"] >= start) & (trades["date"] <= end)]
+    got = store.read(start=start, end=end, columns=["account", "timestamp", "closed pnl"])
+    assert list(got.columns) == ["account", "timestamp", "closed pnl", "date"]
+    assert len(got) == len(in_range)
+
+    got = store.read(start=start, end=end, accounts=accounts)
+    expected = in_range[in_range["account"].isin(accounts)]
+    pd.testing.assert_frame_equal(_canonical(got), _canonical(expected[got.columns]), check_dtype=False)
+
+
+def test_trader_lookup(store_and_trades):
+    store, trades, _ = store_and_trades
+    account = trades["account"].value_counts().index[0]
+    got = store.trader(account)
+    assert (got["account"] == account).all()
+    assert len(got) == (trades["account"] == account).sum()
+    assert got["timestamp"].is_monotonic_increasing
+    assert store.trader("no-such-account").empty
+
+
+def test_rewrite_replaces_previous_store(store_and_trades, tmp_path):
+    store, _, _ = store_and_trades
+    smaller, _ = synthetic.write_dataset(str(tmp_path / "smaller"), 1_200, n_accounts=5, n_days=4)
+    meta = write_trade_store(str(smaller), str(store.root), chunksize=500)
+
+    reopened = TradeStore(str(store.root))
+    assert meta["rows"] == len(reopened.read()) == 1_200
+    assert len(reopened.accounts()) == 5
+    assert not store.root.with_name("store.tmp").exists()
+    assert not store.root.with_name("store.old").exists()
+    assert (reopened.index["row_stop"] > reopened.index["row_start"]).all()
+    assert reopened.is_current(str(smaller))
+    assert not reopened.is_current(str(tmp_path / "raw" / "hyperliquid_trades.csv"))